@@ -0,0 +1,69 @@
+# Serial vs. run_bulk invite deletion against the local mock REST API.
+#
+#   python -m benchmarks.bench_bulk --invites 2000 --latency 0.05 --limit 50 --window 1
+
+import argparse
+import asyncio
+import time
+
+import discord
+from discord.http import HTTPClient, Route
+
+from benchmarks.mock_http import MockDiscordHTTP
+from utils.bulk import run_bulk
+
+
+async def make_client(api):
+    Route.BASE = api.base_url
+    http = HTTPClient(asyncio.get_running_loop())
+    await http.static_login("mock-token")
+    return http
+
+
+async def serial(http, codes):
+    deleted = 0
+    for code in codes:
+        try:
+            await http.delete_invite(code)
+            deleted += 1
+        except discord.HTTPException:
+            continue
+    return deleted
+
+
+async def bulk(http, codes, concurrency, per_route):
+    result = await run_bulk(
+        codes, http.delete_invite,
+        concurrency=concurrency, per_route=per_route, route_key=lambda code: "invites"
+    )
+    return result.succeeded
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--invites", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--limit", type=int, default=50, help="requests per bucket window")
+    parser.add_argument("--window", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--per-route", type=int, default=10)
+    args = parser.parse_args()
+
+    codes = [f"code{i:06d}" for i in range(args.invites)]
+    for name, runner in (("serial", serial), ("run_bulk", bulk)):
+        api = await MockDiscordHTTP(latency=args.latency, bucket_limit=args.limit, bucket_window=args.window).start()
+        http = await make_client(api)
+        start = time.perf_counter()
+        if runner is bulk:
+            deleted = await runner(http, codes, args.concurrency, args.per_route)
+        else:
+            deleted = await runner(http, codes)
+        elapsed = time.perf_counter() - start
+        await http.close()
+        await api.stop()
+        print(f"{name:>9}: {deleted}/{len(codes)} deleted in {elapsed:.2f}s "
+              f"({deleted / elapsed:.1f}/s, {api.stats['429']} x 429)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
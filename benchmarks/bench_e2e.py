@@ -0,0 +1,205 @@
+# End-to-end load test: the real BleedBot (every cog, storage, log sink, DM
+# dispatcher) against benchmarks.mock_discord. Staff messages are injected over
+# the mock gateway and timed until discord.py reports the command finished.
+#
+#   python -m benchmarks.bench_e2e --members 5000 --commands 200 --concurrency 8 --latency 0.03
+#   python -m benchmarks.bench_e2e --only warn,jail --bucket-limit 5 --bucket-window 5
+#
+# Runs in a throwaway data directory, so the repo's data/ files are never touched.
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("warn", "jail", "unban", "purge", "birthdays")
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def prepare_workdir(guild, members):
+    # The bot reads data/ relative to the working directory, so the run gets its own
+    workdir = tempfile.mkdtemp(prefix="bleedbot-e2e-")
+    os.makedirs(os.path.join(workdir, "data"))
+    with open(os.path.join(workdir, "data", "guild_settings.json"), "w") as f:
+        json.dump({str(guild.id): {
+            "staff_role": guild.staff_role, "jail_role": guild.jail_role, "log_channel": guild.log_channel
+        }}, f)
+    with open(os.path.join(workdir, "data", "birthdays.json"), "w") as f:
+        json.dump({str(uid): f"2000-{1 + i % 12:02d}-{1 + i % 28:02d}" for i, uid in enumerate(members)}, f)
+    os.environ.setdefault("CASE_DB_PATH", os.path.join(workdir, "data", "cases.db"))
+    os.chdir(workdir)
+    return workdir
+
+
+class Driver:
+    # Sends commands as a staff member and resolves each one when the bot's
+    # on_command_completion / on_command_error fires for that message ID.
+
+    def __init__(self, mock, guild, bot):
+        self.mock = mock
+        self.guild = guild
+        self.pending = {}  # message ID -> future
+        self.errors = []
+        bot.add_listener(self._completed, "on_command_completion")
+        bot.add_listener(self._failed, "on_command_error")
+
+    def _resolve(self, ctx, ok):
+        future = self.pending.pop(ctx.message.id, None)
+        if future and not future.done():
+            future.set_result(ok)
+
+    async def _completed(self, ctx):
+        self._resolve(ctx, True)
+
+    async def _failed(self, ctx, error):
+        self.errors.append(f"{ctx.command}: {error}")
+        self._resolve(ctx, False)
+
+    async def invoke(self, channel_id, content, timeout=30.0):
+        future = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        message_id = await self.mock.inject_message(self.guild, channel_id, self.guild.staff[0], content)
+        self.pending[message_id] = future
+        try:
+            ok = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.pending.pop(message_id, None)
+            ok = False
+            self.errors.append(f"timed out: {content}")
+        return ok, time.perf_counter() - start
+
+
+def command_source(scenario, guild, channels, purge_amount):
+    targets = itertools.cycle([uid for uid in guild.members if uid not in guild.staff and uid != 100000000000000001])
+    bans = iter(list(guild.bans))
+    channel_cycle = itertools.cycle(channels)
+    for i in itertools.count():
+        channel = next(channel_cycle)
+        if scenario == "warn":
+            yield channel, f",warn <@{next(targets)}> e2e benchmark {i}"
+        elif scenario == "jail":
+            yield channel, f",jail <@{next(targets)}> 10m e2e benchmark {i}"
+        elif scenario == "unban":
+            yield channel, f",unban {next(bans)}"
+        elif scenario == "purge":
+            yield channel, f",purge {purge_amount}"
+        elif scenario == "birthdays":
+            yield channel, f",birthdays {1 + i % 20}"
+
+
+async def run_scenario(driver, source, count, concurrency):
+    latencies = []
+    failures = 0
+    issued = 0
+
+    async def worker():
+        nonlocal failures, issued
+        for channel, content in source:
+            if issued >= count:
+                return
+            issued += 1
+            ok, seconds = await driver.invoke(channel, content)
+            if ok:
+                latencies.append(seconds)
+            else:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, failures, time.perf_counter() - start
+
+
+async def main(args):
+    sys.path.insert(0, ROOT)
+    from benchmarks.mock_discord import MockDiscord, SyntheticGuild
+
+    guild = SyntheticGuild(
+        members=args.members, channels=args.channels, messages=args.messages,
+        bans=max(args.bans, args.commands), staff=5
+    )
+    workdir = prepare_workdir(guild, list(guild.members)[:args.birthdays])
+    mock = await MockDiscord(
+        [guild], latency=args.latency, bucket_limit=args.bucket_limit,
+        bucket_window=args.bucket_window, closed_dms=args.closed_dms
+    ).start()
+
+    logging.disable(logging.WARNING if args.quiet else logging.NOTSET)
+    logging.getLogger("aiohttp.access").setLevel(logging.WARNING)  # The mock's own per-request lines
+    from main import bot
+    from utils.logger import log_sink
+    from utils.dm import dm_dispatcher
+
+    driver = Driver(mock, guild, bot)
+    start = time.perf_counter()
+    await bot.login("mock-token")  # runs setup_hook: cogs, scheduler, slash sync
+    runner = asyncio.create_task(bot.connect(reconnect=False))
+    await bot.wait_until_ready()
+    print(f"🤖 Ready in {time.perf_counter() - start:.2f}s | {args.members} members, "
+          f"{args.channels} channels x {args.messages} messages, {len(guild.bans)} bans | workdir {workdir}")
+
+    channels = [channel_id for channel_id in guild.channels if channel_id != guild.log_channel]
+    scenarios = args.only.split(",") if args.only else SCENARIOS
+
+    print(f"{'command':<10} {'ok':>6} {'fail':>5} {'cmd/s':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for scenario in scenarios:
+        source = command_source(scenario, guild, channels, args.purge_amount)
+        requests_before, limited_before = mock.http.stats["requests"], mock.http.stats["429"]
+        latencies, failures, elapsed = await run_scenario(driver, source, args.commands, args.concurrency)
+        print(
+            f"{scenario:<10} {len(latencies):>6} {failures:>5} {len(latencies) / elapsed:>8.1f} "
+            f"{percentile(latencies, 0.5) * 1000:>9.1f} {percentile(latencies, 0.99) * 1000:>9.1f}"
+            f"   ({mock.http.stats['requests'] - requests_before} requests, "
+            f"{mock.http.stats['429'] - limited_before} x 429)"
+        )
+
+    # Logging path: drain the sink so every queued embed reaches the mock log channel
+    await asyncio.sleep(log_sink.flush_interval + 0.5)
+    flushes = list(log_sink.flush_latency)
+    stats = log_sink.stats()
+    print(
+        f"📝 log sink: {stats['sent']} embeds in {stats['messages']} messages "
+        f"({mock.sent.get(guild.log_channel, 0)} posts to the log channel), "
+        f"enqueue->send p50 {percentile(flushes, 0.5) * 1000:.0f}ms p99 {percentile(flushes, 0.99) * 1000:.0f}ms, "
+        f"dropped {stats['dropped']} spilled {stats['spilled']} failed {stats['failed']}"
+    )
+    print(f"📨 DMs: {dm_dispatcher.counters}")
+    print(f"🌐 HTTP: {mock.http.stats['requests']} requests, {mock.http.stats['429']} x 429")
+    if args.routes:
+        for key, count in sorted(mock.http.route_counts.items(), key=lambda item: -item[1]):
+            print(f"   {count:>7}  {key}")
+    for message in driver.errors[:10]:
+        print(f"⚠️ {message}")
+
+    await bot.close()
+    await runner
+    await mock.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=1000, help="history per channel, for purge")
+    parser.add_argument("--bans", type=int, default=2000)
+    parser.add_argument("--birthdays", type=int, default=1000)
+    parser.add_argument("--commands", type=int, default=200, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--purge-amount", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every REST call")
+    parser.add_argument("--bucket-limit", type=int, default=50)
+    parser.add_argument("--bucket-window", type=float, default=1.0)
+    parser.add_argument("--closed-dms", type=float, default=0.1, help="fraction of users with DMs closed")
+    parser.add_argument("--only", help=f"comma-separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--routes", action="store_true", help="print request counts per route")
+    parser.add_argument("--quiet", action="store_true", help="hide the bot's own INFO logging")
+    asyncio.run(main(parser.parse_args()))
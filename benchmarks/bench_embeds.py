@@ -0,0 +1,90 @@
+# Embed build + serialization cost for a moderation command's response:
+# the old path builds the success embed and a separate Quick Tip embed with
+# discord.Embed setters and sends two messages; the template path renders one
+# embed from a frozen template with the tip merged in as a field.
+#
+#   python -m benchmarks.bench_embeds --iterations 20000
+
+import argparse
+import json
+import time
+
+import discord
+
+from utils.embeds import TEMPLATES, TIPS, add_tip, create_success_embed
+
+
+def legacy_success(title, message):
+    embed = discord.Embed(title=title, description=f"✅ {message}", color=discord.Color.green())
+    embed.set_footer(text="Command successful")
+    return embed
+
+
+def legacy_info(title, message):
+    embed = discord.Embed(title=title, description=message, color=discord.Color.blurple())
+    embed.set_footer(text="Info")
+    return embed
+
+
+def legacy_error(title, reason, usage, example):
+    embed = discord.Embed(title=title, description=f"❌ **Reason:** {reason}", color=discord.Color.red())
+    embed.add_field(name="📘 Usage", value=usage, inline=False)
+    embed.add_field(name="💡 Example", value=example, inline=False)
+    embed.set_footer(text="Command failed")
+    return embed
+
+
+class FakeCtx:
+    def __init__(self, invoked_with):
+        self.invoked_with = invoked_with
+
+
+def serialize(embeds):
+    # What the HTTP layer does per message: to_dict + JSON encode
+    return len(json.dumps({"embeds": [embed.to_dict() for embed in embeds]}, separators=(",", ":")))
+
+
+def old_command(command):
+    payloads = [[legacy_success("User Warned", "<@123> has been warned for: **spam**")]]
+    payloads.append([legacy_info("💡 Quick Tip", TIPS[command])])
+    return [serialize(p) for p in payloads]
+
+
+def new_command(command):
+    embed = add_tip(create_success_embed("User Warned", "<@123> has been warned for: **spam**"), FakeCtx(command))
+    return [serialize([embed])]
+
+
+def bench(label, fn, iterations, commands):
+    messages = 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        messages += len(fn(commands[i % len(commands)]))
+    elapsed = time.perf_counter() - start
+    print(f"{label:>22}: {elapsed / iterations * 1e6:7.2f} µs/command  {messages / iterations:.1f} messages/command")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    commands = list(TIPS)
+
+    bench("setters + tip message", old_command, args.iterations, commands)
+    bench("template + merged tip", new_command, args.iterations, commands)
+
+    n = args.iterations
+    start = time.perf_counter()
+    for _ in range(n):
+        legacy_error("Missing Argument", "You must mention a user.", ",warn @user <reason>", ",warn @Troll spam").to_dict()
+    legacy = (time.perf_counter() - start) / n * 1e6
+    start = time.perf_counter()
+    for _ in range(n):
+        TEMPLATES["error"].render(title="Missing Argument", reason="You must mention a user.",
+                                  usage=",warn @user <reason>", example=",warn @Troll spam").to_dict()
+    templated = (time.perf_counter() - start) / n * 1e6
+    print(f"{'error embed (build)':>22}: setters {legacy:.2f} µs, template {templated:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
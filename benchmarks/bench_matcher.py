@@ -0,0 +1,63 @@
+# Blocklist matching cost per message: naive substring loop vs. one regex
+# alternation vs. the Aho-Corasick MultiMatcher, plus automaton build time.
+#
+#   python -m benchmarks.bench_matcher --patterns 10000 --messages 2000
+
+import argparse
+import random
+import re
+import string
+import time
+
+from utils.matcher import MultiMatcher, LinkPolicy
+
+
+def random_word(rng, low=4, high=10):
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(low, high)))
+
+
+def timed(label, fn, messages):
+    start = time.perf_counter()
+    hits = sum(1 for message in messages if fn(message))
+    elapsed = time.perf_counter() - start
+    print(f"{label:>14}: {elapsed / len(messages) * 1e6:9.1f} µs/message  ({hits} hits)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patterns", type=int, default=10000)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=200, help="characters per message")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    patterns = [random_word(rng) for _ in range(args.patterns)]
+    messages = []
+    for i in range(args.messages):
+        words = []
+        while sum(len(w) + 1 for w in words) < args.length:
+            words.append(random_word(rng, 2, 8))
+        if i % 20 == 0:
+            words.append(rng.choice(patterns))
+        messages.append(" ".join(words))
+
+    start = time.perf_counter()
+    matcher = MultiMatcher(patterns)
+    print(f"automaton build: {time.perf_counter() - start:.3f}s for {len(matcher.patterns)} patterns")
+
+    start = time.perf_counter()
+    alternation = re.compile("|".join(map(re.escape, patterns)))
+    print(f"    regex build: {time.perf_counter() - start:.3f}s")
+
+    naive_messages = messages[:max(1, len(messages) // 10)]  # the naive loop is slow; sample it
+    timed("naive", lambda m: any(p in m.lower() for p in patterns), naive_messages)
+    timed("regex", lambda m: alternation.search(m.lower()) is not None, messages)
+    timed("aho-corasick", lambda m: matcher.search(m) is not None, messages)
+
+    policy = LinkPolicy(deny=[f"{random_word(rng)}.com" for _ in range(args.patterns)])
+    link_messages = [f"{m} https://cdn.{random_word(rng)}.com/x" for m in messages]
+    timed("link policy", lambda m: policy.check(m) is not None, link_messages)
+
+
+if __name__ == "__main__":
+    main()
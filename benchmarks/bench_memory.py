@@ -0,0 +1,195 @@
+# Resident memory of the bot per MEMORY_PROFILE on one synthetic guild. The mock
+# Discord runs here; each profile runs the real bot in its own process (so its RSS
+# is the bot's alone), which reports its memory after login, after a round of
+# member-heavy commands (userinfo by ID, birthdays pages, jail + jaillist) and
+# after the member cache has been swept with a zero TTL.
+#
+#   python -m benchmarks.bench_memory --members 100000
+#   python -m benchmarks.bench_memory --members 20000 --profiles lean --tracemalloc
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = ("full", "lean")
+MARK = "@@ "  # Prefix of the child's report lines on stdout
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Peak, where /proc isn't available
+
+
+# ---------- Child: one bot process ----------
+
+def report(bot, phase, started, traced):
+    gc.collect()
+    members = sum(len(guild._members) for guild in bot.guilds)
+    presences = sum(
+        1 for guild in bot.guilds for member in guild._members.values()
+        if member.raw_status != "offline" or member.activities
+    )
+    line = {
+        "phase": phase, "rss": rss_mb(), "members": members, "users": len(bot.users),
+        "presences": presences, "seconds": time.perf_counter() - started
+    }
+    if traced:
+        import tracemalloc
+        line["traced"] = tracemalloc.get_traced_memory()[0] / 2 ** 20
+    print(MARK + json.dumps(line), flush=True)
+
+
+async def child(args):
+    if args.tracemalloc:
+        import tracemalloc
+        tracemalloc.start()
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.WARNING)
+    from benchmarks.mock_discord import use_mock
+    use_mock(args.base_url, args.gateway_url)
+
+    started = time.perf_counter()
+    from main import bot
+    from utils.members import member_cache
+    report(bot, "imported", started, args.tracemalloc)
+
+    started = time.perf_counter()
+    await bot.login("mock-token")
+    runner = asyncio.create_task(bot.connect(reconnect=False))
+    await bot.wait_until_ready()  # The full profile is only ready once every member has been chunked
+    report(bot, "ready", started, args.tracemalloc)
+
+    loop = asyncio.get_running_loop()
+    while True:
+        command = (await loop.run_in_executor(None, sys.stdin.readline)).strip()
+        if command == "sweep":
+            member_cache.ttl = 0
+            member_cache.sweep()
+            report(bot, "swept", started, args.tracemalloc)
+        elif command:
+            report(bot, command, started, args.tracemalloc)
+        else:
+            break
+
+    await bot.close()
+    await runner
+
+
+# ---------- Parent: the mock and the workload ----------
+
+async def workload(mock, guild, channel, args):
+    # Each command answers with one message in the channel, so the next is sent once it has
+    rng = random.Random(1)
+    targets = [uid for uid in guild.members if uid not in guild.staff and uid != 100000000000000001]
+    commands = [f",userinfo {uid}" for uid in rng.sample(targets, args.userinfo)]
+    commands += [f",birthdays {page}" for page in range(1, args.birthday_pages + 1)]
+    commands += [f",jail <@{uid}> 1h memory benchmark" for uid in rng.sample(targets, args.jail)]
+    commands.append(",jaillist")
+
+    failed = 0
+    for content in commands:
+        expected = mock.sent.get(channel, 0) + 1
+        await mock.inject_message(guild, channel, guild.staff[0], content)
+        if not await mock.wait_sent(channel, expected, timeout=30.0):
+            failed += 1
+            print(f"⚠️ No reply to {content}")
+    return len(commands), failed
+
+
+async def run_profile(profile, mock, guild, args):
+    from benchmarks.bench_e2e import prepare_workdir
+    workdir = prepare_workdir(guild, list(guild.members)[:args.birthdays])
+    env = {
+        **os.environ, "MEMORY_PROFILE": profile, "PYTHONPATH": ROOT,
+        "CASE_DB_PATH": os.path.join(workdir, "data", "cases.db")
+    }
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.bench_memory", "--child",
+        "--base-url", mock.http.base_url, "--gateway-url", mock.gateway_url,
+        *(["--tracemalloc"] if args.tracemalloc else []),
+        cwd=workdir, env=env, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE
+    )
+
+    async def read_report():
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"{profile} bot exited early (code {await process.wait()})")
+            line = line.decode()
+            if line.startswith(MARK):
+                return json.loads(line[len(MARK):])
+
+    async def ask(command):
+        process.stdin.write(f"{command}\n".encode())
+        await process.stdin.drain()
+        return await read_report()
+
+    requests_before, chunks_before = mock.http.stats["requests"], mock.chunk_requests
+    reports = [await read_report(), await read_report()]
+
+    channel = next(channel_id for channel_id in guild.channels if channel_id != guild.log_channel)
+    sent, failed = await workload(mock, guild, channel, args)
+    reports.append(await ask("load"))
+    reports.append(await ask("sweep"))
+
+    process.stdin.write(b"\n")
+    await process.stdin.drain()
+    await process.wait()
+    traffic = {
+        "commands": sent, "failed": failed, "requests": mock.http.stats["requests"] - requests_before,
+        "member requests": mock.chunk_requests - chunks_before
+    }
+    return reports, traffic
+
+
+async def main(args):
+    sys.path.insert(0, ROOT)
+    from benchmarks.mock_discord import MockDiscord, SyntheticGuild
+
+    start = time.perf_counter()
+    guild = SyntheticGuild(members=args.members, channels=2, messages=10, bans=10, staff=5, online=args.online)
+    mock = await MockDiscord([guild], latency=args.latency, bucket_limit=1000).start()
+    print(f"🏗️ {args.members} members ({len(guild.online)} online) built in {time.perf_counter() - start:.1f}s")
+
+    traced = f"{'traced MB':>10}" if args.tracemalloc else ""
+    print(f"{'profile':<8} {'phase':<9} {'RSS MB':>8}{traced} {'members':>8} {'users':>8} {'presences':>10} {'seconds':>8}")
+    for profile in args.profiles.split(","):
+        reports, traffic = await run_profile(profile, mock, guild, args)
+        for line in reports:
+            traced = f"{line['traced']:>10.1f}" if "traced" in line else ""
+            print(
+                f"{profile:<8} {line['phase']:<9} {line['rss']:>8.1f}{traced} {line['members']:>8} "
+                f"{line['users']:>8} {line['presences']:>10} {line['seconds']:>8.2f}"
+            )
+        print(f"         {traffic}")
+
+    await mock.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=100000)
+    parser.add_argument("--online", type=float, default=0.2, help="fraction of members with a presence")
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    parser.add_argument("--birthdays", type=int, default=5000)
+    parser.add_argument("--userinfo", type=int, default=200, help="userinfo lookups by ID")
+    parser.add_argument("--birthday-pages", type=int, default=10)
+    parser.add_argument("--jail", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every REST call")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report Python heap via tracemalloc (slower)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--gateway-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    asyncio.run(child(args) if args.child else main(args))
@@ -0,0 +1,124 @@
+# Purge engine vs. a serial fetch-then-delete loop (what channel.purge does) on a
+# simulated channel. Page fetches and deletes sleep for --latency to stand in for REST.
+#
+#   python -m benchmarks.bench_purge --messages 100000 --latency 0.05
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import discord
+
+from utils.purge import purge, parse_filters
+
+
+class FakeMessage:
+    __slots__ = ("id", "content", "created_at", "author", "attachments", "embeds", "channel")
+
+    def __init__(self, id, content, created_at, author, channel):
+        self.id = id
+        self.content = content
+        self.created_at = created_at
+        self.author = author
+        self.attachments = []
+        self.embeds = []
+        self.channel = channel
+
+    async def delete(self):
+        await self.channel.request()
+        self.channel.deleted.add(self.id)
+
+
+class FakeChannel:
+    def __init__(self, count, latency, old_fraction):
+        self.latency = latency
+        self.deleted = set()
+        self.requests = 0
+        now = discord.utils.utcnow()
+        authors = [SimpleNamespace(id=i, bot=i % 10 == 0) for i in range(50)]
+        old_after = int(count * (1 - old_fraction))
+        self.messages = [
+            FakeMessage(
+                count - i, f"message {i} https://spam.example" if i % 3 == 0 else f"message {i}",
+                now - (timedelta(days=20) if i >= old_after else timedelta(seconds=i)),
+                authors[i % len(authors)], self
+            )
+            for i in range(count)
+        ]
+
+    async def request(self):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+
+    async def history(self, limit=None, before=None, after=None):
+        # Newest first, fetched in pages of 100 like discord.py
+        for start in range(0, min(limit or len(self.messages), len(self.messages)), 100):
+            await self.request()
+            for message in self.messages[start:start + 100]:
+                if message.id not in self.deleted:
+                    yield message
+
+    async def delete_messages(self, messages):
+        await self.request()
+        cutoff = discord.utils.utcnow() - timedelta(days=14)
+        if any(m.created_at < cutoff for m in messages):
+            raise discord.HTTPException(SimpleNamespace(status=400, reason="Bad Request"), "Message too old")
+        self.deleted.update(m.id for m in messages)
+
+
+async def serial_purge(channel, predicate, limit):
+    # Mirrors TextChannel.purge: fetch, collect 100, bulk delete, then keep fetching;
+    # messages past the 14 day cutoff are deleted one by one inline
+    batch, deleted = [], 0
+    cutoff = discord.utils.utcnow() - timedelta(days=14)
+    async for message in channel.history(limit=limit):
+        if not predicate(message):
+            continue
+        if message.created_at < cutoff:
+            await message.delete()
+            deleted += 1
+        else:
+            batch.append(message)
+        if len(batch) == 100:
+            await channel.delete_messages(batch)
+            deleted += len(batch)
+            batch = []
+    if batch:
+        await channel.delete_messages(batch)
+        deleted += len(batch)
+    return deleted
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--old-fraction", type=float, default=0.0, help="share of messages older than 14 days")
+    args = parser.parse_args()
+
+    predicate = parse_filters(["has:link"]).compile()
+    limit = args.messages  # scan everything
+
+    channel = FakeChannel(args.messages, args.latency, args.old_fraction)
+    start = time.perf_counter()
+    deleted = await serial_purge(channel, predicate, limit)
+    serial_time = time.perf_counter() - start
+    print(f"   serial: deleted {deleted} in {serial_time:.2f}s ({channel.requests} requests)")
+
+    channel = FakeChannel(args.messages, args.latency, args.old_fraction)
+    start = time.perf_counter()
+    progress = await purge(channel, predicate, limit, scan_limit=limit)
+    engine_time = time.perf_counter() - start
+    print(f"   engine: deleted {progress.deleted} in {engine_time:.2f}s ({channel.requests} requests) "
+          f"x{serial_time / engine_time:.2f}")
+
+    channel = FakeChannel(args.messages, args.latency, args.old_fraction)
+    start = time.perf_counter()
+    progress = await purge(channel, predicate, limit, scan_limit=limit, dry_run=True)
+    print(f"  dry-run: matched {progress.matched} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
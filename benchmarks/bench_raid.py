@@ -0,0 +1,136 @@
+# Replays a synthetic raid through the anti-raid detector: first as fast as
+# possible, then paced in real time through asyncio tasks (one per event, the
+# way discord.py dispatches listeners) to check it keeps up with the gateway.
+# A timestamp-list counter that rescans its window on every event is the baseline.
+#
+#   python -m benchmarks.bench_raid --rate 10000 --seconds 5
+
+import argparse
+import asyncio
+import random
+import time
+
+from config import RAID_THRESHOLDS
+from utils.raid import RaidDetector
+
+
+class ListCounter:
+    # The obvious approach: keep every timestamp, drop the expired ones each event
+    def __init__(self, window):
+        self.window = window
+        self.times = []
+
+    def add(self, now, n=1):
+        self.times.extend([now] * n)
+        cutoff = now - self.window
+        self.times = [t for t in self.times if t > cutoff]
+        return len(self.times)
+
+
+class NaiveDetector(RaidDetector):
+    def _state(self, guild_id):
+        state = super()._state(guild_id)
+        if not isinstance(state.joins, ListCounter):
+            state.joins = ListCounter(self.thresholds["joins"][1])
+        return state
+
+    def on_message(self, guild_id, channel_id, content, mentions, now):
+        state = self._state(guild_id)
+        if channel_id not in state.channels:
+            state.channels[channel_id] = (
+                ListCounter(self.thresholds["messages"][1]),
+                ListCounter(self.thresholds["mentions"][1]),
+            )
+        return super().on_message(guild_id, channel_id, content, mentions, now)
+
+
+def make_events(rng, count, rate, guilds, channels):
+    # (offset seconds, kind, guild, channel, content, mentions); guild 0 is being raided
+    spam = ["join my server discord.gg/free", "@everyone FREE NITRO", "raid raid raid"]
+    events = []
+    for i in range(count):
+        offset = i / rate
+        guild = 0 if rng.random() < 0.6 else rng.randrange(1, guilds)
+        if rng.random() < 0.1:
+            events.append((offset, "join", guild, None, None, 0))
+            continue
+        channel = guild * 1000 + rng.randrange(channels)
+        if guild == 0 and rng.random() < 0.5:
+            content, mentions = rng.choice(spam), rng.randint(0, 5)
+        else:
+            content, mentions = f"message {rng.random()}", int(rng.random() < 0.05)
+        events.append((offset, "message", guild, channel, content, mentions))
+    return events
+
+
+def feed(detector, event, now):
+    _, kind, guild, channel, content, mentions = event
+    if kind == "join":
+        alert = detector.on_join(guild, now)
+        return [alert] if alert else []
+    return detector.on_message(guild, channel, content, mentions, now)
+
+
+def throughput(label, detector, events, start_time=1000.0):
+    alerts = 0
+    start = time.perf_counter()
+    for event in events:
+        alerts += len(feed(detector, event, start_time + event[0]))
+    elapsed = time.perf_counter() - start
+    print(f"{label:>10}: {len(events) / elapsed:12,.0f} events/s  ({elapsed * 1e6 / len(events):.2f} µs/event, {alerts} alerts)")
+
+
+async def replay(detector, events, rate):
+    lags = []
+    alerts = 0
+
+    pending = set()
+
+    async def handle(event, due):
+        nonlocal alerts
+        now = time.monotonic()
+        lags.append(now - due)
+        alerts += len(feed(detector, event, now))
+
+    loop = asyncio.get_running_loop()
+    start = time.monotonic()
+    chunk = max(1, rate // 1000)  # release events in 1ms slices
+    for i in range(0, len(events), chunk):
+        due = start + events[i][0]
+        delay = due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        for event in events[i:i + chunk]:
+            task = loop.create_task(handle(event, start + event[0]))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    while pending:
+        await asyncio.gather(*pending)
+    elapsed = time.monotonic() - start
+
+    lags.sort()
+    print(f"    replay: {len(events)} events at {rate:,}/s took {elapsed:.2f}s "
+          f"(target {len(events) / rate:.2f}s), {alerts} alerts")
+    print(f"            dispatch lag p50 {lags[len(lags) // 2] * 1e3:.2f}ms, "
+          f"p99 {lags[int(len(lags) * 0.99)] * 1e3:.2f}ms, max {lags[-1] * 1e3:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=10000, help="events per second")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--channels", type=int, default=20, help="channels per guild")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    events = make_events(rng, int(args.rate * args.seconds), args.rate, args.guilds, args.channels)
+    print(f"{len(events)} events, thresholds {RAID_THRESHOLDS}")
+
+    throughput("naive", NaiveDetector(), events)
+    throughput("ring", RaidDetector(), events)
+    asyncio.run(replay(RaidDetector(), events, args.rate))
+
+
+if __name__ == "__main__":
+    main()
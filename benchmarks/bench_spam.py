@@ -0,0 +1,84 @@
+# Spam detector throughput and memory on a large server: many members posting
+# once or twice plus a handful of spammers. The baseline keeps every user's
+# message list in a plain dict, which is what an unbounded tracker grows into.
+# Flag counts differ: the baseline keeps flagging a spammer on every message,
+# while the tracker resets a user's history after each response.
+#
+#   python -m benchmarks.bench_spam --users 100000 --messages 300000
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from config import SPAM_WINDOW, SPAM_DUPLICATES
+from utils.raid import content_key
+from utils.spam import SpamTracker
+
+
+class DictTracker:
+    def __init__(self):
+        self.users = {}
+
+    def check(self, guild_id, user_id, channel_id, content, mentions, now):
+        history = self.users.setdefault((guild_id, user_id), [])
+        digest = content_key(content)
+        history.append((now, digest, channel_id, mentions))
+        recent = [entry for entry in history if entry[0] >= now - SPAM_WINDOW and entry[1] == digest]
+        if len(recent) >= SPAM_DUPLICATES:
+            return "repeated messages", {entry[2] for entry in recent}
+        return None
+
+
+def make_messages(rng, users, count, spammers, rate):
+    spam = ["FREE NITRO discord.gg/scam", "buy followers cheap", "@everyone look at this"]
+    messages = []
+    for i in range(count):
+        if rng.random() < 0.05:
+            user, content = rng.randrange(spammers), rng.choice(spam)
+        else:
+            user, content = rng.randrange(spammers, users), f"hello {rng.random()} how is everyone"
+        messages.append((i / rate, user, rng.randrange(30), content))
+    return messages
+
+
+def feed(tracker, messages):
+    flagged = 0
+    for offset, user, channel, content in messages:
+        if tracker.check(1, user, channel, content, 0, 1000.0 + offset):
+            flagged += 1
+    return flagged
+
+
+def run(label, make_tracker, messages):
+    tracker = make_tracker()
+    start = time.perf_counter()
+    flagged = feed(tracker, messages)
+    elapsed = time.perf_counter() - start
+
+    # Memory on a second pass; tracemalloc slows allocation too much to time under it
+    tracemalloc.start()
+    tracker = make_tracker()
+    feed(tracker, messages)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>8}: {len(messages) / elapsed:10,.0f} msgs/s  {current / 2**20:7.1f} MiB held "
+          f"(peak {peak / 2**20:.1f})  {len(tracker.users):,} users tracked  {flagged} flagged")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--messages", type=int, default=300000)
+    parser.add_argument("--spammers", type=int, default=20)
+    parser.add_argument("--rate", type=int, default=2000, help="messages per second of simulated time")
+    args = parser.parse_args()
+
+    messages = make_messages(random.Random(42), args.users, args.messages, args.spammers, args.rate)
+    print(f"{len(messages):,} messages from up to {args.users:,} users over {len(messages) / args.rate:.0f}s")
+    run("dict", DictTracker, messages)
+    run("lru+ttl", SpamTracker, messages)
+
+
+if __name__ == "__main__":
+    main()
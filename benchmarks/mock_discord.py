@@ -0,0 +1,532 @@
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+
+import discord
+import yarl
+from aiohttp import web, WSMsgType
+
+from benchmarks.mock_http import MockDiscordHTTP, error
+
+# A local stand-in for all of Discord that BleedBot talks to: the REST mock from
+# mock_http plus a gateway websocket on the same port, backed by synthetic guilds
+# whose members, roles, channels, bans and message history the routes read and edit.
+
+DISCORD_EPOCH = 1420070400000
+BOT_ID = 100000000000000001
+MENTION = re.compile(r"<@!?(\d+)>")
+
+_increment = itertools.count()
+
+
+def snowflake(at=None):
+    ms = int((time.time() if at is None else at) * 1000)
+    return ((ms - DISCORD_EPOCH) << 22) | (next(_increment) & 0xFFF)
+
+
+def iso(at):
+    return datetime.fromtimestamp(at, timezone.utc).isoformat()
+
+
+def user_payload(user_id, name=None, bot=False):
+    return {
+        "id": str(user_id), "username": name or f"user{user_id % 100000}", "discriminator": "0",
+        "global_name": None, "avatar": None, "bot": bot
+    }
+
+
+def use_mock(base_url, gateway_url):
+    # Points discord.py at the mock; non-sharded clients never ask /gateway where to connect.
+    # Called by start(), or on its own by a bot running in another process.
+    discord.http.Route.BASE = base_url
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(gateway_url)
+
+
+class SyntheticGuild:
+    # One guild's state. Roles: @everyone, staff, jail and a few filler roles; the
+    # first `staff` members hold the staff role. Message history is generated up front
+    # with timestamps inside the last hour, so purges take the bulk-delete path.
+
+    def __init__(self, members=1000, channels=10, messages=500, bans=1000, staff=5, online=0.2, seed=0):
+        rng = random.Random(seed)
+        now = time.time()
+        self.id = snowflake(now - 86400 * 365)
+        self.name = f"Bench Guild {self.id % 1000}"
+        self.staff_role = snowflake(now - 86400 * 300)
+        self.jail_role = snowflake(now - 86400 * 300)
+        self.roles = {self.id: "@everyone", self.staff_role: "Staff", self.jail_role: "Jailed"}
+        filler = [snowflake(now - 86400 * 300) for _ in range(8)]
+        self.roles.update((role_id, f"role-{i}") for i, role_id in enumerate(filler))
+
+        self.channels = {snowflake(now - 86400 * 200): f"channel-{i}" for i in range(channels)}
+        self.log_channel = snowflake(now - 86400 * 200)
+        self.channels[self.log_channel] = "mod-log"
+
+        self.members = {}  # user ID -> {"roles": [role IDs], "joined_at": ISO time, "timeout": ISO time or None}
+        self.users = {BOT_ID: user_payload(BOT_ID, "BleedBot", bot=True)}
+        for i in range(members):
+            user_id = snowflake(now - 86400 * 100 + i)
+            roles = [self.staff_role] if i < staff else rng.sample(filler, rng.randint(0, 3))
+            self.members[user_id] = {"roles": roles, "joined_at": iso(now - rng.randint(3600, 86400 * 90)), "timeout": None}
+            self.users[user_id] = user_payload(user_id)
+        self.members[BOT_ID] = {"roles": [], "joined_at": iso(now - 86400 * 200), "timeout": None}
+        self.staff = list(self.members)[:staff]
+        self.online = {user_id for user_id in self.members if rng.random() < online}  # Members with a presence
+
+        self.bans = {}  # user ID -> reason
+        for _ in range(bans):
+            user_id = snowflake(now - 86400 * 50)
+            self.bans[user_id] = "Synthetic ban"
+            self.users[user_id] = user_payload(user_id)
+
+        authors = list(self.members)
+        self.history = {}  # channel ID -> {message ID: (author ID, content)}, oldest first
+        for channel_id in self.channels:
+            log = self.history[channel_id] = {}
+            for i in range(messages):
+                at = now - 3600 + 3600 * i / max(messages, 1)
+                content = f"message {i} https://spam.example" if i % 5 == 0 else f"message {i}"
+                log[snowflake(at)] = (rng.choice(authors), content)
+
+    def member_payload(self, user_id, with_user=True):
+        member = self.members[user_id]
+        payload = {
+            "roles": [str(role_id) for role_id in member["roles"]], "joined_at": member["joined_at"],
+            "nick": None, "avatar": None, "deaf": False, "mute": False, "flags": 0, "pending": False,
+            "premium_since": None, "communication_disabled_until": member["timeout"]
+        }
+        if with_user:
+            payload["user"] = self.users[user_id]
+        return payload
+
+    def presence_payload(self, user_id):
+        activities = [] if user_id % 3 else [{"name": "Some Game", "type": 0, "created_at": 0}]
+        return {
+            "user": {"id": str(user_id)}, "status": "online", "activities": activities,
+            "client_status": {"desktop": "online"}
+        }
+
+    def payload(self, large_threshold=250, presences=False):
+        # Like Discord: a large guild's GUILD_CREATE only carries the bot and, with the presences
+        # intent, the members who are online; everyone else has to be chunked (op 8)
+        large = len(self.members) > large_threshold
+        if not large:
+            members = list(self.members)
+        else:
+            members = [BOT_ID] + ([user_id for user_id in self.online if user_id != BOT_ID] if presences else [])
+        return {
+            "id": str(self.id), "name": self.name, "owner_id": str(BOT_ID), "unavailable": False,
+            "member_count": len(self.members), "large": large,
+            "system_channel_id": str(next(iter(self.channels))), "features": [], "emojis": [], "stickers": [],
+            "presences": [self.presence_payload(user_id) for user_id in members if presences and user_id in self.online],
+            "voice_states": [], "threads": [], "stage_instances": [],
+            "guild_scheduled_events": [], "premium_tier": 0, "verification_level": 0,
+            "roles": [
+                {
+                    "id": str(role_id), "name": name, "color": 0, "hoist": False, "managed": False,
+                    "mentionable": False, "position": 0 if role_id == self.id else i,
+                    "permissions": str(discord.Permissions.all().value if role_id == self.staff_role else 0)
+                }
+                for i, (role_id, name) in enumerate(self.roles.items())
+            ],
+            "channels": [
+                {
+                    "id": str(channel_id), "type": 0, "name": name, "position": i, "guild_id": str(self.id),
+                    "permission_overwrites": [], "nsfw": False, "parent_id": None, "topic": None,
+                    "rate_limit_per_user": 0, "last_message_id": None
+                }
+                for i, (channel_id, name) in enumerate(self.channels.items())
+            ],
+            "members": [self.member_payload(user_id) for user_id in members],
+        }
+
+    def message_payload(self, channel_id, message_id, author_id, content, embeds=()):
+        mentions = []
+        for match in MENTION.finditer(content or ""):
+            user_id = int(match.group(1))
+            if user_id in self.members:
+                mentions.append({**self.users[user_id], "member": self.member_payload(user_id, with_user=False)})
+        payload = {
+            "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(self.id),
+            "author": self.users[author_id], "content": content or "", "embeds": list(embeds),
+            "timestamp": iso(discord.utils.snowflake_time(message_id).timestamp()), "edited_timestamp": None,
+            "tts": False, "mention_everyone": False, "mentions": mentions, "mention_roles": [],
+            "attachments": [], "pinned": False, "type": 0, "flags": 0
+        }
+        if author_id in self.members:
+            payload["member"] = self.member_payload(author_id, with_user=False)
+        return payload
+
+
+class MockDiscord:
+    # REST routes and a gateway for the synthetic guilds. Besides answering the bot it
+    # plays Discord's part in events: member edits, bans and kicks are echoed back as
+    # gateway dispatches, and inject_message() delivers a MESSAGE_CREATE as if a user typed it.
+
+    def __init__(self, guilds, latency=0.0, bucket_limit=50, bucket_window=1.0, closed_dms=0.0, recommended_shards=1):
+        self.guilds = {guild.id: guild for guild in guilds}
+        self.recommended_shards = recommended_shards
+        self.closed_dms = closed_dms
+        self.http = MockDiscordHTTP(latency=latency, bucket_limit=bucket_limit, bucket_window=bucket_window)
+        self.http.app.router.add_get("/gateway", self._gateway)
+
+        self.sockets = {}  # websocket -> (shard ID, shard count) it identified as
+        self.identify = {}  # websocket -> its IDENTIFY payload (intents, large_threshold)
+        self.chunk_requests = 0
+        self.sequence = 0
+        self.dm_channels = {}  # DM channel ID -> user ID
+        self.sent = {}         # channel ID -> messages the bot posted
+        self.last_sent = {}    # channel ID -> (message ID, request body) of the bot's latest post or edit there
+        self.interaction_responses = []  # Bodies the bot answered component interactions with
+        self._identified = asyncio.Event()
+        self._posted = asyncio.Event()
+
+        routes = [
+            ("GET", r"/gateway", self._get_gateway),
+            ("GET", r"/gateway/bot", self._get_gateway_bot),
+            ("GET", r"/oauth2/applications/@me", self._application),
+            ("PUT", r"/applications/(\d+)/commands", lambda request, match: []),
+            ("GET", r"/users/(\d+)", self._get_user),
+            ("POST", r"/users/@me/channels", self._create_dm),
+            ("GET", r"/channels/(\d+)/messages", self._history),
+            ("POST", r"/channels/(\d+)/messages", self._send_message),
+            ("POST", r"/interactions/(\d+)/([^/]+)/callback", self._interaction_callback),
+            ("PATCH", r"/channels/(\d+)/messages/(\d+)", self._edit_message),
+            ("DELETE", r"/channels/(\d+)/messages/(\d+)", self._delete_message),
+            ("POST", r"/channels/(\d+)/messages/bulk-delete", self._bulk_delete),
+            ("GET", r"/guilds/(\d+)/members/(\d+)", self._get_member),
+            ("PATCH", r"/guilds/(\d+)/members/(\d+)", self._edit_member),
+            ("DELETE", r"/guilds/(\d+)/members/(\d+)", self._kick),
+            ("GET", r"/guilds/(\d+)/bans", self._bans),
+            ("PUT", r"/guilds/(\d+)/bans/(\d+)", self._ban),
+            ("DELETE", r"/guilds/(\d+)/bans/(\d+)", self._unban),
+        ]
+        for method, pattern, handler in routes:
+            self.http.route(method, pattern, handler)
+
+    @property
+    def gateway_url(self):
+        return f"ws://{self.http.host}:{self.http.port}/gateway"
+
+    async def start(self):
+        await self.http.start()
+        use_mock(self.http.base_url, self.gateway_url)
+        return self
+
+    async def stop(self):
+        for ws in list(self.sockets):
+            await ws.close()
+        await self.http.stop()
+
+    # Gateway
+
+    async def _gateway(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets[ws] = (0, 1)
+        await ws.send_json({"op": 10, "d": {"heartbeat_interval": 41250}, "s": None, "t": None})
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                payload = json.loads(msg.data)
+                if payload["op"] == 1:
+                    await ws.send_json({"op": 11, "d": None, "s": None, "t": None})
+                elif payload["op"] == 2:
+                    self.identify[ws] = payload["d"]
+                    await self._identify(ws, payload["d"].get("shard") or [0, 1])
+                elif payload["op"] == 8:
+                    await self._request_members(ws, payload["d"])
+        finally:
+            self.sockets.pop(ws, None)
+            self.identify.pop(ws, None)
+        return ws
+
+    async def _identify(self, ws, shard):
+        # Like Discord, a shard only hears about the guilds (guild_id >> 22) % count routes to it
+        self.sockets[ws] = tuple(shard)
+        guilds = [guild for guild in self.guilds.values() if self._routes_to(guild.id, ws)]
+        await self._send(ws, "READY", {
+            "v": 10, "user": user_payload(BOT_ID, "BleedBot", bot=True), "session_id": "mock-session",
+            "resume_gateway_url": self.gateway_url, "application": {"id": str(BOT_ID), "flags": 0},
+            "guilds": [{"id": str(guild.id), "unavailable": True} for guild in guilds],
+            "private_channels": [], "relationships": [], "shard": list(shard)
+        })
+        options = self.identify.get(ws, {})
+        presences = bool(options.get("intents", 0) & discord.Intents(presences=True).value)
+        for guild in guilds:
+            await self._send(ws, "GUILD_CREATE", guild.payload(options.get("large_threshold", 50), presences))
+        self._identified.set()
+
+    async def _request_members(self, ws, request):
+        # Op 8: answers with GUILD_MEMBERS_CHUNK events of up to 1000 members
+        self.chunk_requests += 1
+        guild = self.guilds.get(int(request["guild_id"]))
+        if guild is None:
+            return
+        if request.get("user_ids"):
+            wanted = [int(user_id) for user_id in request["user_ids"]]
+            found = [user_id for user_id in wanted if user_id in guild.members]
+            not_found = [str(user_id) for user_id in wanted if user_id not in guild.members]
+        else:
+            query = (request.get("query") or "").lower()
+            found = [user_id for user_id in guild.members if guild.users[user_id]["username"].startswith(query)]
+            not_found = []
+            if request.get("limit"):
+                found = found[:request["limit"]]
+        chunks = [found[i:i + 1000] for i in range(0, len(found), 1000)] or [[]]
+        for index, chunk in enumerate(chunks):
+            data = {
+                "guild_id": str(guild.id), "members": [guild.member_payload(user_id) for user_id in chunk],
+                "chunk_index": index, "chunk_count": len(chunks), "not_found": not_found if index == 0 else []
+            }
+            if request.get("nonce"):
+                data["nonce"] = request["nonce"]
+            if request.get("presences"):
+                data["presences"] = [guild.presence_payload(user_id) for user_id in chunk if user_id in guild.online]
+            await self._send(ws, "GUILD_MEMBERS_CHUNK", data)
+
+    def _routes_to(self, guild_id, ws):
+        shard_id, shard_count = self.sockets[ws]
+        return (guild_id >> 22) % shard_count == shard_id
+
+    async def _send(self, ws, event, data):
+        self.sequence += 1
+        await ws.send_str(json.dumps({"op": 0, "t": event, "s": self.sequence, "d": data}))
+
+    async def dispatch(self, event, data):
+        guild_id = int(data["guild_id"]) if "guild_id" in data else None
+        for ws in list(self.sockets):
+            if guild_id is None or self._routes_to(guild_id, ws):
+                await self._send(ws, event, data)
+
+    async def wait_identified(self):
+        await self._identified.wait()
+
+    async def wait_sent(self, channel_id, count, timeout=30.0):
+        # Waits until the bot has posted `count` messages to the channel in all; False on timeout
+        deadline = time.monotonic() + timeout
+        while self.sent.get(channel_id, 0) < count:
+            self._posted.clear()
+            try:
+                await asyncio.wait_for(self._posted.wait(), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def inject_message(self, guild, channel_id, author_id, content):
+        # A user message arriving over the gateway; returns its ID
+        message_id = snowflake()
+        guild.history[channel_id][message_id] = (author_id, content)
+        await self.dispatch("MESSAGE_CREATE", guild.message_payload(channel_id, message_id, author_id, content))
+        return message_id
+
+    async def click(self, guild, channel_id, message_id, user_id, custom_id):
+        # A button press on one of the bot's messages, delivered as INTERACTION_CREATE
+        self._posted.clear()
+        content, embeds = None, []
+        if message_id in guild.history[channel_id]:
+            content = guild.history[channel_id][message_id][1]
+        message = guild.message_payload(channel_id, message_id, BOT_ID, content, embeds)
+        await self.dispatch("INTERACTION_CREATE", {
+            "id": str(snowflake()), "application_id": str(BOT_ID), "type": 3, "token": "mock-token", "version": 1,
+            "guild_id": str(guild.id), "channel_id": str(channel_id), "message": message,
+            "data": {"custom_id": custom_id, "component_type": 2},
+            "member": {**guild.member_payload(user_id), "permissions": str(discord.Permissions.all().value)},
+            "app_permissions": str(discord.Permissions.all().value), "locale": "en-US", "guild_locale": "en-US"
+        })
+
+    async def _interaction_callback(self, request, match):
+        self.interaction_responses.append(await request.json())
+        self._posted.set()
+        return None
+
+    # REST helpers
+
+    def _channel(self, channel_id):
+        for guild in self.guilds.values():
+            if channel_id in guild.channels:
+                return guild
+        return None
+
+    def _user(self, user_id):
+        for guild in self.guilds.values():
+            user = guild.users.get(user_id)
+            if user:
+                return user
+        return None
+
+    def _guild(self, guild_id):
+        guild = self.guilds.get(int(guild_id))
+        return guild or error(404, "Unknown Guild", 10004)
+
+    # REST routes
+
+    def _get_gateway(self, request, match):
+        return {"url": self.gateway_url}
+
+    def _get_gateway_bot(self, request, match):
+        return {
+            "url": self.gateway_url, "shards": self.recommended_shards,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}
+        }
+
+    def _application(self, request, match):
+        return {
+            "id": str(BOT_ID), "name": "BleedBot", "description": "", "icon": None, "bot_public": True,
+            "bot_require_code_grant": False, "owner": user_payload(BOT_ID + 1, "owner"), "verify_key": "0" * 64,
+            "flags": 0
+        }
+
+    def _get_user(self, request, match):
+        return self._user(int(match.group(1))) or error(404, "Unknown User", 10013)
+
+    async def _create_dm(self, request, match):
+        user_id = int((await request.json())["recipient_id"])
+        user = self._user(user_id)
+        if user is None:
+            return error(404, "Unknown User", 10013)
+        channel_id = snowflake()
+        self.dm_channels[channel_id] = user_id
+        return {"id": str(channel_id), "type": 1, "last_message_id": None, "recipients": [user]}
+
+    def _history(self, request, match):
+        channel_id = int(match.group(1))
+        guild = self._channel(channel_id)
+        if guild is None:
+            return error(404, "Unknown Channel", 10003)
+        limit = int(request.query.get("limit", 50))
+        before = int(request.query.get("before", 0)) or None
+        after = int(request.query.get("after", 0)) or None
+        ids = [i for i in guild.history[channel_id] if (before is None or i < before) and (after is None or i > after)]
+        # Newest first; with only `after`, the page is the oldest messages past it
+        page = ids[:limit] if after and not before else ids[-limit:]
+        log = guild.history[channel_id]
+        return [guild.message_payload(channel_id, i, *log[i]) for i in reversed(page)]
+
+    async def _send_message(self, request, match):
+        channel_id = int(match.group(1))
+        body = await request.json()
+        message_id = snowflake()
+        self.sent[channel_id] = self.sent.get(channel_id, 0) + 1
+        self.last_sent[channel_id] = (message_id, body)
+        self._posted.set()
+
+        if channel_id in self.dm_channels:
+            user_id = self.dm_channels[channel_id]
+            if self.closed_dms and (user_id * 2654435761) % 1000 < self.closed_dms * 1000:
+                return error(403, "Cannot send messages to this user", 50007)
+            return {
+                "id": str(message_id), "channel_id": str(channel_id), "author": user_payload(BOT_ID, "BleedBot", bot=True),
+                "content": body.get("content") or "", "embeds": body.get("embeds") or [], "timestamp": iso(time.time()),
+                "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+                "attachments": [], "pinned": False, "type": 0
+            }
+
+        guild = self._channel(channel_id)
+        if guild is None:
+            return error(404, "Unknown Channel", 10003)
+        guild.history[channel_id][message_id] = (BOT_ID, body.get("content"))
+        return guild.message_payload(channel_id, message_id, BOT_ID, body.get("content"), body.get("embeds") or [])
+
+    async def _edit_message(self, request, match):
+        channel_id, message_id = int(match.group(1)), int(match.group(2))
+        guild = self._channel(channel_id)
+        if guild is None or message_id not in guild.history[channel_id]:
+            return error(404, "Unknown Message", 10008)
+        body = await request.json()
+        self.last_sent[channel_id] = (message_id, body)
+        payload = guild.message_payload(channel_id, message_id, BOT_ID, body.get("content"), body.get("embeds") or [])
+        payload["edited_timestamp"] = iso(time.time())
+        return payload
+
+    def _delete_message(self, request, match):
+        guild = self._channel(int(match.group(1)))
+        if guild is None or guild.history[int(match.group(1))].pop(int(match.group(2)), None) is None:
+            return error(404, "Unknown Message", 10008)
+        return None
+
+    async def _bulk_delete(self, request, match):
+        channel_id = int(match.group(1))
+        guild = self._channel(channel_id)
+        if guild is None:
+            return error(404, "Unknown Channel", 10003)
+        ids = (await request.json())["messages"]
+        if not 2 <= len(ids) <= 100:
+            return error(400, "Invalid Form Body", 50035)
+        for message_id in ids:
+            guild.history[channel_id].pop(int(message_id), None)
+        return None
+
+    def _get_member(self, request, match):
+        guild = self._guild(match.group(1))
+        if isinstance(guild, web.Response):
+            return guild
+        user_id = int(match.group(2))
+        if user_id not in guild.members:
+            return error(404, "Unknown Member", 10007)
+        return guild.member_payload(user_id)
+
+    async def _edit_member(self, request, match):
+        guild = self._guild(match.group(1))
+        if isinstance(guild, web.Response):
+            return guild
+        user_id = int(match.group(2))
+        member = guild.members.get(user_id)
+        if member is None:
+            return error(404, "Unknown Member", 10007)
+        body = await request.json()
+        if "roles" in body:
+            member["roles"] = [int(role_id) for role_id in body["roles"]]
+        if "communication_disabled_until" in body:
+            member["timeout"] = body["communication_disabled_until"]
+        payload = guild.member_payload(user_id)
+        await self.dispatch("GUILD_MEMBER_UPDATE", {**payload, "guild_id": str(guild.id)})
+        return payload
+
+    async def _kick(self, request, match):
+        guild = self._guild(match.group(1))
+        if isinstance(guild, web.Response):
+            return guild
+        user_id = int(match.group(2))
+        if guild.members.pop(user_id, None) is None:
+            return error(404, "Unknown Member", 10007)
+        await self.dispatch("GUILD_MEMBER_REMOVE", {"guild_id": str(guild.id), "user": guild.users[user_id]})
+        return None
+
+    def _bans(self, request, match):
+        guild = self._guild(match.group(1))
+        if isinstance(guild, web.Response):
+            return guild
+        limit = int(request.query.get("limit", 1000))
+        before = int(request.query.get("before", 0)) or None
+        after = int(request.query.get("after", 0)) or None
+        ids = sorted(i for i in guild.bans if (before is None or i < before) and (after is None or i > after))
+        page = ids[-limit:] if before and not after else ids[:limit]
+        return [{"user": guild.users[i], "reason": guild.bans[i]} for i in page]
+
+    async def _ban(self, request, match):
+        guild = self._guild(match.group(1))
+        if isinstance(guild, web.Response):
+            return guild
+        user_id = int(match.group(2))
+        guild.users.setdefault(user_id, user_payload(user_id))
+        guild.bans[user_id] = request.headers.get("X-Audit-Log-Reason")
+        await self.dispatch("GUILD_BAN_ADD", {"guild_id": str(guild.id), "user": guild.users[user_id]})
+        if guild.members.pop(user_id, None) is not None:
+            await self.dispatch("GUILD_MEMBER_REMOVE", {"guild_id": str(guild.id), "user": guild.users[user_id]})
+        return None
+
+    async def _unban(self, request, match):
+        guild = self._guild(match.group(1))
+        if isinstance(guild, web.Response):
+            return guild
+        user_id = int(match.group(2))
+        if guild.bans.pop(user_id, False) is False:
+            return error(404, "Unknown Ban", 10026)
+        await self.dispatch("GUILD_BAN_REMOVE", {"guild_id": str(guild.id), "user": guild.users[user_id]})
+        return None
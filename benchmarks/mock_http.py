@@ -0,0 +1,144 @@
+import asyncio
+import json
+import re
+import time
+
+from aiohttp import web
+
+# Path segments that are IDs or invite codes collapse into the bucket template,
+# except for the "major parameters" Discord buckets on separately.
+MAJOR_PARAMS = ("channels", "guilds", "webhooks")
+ID_SEGMENT = re.compile(r"^\d{5,}$")
+
+
+def bucket_key(method, path):
+    parts = path.strip("/").split("/")
+    key = []
+    for i, part in enumerate(parts):
+        previous = parts[i - 1] if i else ""
+        if previous in MAJOR_PARAMS:
+            key.append(part)
+        elif ID_SEGMENT.match(part) or previous == "invites":
+            key.append("{id}")
+        else:
+            key.append(part)
+    return f"{method} /" + "/".join(key)
+
+
+class Bucket:
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = time.monotonic() + window
+
+    def take(self):
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+        if self.remaining <= 0:
+            return False, self.reset_at - now
+        self.remaining -= 1
+        return True, self.reset_at - now
+
+
+class MockDiscordHTTP:
+    # A local stand-in for the Discord REST API. It speaks enough of the
+    # rate-limit protocol (X-RateLimit-* headers, 429 + retry_after) for
+    # discord.py's HTTPClient to bucket and retry exactly as it does in production.
+
+    def __init__(self, latency=0.0, bucket_limit=5, bucket_window=1.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.bucket_limit = bucket_limit
+        self.bucket_window = bucket_window
+        self.host = host
+        self.port = port
+
+        self.handlers = {}  # (method, template regex) -> handler(request, match) -> JSON-able, None or a Response
+        self.buckets = {}
+        self.stats = {"requests": 0, "429": 0}
+        self.route_counts = {}
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/api/v10/{tail:.*}", self._dispatch)
+        self._runner = None
+
+        self.route("GET", r"/users/@me", lambda request, match: {
+            "id": "100000000000000001", "username": "BleedBot", "discriminator": "0001",
+            "avatar": None, "bot": True
+        })
+
+    def route(self, method, pattern, handler):
+        self.handlers[(method, re.compile(f"^{pattern}$"))] = handler
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/api/v10"
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _dispatch(self, request):
+        path = "/" + request.match_info["tail"]
+        key = bucket_key(request.method, path)
+        self.stats["requests"] += 1
+        self.route_counts[key] = self.route_counts.get(key, 0) + 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket(self.bucket_limit, self.bucket_window)
+        allowed, reset_after = bucket.take()
+        headers = {
+            "X-RateLimit-Limit": str(bucket.limit),
+            "X-RateLimit-Remaining": str(bucket.remaining),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            "X-RateLimit-Bucket": key,
+        }
+
+        if not allowed:
+            self.stats["429"] += 1
+            # discord.py treats a 429 without Via as a Cloudflare ban
+            headers["Via"] = "1.1 google"
+            body = {"message": "You are being rate limited.", "retry_after": reset_after, "global": False}
+            return json_response(body, status=429, headers=headers)
+
+        for (method, pattern), handler in self.handlers.items():
+            match = pattern.match(path)
+            if method == request.method and match:
+                payload = handler(request, match)
+                if asyncio.iscoroutine(payload):
+                    payload = await payload
+                if payload is None:
+                    return web.Response(status=204, headers=headers)
+                if isinstance(payload, web.Response):
+                    payload.headers.update(headers)
+                    return payload
+                return json_response(payload, headers=headers)
+
+        if request.method == "DELETE":
+            return web.Response(status=204, headers=headers)
+        return json_response({}, headers=headers)
+
+
+def json_response(payload, status=200, headers=None):
+    # discord.py only parses bodies whose Content-Type is exactly application/json (no charset)
+    return web.Response(body=json.dumps(payload).encode(), status=status, headers={**(headers or {}), "Content-Type": "application/json"})
+
+
+def error(status, message, code=0):
+    # A Discord-style JSON error; discord.py maps 403/404 to Forbidden/NotFound
+    return json_response({"message": message, "code": code}, status=status)
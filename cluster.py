@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import os
+import signal
+import sys
+
+import discord
+
+from config import TOKEN, SHARD_COUNT, CLUSTER_PROCESSES, CLUSTER_RESTART_DELAY, SHARED_DB_PATH
+from utils.cluster import split_shards, format_shard_ids
+
+# Runs the bot as several processes, each owning a contiguous range of shards:
+#
+#   CLUSTER_PROCESSES=4 SHARD_COUNT=auto python cluster.py
+#
+# Every process is a normal `python main.py` with SHARD_COUNT / SHARD_IDS / CLUSTER_ID
+# set, sharing warnings, notes, timers and settings through SHARED_DB_PATH.
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [cluster] %(message)s")
+
+IDENTIFY_WINDOW = 5.0  # Discord allows max_concurrency identifies per 5 seconds
+
+
+async def gateway_limits(token):
+    # Discord's recommended shard count and how many shards may identify at once
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    await http.static_login(token)
+    try:
+        data = await http.request(discord.http.Route("GET", "/gateway/bot"))
+    finally:
+        await http.close()
+    return data["shards"], data["session_start_limit"]["max_concurrency"]
+
+
+class Cluster:
+    def __init__(self, cluster_id, shard_ids, shard_count, env):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.env = {
+            **env,
+            "SHARD_COUNT": str(shard_count),
+            "SHARD_IDS": format_shard_ids(shard_ids),
+            "CLUSTER_ID": str(cluster_id),
+        }
+        self.process = None
+        self.crashes = 0
+
+    async def run(self, stopping):
+        # Restarts the process after a crash, backing off while it keeps failing
+        while not stopping.is_set():
+            self.process = await asyncio.create_subprocess_exec(sys.executable, "main.py", env=self.env)
+            logging.info(f"🚀 Cluster {self.cluster_id} (pid {self.process.pid}) shards {self.env['SHARD_IDS']}")
+            code = await self.process.wait()
+            if stopping.is_set():
+                return
+            self.crashes = self.crashes + 1 if code else 0
+            delay = CLUSTER_RESTART_DELAY * 2 ** min(self.crashes, 6)
+            logging.error(f"💥 Cluster {self.cluster_id} exited with {code}, restarting in {delay:.0f}s")
+            try:
+                await asyncio.wait_for(stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def terminate(self):
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+
+
+async def main():
+    if SHARD_COUNT and SHARD_COUNT != "auto":
+        shard_count, max_concurrency = int(SHARD_COUNT), 1
+    else:
+        shard_count, max_concurrency = await gateway_limits(TOKEN)
+    ranges = split_shards(shard_count, CLUSTER_PROCESSES)
+
+    env = dict(os.environ)
+    if not SHARED_DB_PATH:
+        # The per-process JSON journals can't take writes from several processes
+        env["SHARED_DB_PATH"] = "data/shared.db"
+        logging.info("🗄️ SHARED_DB_PATH not set, using data/shared.db")
+    logging.info(f"🧩 {shard_count} shards across {len(ranges)} processes (identify concurrency {max_concurrency})")
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    clusters = [Cluster(i, shard_ids, shard_count, env) for i, shard_ids in enumerate(ranges)]
+    tasks = []
+    for cluster in clusters:
+        tasks.append(asyncio.create_task(cluster.run(stopping)))
+        # Give this process's shards time to identify before the next process starts on its own
+        waves = -(-len(cluster.shard_ids) // max_concurrency)
+        try:
+            await asyncio.wait_for(stopping.wait(), waves * IDENTIFY_WINDOW)
+        except asyncio.TimeoutError:
+            pass
+
+    await stopping.wait()
+    logging.info("🛑 Stopping all clusters")
+    for cluster in clusters:
+        cluster.terminate()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
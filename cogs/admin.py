@@ -0,0 +1,201 @@
+import discord
+from discord.ext import commands, tasks
+import math
+import os
+import time
+from config import COGS, CLUSTER_ID, SHARD_STATUS_INTERVAL
+from utils.checks import is_staff, is_operator
+from utils.dm import dm_dispatcher
+from utils.embeds import create_error_embed, create_success_embed
+from utils.logger import log_command, log_sink
+from utils.metrics import metrics
+from utils.reloader import file_watcher
+from utils.shared_store import shared_store
+
+PERF_ROWS = 8  # Commands / routes listed by ,perf
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.0f}ms"
+
+
+def _field(lines):
+    # Embed field values cap at 1024 characters
+    text = "\n".join(lines) or "Nothing recorded yet."
+    return text if len(text) <= 1024 else text[:1020] + "\n…"
+
+
+def local_shards(bot):
+    # shard ID -> status for the shards this process runs
+    guilds = {}
+    for guild in bot.guilds:
+        guilds[guild.shard_id] = guilds.get(guild.shard_id, 0) + 1
+    if isinstance(bot, commands.AutoShardedBot):
+        shards = {shard_id: (shard.latency, shard.is_closed(), shard.is_ws_ratelimited()) for shard_id, shard in bot.shards.items()}
+    else:
+        shards = {0: (bot.latency, bot.is_closed(), bot.is_ws_ratelimited())}
+    now = time.time()
+    return {
+        shard_id: {
+            "latency": latency if math.isfinite(latency) else None,
+            "guilds": guilds.get(shard_id, 0),
+            "state": "closed" if closed else "ratelimited" if ratelimited else "ready",
+            "cluster": CLUSTER_ID, "pid": os.getpid(), "updated": now,
+        }
+        for shard_id, (latency, closed, ratelimited) in shards.items()
+    }
+
+class Admin(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        if shared_store:
+            self.shard_status = shared_store.table("shards")  # shard ID -> last status report from its process
+            self.report_shards.start()
+
+    def cog_unload(self):
+        self.report_shards.cancel()
+
+    @tasks.loop(seconds=SHARD_STATUS_INTERVAL)
+    async def report_shards(self):
+        await self.bot.wait_until_ready()
+        for shard_id, status in local_shards(self.bot).items():
+            self.shard_status.set(str(shard_id), status)
+
+    @commands.command(name="reload", aliases=["rl"])
+    @is_operator()
+    async def reload(self, ctx, *targets: str):
+        # ,reload             every loaded cog, then changed data files
+        # ,reload general fun only these cogs
+        # ,reload data        only re-read data files changed on disk
+        targets = [t.lower() for t in targets] or ["all"]
+        unknown = [t for t in targets if t not in COGS and t not in ("all", "data")]
+        if unknown:
+            return await ctx.send(embed=create_error_embed(
+                title="Unknown Cog",
+                reason=f"Known cogs: {', '.join(f'`{c}`' for c in COGS)}, or `all` / `data`.",
+                usage=",reload [cog...|all|data]",
+                example=",reload moderation general"
+            ))
+
+        if "all" in targets:
+            cogs = [name[5:] for name in self.bot.extensions if name.startswith("cogs.")]
+        else:
+            cogs = [t for t in targets if t != "data"]
+
+        lines = []
+        failed = False
+        for cog in cogs:
+            name = f"cogs.{cog}"
+            start = time.perf_counter()
+            try:
+                if name in self.bot.extensions:
+                    await self.bot.reload_extension(name)
+                else:
+                    await self.bot.load_extension(name)
+            except commands.ExtensionError as e:
+                failed = True
+                lines.append(f"❌ `{cog}`: {e.__cause__ or e}")
+                continue
+            lines.append(f"✅ `{cog}` in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        if "all" in targets or "data" in targets:
+            changed = file_watcher.check()
+            lines.append(f"♻️ Data files re-read: {', '.join(f'`{path}`' for path in changed) or 'none changed'}")
+
+        embed = discord.Embed(
+            title="♻️ Reload Finished" if not failed else "♻️ Reload Finished With Errors",
+            description="\n".join(lines),
+            color=discord.Color.red() if failed else discord.Color.green()
+        )
+        await ctx.send(embed=embed)
+        await log_command(ctx, "reload", {"targets": ", ".join(targets)})
+
+    @commands.command(name="perf")
+    @is_operator()
+    async def perf(self, ctx, action: str = None):
+        # ,perf         slowest commands and routes since startup (or the last reset)
+        # ,perf reset   start counting again
+        if action == "reset":
+            metrics.reset()
+            await ctx.send(embed=create_success_embed("Metrics Reset", "Command and REST timings start from zero."))
+            return await log_command(ctx, "perf reset")
+
+        slow_commands = sorted(metrics.commands.items(), key=lambda item: -item[1].quantile(0.99))[:PERF_ROWS]
+        command_lines = [
+            f"`{name}` ×{h.count} · p50 {_ms(h.quantile(0.5))} · p99 {_ms(h.quantile(0.99))} · "
+            f"{metrics.command_calls.get(name, 0) / h.count:.1f} REST/run"
+            + (f" · ❌ {metrics.command_errors[name]}" if metrics.command_errors.get(name) else "")
+            for name, h in slow_commands
+        ]
+
+        busy_routes = sorted(metrics.routes.items(), key=lambda item: -item[1].sum)[:PERF_ROWS]
+        route_lines = [
+            f"`{route}` ×{h.count} · p50 {_ms(h.quantile(0.5))} · p99 {_ms(h.quantile(0.99))} · "
+            f"queued p99 {_ms(metrics.waits[route].quantile(0.99))}"
+            + (f" · 🚦 {metrics.rate_limited[route]}×429" if metrics.rate_limited.get(route) else "")
+            for route, h in busy_routes
+        ]
+
+        queued = sum(h.sum for h in metrics.waits.values())
+        sink = log_sink.stats()
+        embed = discord.Embed(title="📈 Performance", color=discord.Color.blurple())
+        embed.add_field(name="⏱️ Slowest Commands (by p99)", value=_field(command_lines), inline=False)
+        embed.add_field(name="🌐 Busiest REST Routes (by total time)", value=_field(route_lines), inline=False)
+        embed.add_field(
+            name="🚦 Rate Limits",
+            value=f"{sum(metrics.rate_limited.values())} × 429 · {queued:.1f}s queued across "
+                  f"{sum(h.count for h in metrics.routes.values())} calls",
+            inline=False
+        )
+        embed.add_field(
+            name="📝 Log Sink",
+            value=f"{sink['sent']} sent in {sink['messages']} messages · queue {sink['queue_depth']} · "
+                  f"flush p50 {_ms(sink['flush_latency_p50'])} · dropped {sink['dropped']}",
+            inline=False
+        )
+        embed.add_field(
+            name="📨 DMs",
+            value=" · ".join(f"{name} {count}" for name, count in dm_dispatcher.counters.items()),
+            inline=False
+        )
+        embed.set_footer(text=f"Since {time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime(metrics.started))}")
+        await ctx.send(embed=embed)
+        await log_command(ctx, "perf")
+
+    @commands.command(name="shards")
+    @is_staff()
+    async def shards(self, ctx):
+        # Every process's shards when they share a store, otherwise just this process's
+        statuses = {int(shard_id): status for shard_id, status in self.shard_status.items()} if shared_store else {}
+        statuses.update(local_shards(self.bot))  # Our own shards are always current
+
+        now = time.time()
+        here = ctx.guild.shard_id if ctx.guild else None
+        lines = []
+        for shard_id, status in sorted(statuses.items()):
+            age = now - status["updated"]
+            if age > SHARD_STATUS_INTERVAL * 3:
+                icon, state = "🔴", f"no report for {age:.0f}s"
+            else:
+                icon = {"ready": "🟢", "ratelimited": "🟡"}.get(status["state"], "🔴")
+                state = status["state"]
+            latency = f"{status['latency'] * 1000:.0f}ms" if status["latency"] is not None else "—"
+            lines.append(
+                f"{icon} **#{shard_id}**{' 📍' if shard_id == here else ''} · {latency} · {status['guilds']} servers · "
+                f"cluster {status['cluster']} · {state}"
+            )
+
+        description = "\n".join(lines[:40])
+        if len(lines) > 40:
+            description += f"\n… and {len(lines) - 40} more"
+        embed = discord.Embed(title="🧩 Shards", description=description, color=discord.Color.blurple())
+        mine = sorted(local_shards(self.bot))
+        embed.set_footer(
+            text=f"{sum(s['guilds'] for s in statuses.values())} servers on {len(statuses)} shards | "
+                 f"This process: cluster {CLUSTER_ID}, shards {', '.join(map(str, mine))}"
+        )
+        await ctx.send(embed=embed)
+        await log_command(ctx, "shards")
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
@@ -0,0 +1,374 @@
+import discord
+from discord.ext import commands
+import logging
+import time
+import traceback
+from datetime import timedelta
+from config import (
+    RAID_LOCKDOWN_SECONDS, RAID_SLOWMODE_DELAY, RAID_SLOWMODE_SECONDS,
+    SPAM_WINDOW, SPAM_TIMEOUT_SECONDS, SPAM_PURGE_SCAN
+)
+from utils.checks import is_staff
+from utils.embeds import create_error_embed, create_success_embed, create_info_embed
+from utils.logger import log_command, log_sink
+from utils.matcher import MultiMatcher, LinkPolicy
+from utils.shared_store import open_store
+from utils.permissions import permission_cache, STAFF, LINK
+from utils.raid import RaidDetector
+from utils.spam import SpamTracker
+from utils.purge import purge
+from utils.case_store import case_store
+from utils.guild_config import guild_settings
+from utils.reloader import registry, file_watcher
+
+AUTOMOD_FILE = "data/automod.json"  # guild ID -> {"words": [], "deny": [], "allow": [], "allowlist_only": bool, "raid": bool, "spam": mode}
+
+RAID_RESPONSES = {
+    "joins": "lockdown",       # Locks the server's system (welcome) channel
+    "messages": "slowmode",
+    "mentions": "slowmode",
+    "identical": "lockdown",
+}
+
+SPAM_MODES = ("timeout", "purge", "both")
+
+
+class GuildFilter:
+    def __init__(self, settings):
+        self.words = MultiMatcher(settings.get("words", []))
+        self.links = LinkPolicy(settings.get("deny", []), settings.get("allow", []), settings.get("allowlist_only", False))
+
+
+class AutoMod(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # Store and rate counters survive ,reload automod through the registry
+        self.settings = registry.get("automod.settings", lambda: open_store(AUTOMOD_FILE, "automod"))
+        self.raids = registry.get("automod.raids", RaidDetector)
+        self.spam = registry.get("automod.spam", SpamTracker)
+        self._responses = set()  # Running responder tasks, so event handlers never wait on REST calls
+        self._rebuild()
+        file_watcher.watch(self.settings.path, self.reload_settings, key="automod")
+
+    def _rebuild(self):
+        self.filters = {}  # guild ID -> compiled GuildFilter, rebuilt only when that guild's lists change
+        self.raid_guilds = {int(gid) for gid, settings in self.settings.items() if settings.get("raid")}
+        self.spam_guilds = {int(gid): settings["spam"] for gid, settings in self.settings.items() if settings.get("spam")}
+
+    def reload_settings(self):
+        if not self.settings.reload_if_changed():
+            return False
+        self._rebuild()
+        return True
+
+    def get_filter(self, guild_id):
+        compiled = self.filters.get(guild_id)
+        if compiled is None:
+            compiled = self.filters[guild_id] = GuildFilter(self.settings.get(str(guild_id), {}))
+        return compiled
+
+    def update_settings(self, guild_id, **changes):
+        settings = dict(self.settings.get(str(guild_id), {}))
+        settings.update(changes)
+        self.settings.set(str(guild_id), settings)
+        self.filters.pop(guild_id, None)
+        if settings.get("raid"):
+            self.raid_guilds.add(guild_id)
+        else:
+            self.raid_guilds.discard(guild_id)
+        if settings.get("spam"):
+            self.spam_guilds[guild_id] = settings["spam"]
+        else:
+            self.spam_guilds.pop(guild_id, None)
+        return settings
+
+    def _respond_later(self, coro):
+        task = self.bot.loop.create_task(coro)
+        self._responses.add(task)
+        task.add_done_callback(self._response_done)
+
+    def _response_done(self, task):
+        self._responses.discard(task)
+        if not task.cancelled() and task.exception():
+            error = task.exception()
+            logging.error(f"❌ AutoMod response failed:\n{''.join(traceback.format_exception(error))}")
+
+    @commands.Cog.listener("on_member_join")
+    async def raid_watch_joins(self, member):
+        if member.guild.id not in self.raid_guilds:
+            return
+        alert = self.raids.on_join(member.guild.id, time.monotonic())
+        if alert:
+            self._respond_later(self.respond_to_raid(alert))
+
+    @commands.Cog.listener("on_message")
+    async def raid_watch_messages(self, message):
+        if message.guild is None or message.guild.id not in self.raid_guilds or message.author.bot:
+            return
+        alerts = self.raids.on_message(
+            message.guild.id, message.channel.id, message.content,
+            len(message.mentions) + len(message.role_mentions), time.monotonic()
+        )
+        for alert in alerts:
+            self._respond_later(self.respond_to_raid(alert))
+
+    @commands.Cog.listener("on_message")
+    async def spam_watch(self, message):
+        if message.guild is None or message.guild.id not in self.spam_guilds or message.author.bot:
+            return
+        if not isinstance(message.author, discord.Member) or permission_cache.mask(message.author) & STAFF:
+            return
+        flagged = self.spam.check(
+            message.guild.id, message.author.id, message.channel.id, message.content,
+            len(message.mentions) + len(message.role_mentions), time.monotonic()
+        )
+        if flagged:
+            reason, channel_ids = flagged
+            self._respond_later(self.respond_to_spam(message, reason, channel_ids))
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.spam.forget(member.guild.id, member.id)
+
+    async def respond_to_spam(self, message, reason, channel_ids):
+        guild, member = message.guild, message.author
+        mode = self.spam_guilds.get(guild.id)
+        results = []
+
+        moderation = self.bot.get_cog("Moderation")
+        if mode in ("timeout", "both") and moderation:
+            try:
+                await moderation.timeout_member(member, SPAM_TIMEOUT_SECONDS, f"AutoMod: {reason}")
+                results.append(f"timed out for {SPAM_TIMEOUT_SECONDS // 60}m")
+                if case_store:
+                    await case_store.add_case(
+                        guild.id, member.id, self.bot.user.id, str(self.bot.user), "mute", f"AutoMod: {reason}",
+                        extra={"duration": SPAM_TIMEOUT_SECONDS, "automod": "spam"}
+                    )
+            except discord.HTTPException:
+                results.append("couldn't time out")
+            except Exception:
+                # Whatever went wrong, the purge, the warning and the log below still happen
+                logging.error(f"❌ Spam timeout failed in {guild.name}:\n{traceback.format_exc()}")
+                results.append("couldn't time out")
+
+        if mode in ("purge", "both"):
+            since = discord.utils.utcnow() - timedelta(seconds=SPAM_WINDOW * 2)
+            deleted = 0
+            for channel_id in channel_ids:
+                channel = guild.get_channel(channel_id)
+                if not channel:
+                    continue
+                try:
+                    progress = await purge(
+                        channel, lambda m: m.author.id == member.id and m.created_at >= since,
+                        limit=SPAM_PURGE_SCAN, scan_limit=SPAM_PURGE_SCAN
+                    )
+                except discord.HTTPException:
+                    continue  # No access to this channel's history; the others are still cleaned
+                deleted += progress.deleted
+            results.append(f"{deleted} messages removed")
+
+        await message.channel.send(f"🚫 {member.mention}, slow down: {reason} isn't allowed here.", delete_after=10)
+
+        log_channel_id = guild_settings.get(guild.id, "log_channel")
+        if log_channel_id:
+            embed = discord.Embed(
+                title="🚫 Spam Detected",
+                description=f"{member.mention} (`{member.id}`) in {message.channel.mention}: **{reason}**; {', '.join(results)}.",
+                color=discord.Color.orange()
+            )
+            log_sink.submit(self.bot, log_channel_id, embed, guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.raids.forget_channel(channel.guild.id, channel.id)
+
+    async def respond_to_raid(self, alert):
+        guild = self.bot.get_guild(alert.guild_id)
+        moderation = self.bot.get_cog("Moderation")
+        if not guild or not moderation:
+            return
+
+        action = RAID_RESPONSES[alert.kind]
+        channel = guild.system_channel if alert.kind == "joins" else guild.get_channel(alert.channel_id)
+        reason = f"Anti-raid: {alert.count} {alert.kind} in {alert.window}s"
+        result = "no channel to act on"
+        if channel:
+            try:
+                if action == "lockdown":
+                    await moderation.lock_channel(channel, RAID_LOCKDOWN_SECONDS, reason)
+                    result = f"locked {channel.mention} for {RAID_LOCKDOWN_SECONDS // 60}m"
+                    notice = "🔒 Possible raid detected, this channel is locked for now."
+                else:
+                    await moderation.apply_slowmode(channel, RAID_SLOWMODE_DELAY, RAID_SLOWMODE_SECONDS, reason)
+                    result = f"set {RAID_SLOWMODE_DELAY}s slowmode in {channel.mention} for {RAID_SLOWMODE_SECONDS // 60}m"
+                    notice = f"🐢 Possible raid detected, slowmode is set to {RAID_SLOWMODE_DELAY}s for now."
+                await channel.send(notice, delete_after=30)
+            except discord.HTTPException as e:
+                result = f"couldn't {action} {channel.mention}: {e}"
+
+        log_channel_id = guild_settings.get(guild.id, "log_channel")
+        if log_channel_id:
+            embed = discord.Embed(
+                title="🛡️ Anti-Raid Triggered",
+                description=f"**{alert.count}** {alert.kind} in **{alert.window}s**; {result}.",
+                color=discord.Color.red()
+            )
+            log_sink.submit(self.bot, log_channel_id, embed, guild.id)
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.guild is None or message.author.bot or not message.content:
+            return
+
+        compiled = self.get_filter(message.guild.id)
+        if not compiled.words and not compiled.links:
+            return
+
+        mask = permission_cache.mask(message.author) if isinstance(message.author, discord.Member) else 0
+        if mask & STAFF:
+            return
+
+        reason = None
+        word = compiled.words.search(message.content) if compiled.words else None
+        if word:
+            reason = "a blocked word"
+        elif compiled.links and not mask & LINK:
+            domain = compiled.links.check(message.content)
+            if domain:
+                reason = f"a blocked link (`{domain}`)"
+
+        if not reason:
+            return
+
+        try:
+            await message.delete()
+        except (discord.Forbidden, discord.NotFound):
+            return
+        await message.channel.send(f"🚫 {message.author.mention}, your message contained {reason}.", delete_after=5)
+
+    @commands.group(name="automod", aliases=["am"], invoke_without_command=True)
+    @is_staff()
+    async def automod(self, ctx):
+        settings = self.settings.get(str(ctx.guild.id), {})
+        embed = discord.Embed(
+            title="🛡️ AutoMod Settings",
+            color=discord.Color.blurple()
+        )
+        embed.add_field(name="🚫 Blocked Words", value=f"{len(settings.get('words', []))} terms", inline=True)
+        embed.add_field(name="⛔ Denied Domains", value=", ".join(settings.get("deny", [])[:20]) or "None", inline=False)
+        embed.add_field(name="✅ Allowed Domains", value=", ".join(settings.get("allow", [])[:20]) or "None", inline=False)
+        embed.add_field(name="🔗 Allowlist Only", value="On" if settings.get("allowlist_only") else "Off", inline=True)
+        embed.add_field(name="🛡️ Anti-Raid", value="On" if settings.get("raid") else "Off", inline=True)
+        embed.add_field(name="📨 Spam Response", value=(settings.get("spam") or "off").title(), inline=True)
+        embed.set_footer(text="Subcommands: block, unblock, deny, allow, unlist, links, raid, spam")
+        await ctx.send(embed=embed)
+
+    async def _edit_list(self, ctx, key, terms, add, title):
+        if not terms:
+            return await ctx.send(embed=create_error_embed(
+                title="Missing Argument",
+                reason="You must give at least one term.",
+                usage=f",automod {ctx.invoked_with} <term> [term...]",
+                example=f",automod {ctx.invoked_with} example.com"
+            ))
+        current = set(self.settings.get(str(ctx.guild.id), {}).get(key, []))
+        terms = {term.lower() for term in terms}
+        current = current | terms if add else current - terms
+        self.update_settings(ctx.guild.id, **{key: sorted(current)})
+
+        embed = create_success_embed(title=title, message=f"{'Added' if add else 'Removed'} **{len(terms)}** entries. Total: **{len(current)}**.")
+        await ctx.send(embed=embed)
+        await log_command(ctx, f"automod {ctx.invoked_with}", {"terms": ", ".join(sorted(terms))[:1000]})
+
+    @automod.command(name="block")
+    @is_staff()
+    async def automod_block(self, ctx, *terms: str):
+        await self._edit_list(ctx, "words", terms, True, "🚫 Words Blocked")
+
+    @automod.command(name="unblock")
+    @is_staff()
+    async def automod_unblock(self, ctx, *terms: str):
+        await self._edit_list(ctx, "words", terms, False, "✅ Words Unblocked")
+
+    @automod.command(name="deny")
+    @is_staff()
+    async def automod_deny(self, ctx, *domains: str):
+        await self._edit_list(ctx, "deny", domains, True, "⛔ Domains Denied")
+
+    @automod.command(name="allow")
+    @is_staff()
+    async def automod_allow(self, ctx, *domains: str):
+        await self._edit_list(ctx, "allow", domains, True, "✅ Domains Allowed")
+
+    @automod.command(name="unlist")
+    @is_staff()
+    async def automod_unlist(self, ctx, *domains: str):
+        settings = self.settings.get(str(ctx.guild.id), {})
+        domains = {d.lower() for d in domains}
+        self.update_settings(
+            ctx.guild.id,
+            deny=sorted(set(settings.get("deny", [])) - domains),
+            allow=sorted(set(settings.get("allow", [])) - domains)
+        )
+        embed = create_success_embed(title="🧹 Domains Unlisted", message=f"Removed **{len(domains)}** domains from both lists.")
+        await ctx.send(embed=embed)
+        await log_command(ctx)
+
+    @automod.command(name="links")
+    @is_staff()
+    async def automod_links(self, ctx, mode: str = None):
+        if mode not in ("on", "off"):
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Mode",
+                reason="Use `on` to block every link not on the allow list, or `off`.",
+                usage=",automod links <on|off>",
+                example=",automod links on"
+            ))
+        self.update_settings(ctx.guild.id, allowlist_only=mode == "on")
+        embed = create_info_embed(
+            title="🔗 Link Filter",
+            message="Only allowed domains may be posted now." if mode == "on" else "Only denied domains are blocked now."
+        )
+        await ctx.send(embed=embed)
+        await log_command(ctx)
+
+    @automod.command(name="raid")
+    @is_staff()
+    async def automod_raid(self, ctx, mode: str = None):
+        if mode not in ("on", "off"):
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Mode",
+                reason="Use `on` to lock down or slow channels automatically when a raid is detected, or `off`.",
+                usage=",automod raid <on|off>",
+                example=",automod raid on"
+            ))
+        self.update_settings(ctx.guild.id, raid=mode == "on")
+        embed = create_info_embed(
+            title="🛡️ Anti-Raid",
+            message="Join, message, mention and duplicate-content floods will now be handled automatically." if mode == "on" else "Anti-raid responses are off."
+        )
+        await ctx.send(embed=embed)
+        await log_command(ctx)
+
+    @automod.command(name="spam")
+    @is_staff()
+    async def automod_spam(self, ctx, mode: str = None):
+        if mode not in SPAM_MODES + ("off",):
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Mode",
+                reason="Use `timeout`, `purge` (the spammer's recent messages), `both`, or `off`.",
+                usage=",automod spam <timeout|purge|both|off>",
+                example=",automod spam timeout"
+            ))
+        self.update_settings(ctx.guild.id, spam=None if mode == "off" else mode)
+        embed = create_info_embed(
+            title="📨 Spam Detection",
+            message="Spam detection is off." if mode == "off" else f"Repeated, cross-channel, mention and emoji spam will now get: **{mode}**."
+        )
+        await ctx.send(embed=embed)
+        await log_command(ctx)
+
+async def setup(bot):
+    await bot.add_cog(AutoMod(bot))
@@ -1,7 +1,8 @@
 import discord
 import random
 from discord.ext import commands
-from utils.embed import create_embed, create_error_embed, log_command
+from utils.embeds import create_embed, create_error_embed
+from utils.logger import log_command
 
 class Fun(commands.Cog):
     def __init__(self, bot):
@@ -23,8 +24,7 @@ class Fun(commands.Cog):
         response = random.choice(responses)
         embed = discord.Embed(
             title="🎱 8Ball",
-            description=f"**Question:** {question}
-**Answer:** {response}",
+            description=f"**Question:** {question}\n**Answer:** {response}",
             color=discord.Color.purple()
         )
         await ctx.send(embed=embed)
@@ -1,31 +1,44 @@
 import discord
+import logging
 from discord.ext import commands, tasks
-from utils.embed import create_embed, create_error_embed, create_info_embed, create_success_embed
+from utils.embeds import create_embed, create_error_embed, create_info_embed, create_success_embed
 from utils.logger import log_command
-import json
-from datetime import datetime
+from utils.bulk import run_bulk
+from utils.members import member_cache
+from utils.paginator import Paginator, ListSource
+from utils.checks import is_staff
+from utils.birthday_index import BirthdayIndex
+from utils.shared_store import open_store
+from utils.guild_config import guild_settings
+from utils.reloader import registry, file_watcher
+from config import BIRTHDAYS_PER_PAGE
+from datetime import datetime, timedelta
 from pathlib import Path
-import asyncio
 
 BIRTHDAY_PATH = Path("data/birthdays.json")
 
-def load_birthdays():
-    if not BIRTHDAY_PATH.exists():
-        return {}
-    with open(BIRTHDAY_PATH, "r") as f:
-        return json.load(f)
+# Kept in the registry so ,reload general picks up the same data instead of re-reading it
+birthdays = registry.get("general.birthdays", lambda: open_store(str(BIRTHDAY_PATH), "birthdays"))  # user ID -> "YYYY-MM-DD"
+birthday_index = registry.get("general.birthday_index", lambda: BirthdayIndex(birthdays))
+birthday_state = registry.get("general.birthday_state", lambda: open_store("data/birthday_state.json", "birthday_state"))  # guild ID -> last local date wished
 
-def save_birthdays(data):
-    with open(BIRTHDAY_PATH, "w") as f:
-        json.dump(data, f, indent=4)
+def reload_birthdays():
+    if not birthdays.reload_if_changed():
+        return False
+    birthday_index.reset(birthdays)
+    return True
 
-birthdays = load_birthdays()
+file_watcher.watch(birthdays.path, reload_birthdays, key="birthdays")
+file_watcher.watch(birthday_state.path, birthday_state.reload_if_changed, key="birthday_state")
 
 class General(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.birthday_reminder_loop.start()
 
+    def cog_unload(self):
+        self.birthday_reminder_loop.cancel()
+
     @commands.command(aliases=["av"])
     async def avatar(self, ctx, user: discord.Member = None):
         user = user or ctx.author
@@ -123,8 +136,8 @@ class General(commands.Cog):
             ))
 
         uid = str(ctx.author.id)
-        birthdays[uid] = date
-        save_birthdays(birthdays)
+        birthdays.set(uid, date)
+        birthday_index.set(uid, date)
 
         embed = discord.Embed(
             title="✅ Birthday Saved",
@@ -138,63 +151,99 @@ class General(commands.Cog):
     async def remove_birthday(self, ctx):
         uid = str(ctx.author.id)
         if uid in birthdays:
-            del birthdays[uid]
-            save_birthdays(birthdays)
+            birthdays.delete(uid)
+            birthday_index.remove(uid)
             embed = create_success_embed("Birthday Removed", "Your birthday has been removed.")
             await ctx.send(embed=embed)
             await log_command(ctx, "birthday remove", {})
         else:
             await ctx.send(embed=create_info_embed("Not Set", "You don’t have a birthday saved."))
 
-    @commands.command(name="birthdays")
-    async def list_birthdays(self, ctx):
-        if not birthdays:
-            return await ctx.send(embed=create_info_embed("🎉 Birthdays", "No birthdays are currently registered."))
+    @birthday.command(name="channel")
+    @is_staff()
+    async def birthday_channel(self, ctx, channel: discord.TextChannel = None):
+        channel = channel or ctx.channel
+        guild_settings.set(ctx.guild.id, "birthday_channel", channel.id)
 
-        sorted_data = sorted(birthdays.items(), key=lambda x: x[1])
-        desc = ""
-        for uid, date in sorted_data:
-            user = ctx.guild.get_member(int(uid))
-            name = user.mention if user else f"`{uid}`"
-            dt = datetime.strptime(date, "%Y-%m-%d").strftime("%d %B")
-            desc += f"🎂 {name} — {dt}\n"
+        embed = create_success_embed("Birthday Channel Set", f"Birthday reminders will be posted in {channel.mention}.")
+        await ctx.send(embed=embed)
+        await log_command(ctx, "birthday channel", {"channel": str(channel)})
 
-        embed = discord.Embed(
-            title="🎉 Registered Birthdays",
-            description=desc[:4000],
-            color=discord.Color.gold()
-        )
+    @birthday.command(name="timezone", aliases=["tz"])
+    @is_staff()
+    async def birthday_timezone(self, ctx, offset: float = None):
+        if offset is None or not -12 <= offset <= 14:
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Offset",
+                reason="Give the server's UTC offset in hours, between -12 and +14.",
+                usage=",birthday timezone <offset>",
+                example=",birthday timezone 5.5"
+            ))
+        guild_settings.set(ctx.guild.id, "birthday_tz_offset", offset)
+
+        embed = create_success_embed("Birthday Timezone Set", f"Birthdays will roll over at midnight UTC{offset:+g}.")
         await ctx.send(embed=embed)
-        await log_command(ctx, "birthdays", {})
+        await log_command(ctx, "birthday timezone", {"offset": offset})
+
+    @commands.command(name="birthdays")
+    async def list_birthdays(self, ctx, page: int = 1):
+        if not len(birthday_index):
+            return await ctx.send(embed=create_info_embed("🎉 Birthdays", "No birthdays are currently registered."))
 
-    @tasks.loop(hours=24)
+        # Pre-sorted view; only the page on screen is resolved (in one member request if uncached) and formatted
+        async def render(entries, offset, total):
+            members = await member_cache.resolve(ctx.guild, [int(uid) for uid, _ in entries])
+            desc = ""
+            for uid, date in entries:
+                user = members.get(int(uid))
+                name = user.mention if user else f"`{uid}`"
+                dt = datetime.strptime(date, "%Y-%m-%d").strftime("%d %B")
+                desc += f"🎂 {name} — {dt}\n"
+
+            embed = discord.Embed(
+                title="🎉 Registered Birthdays",
+                description=desc,
+                color=discord.Color.gold()
+            )
+            embed.set_footer(text=f"Total: {total}")
+            return embed
+
+        source = ListSource(birthday_index.sorted_entries(), BIRTHDAYS_PER_PAGE)
+        await Paginator(ctx.author, source, render).start(ctx, max(0, page - 1))
+        await log_command(ctx, "birthdays", {"page": page})
+
+    @tasks.loop(minutes=15)
     async def birthday_reminder_loop(self):
         await self.bot.wait_until_ready()
-        channel = self.bot.get_channel(1400809302423375942)
-        if not channel:
-            return
-
-        today = datetime.utcnow().strftime("%m-%d")
-        for uid, date in birthdays.items():
-            if datetime.strptime(date, "%Y-%m-%d").strftime("%m-%d") == today:
-                user = self.bot.get_user(int(uid))
-                if user:
-                    embed = discord.Embed(
-                        title="🎉 Happy Birthday!",
-                        description=f"Everyone wish {user.mention} a wonderful birthday! 🎂",
-                        color=discord.Color.gold()
-                    )
-                    embed.set_thumbnail(url=user.display_avatar.url)
-                    await channel.send(embed=embed)
-
-    @birthday_reminder_loop.before_loop
-    async def before_birthday_loop(self):
+
         now = datetime.utcnow()
-        next_run = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        if now >= next_run:
-            next_run = next_run.replace(day=now.day + 1)
-        wait_seconds = (next_run - now).total_seconds()
-        await asyncio.sleep(wait_seconds)
+        for guild in self.bot.guilds:
+            settings = guild_settings.for_guild(guild.id)
+            channel = guild.get_channel(settings["birthday_channel"] or 0)
+            if not channel:
+                continue
+
+            local_day = (now + timedelta(hours=settings["birthday_tz_offset"] or 0)).date()
+            if birthday_state.get(str(guild.id)) == local_day.isoformat():
+                continue
+
+            # Mark first so a crash mid-send never double-wishes after a restart
+            birthday_state.set(str(guild.id), local_day.isoformat())
+
+            members = list((await member_cache.resolve(guild, list(map(int, birthday_index.on_day(local_day))))).values())
+
+            async def send_wish(user, channel=channel):
+                embed = discord.Embed(
+                    title="🎉 Happy Birthday!",
+                    description=f"Everyone wish {user.mention} a wonderful birthday! 🎂",
+                    color=discord.Color.gold()
+                )
+                embed.set_thumbnail(url=user.display_avatar.url)
+                await channel.send(embed=embed)
+
+            result = await run_bulk(members, send_wish, route_key=lambda user: channel.id)
+            if result.failed:
+                logging.warning(f"⚠️ Birthday reminders for {guild.name}: {result.summary()}")
 
 async def setup(bot):
-    await bot.add_cog(General(bot))
\ No newline at end of file
+    await bot.add_cog(General(bot))
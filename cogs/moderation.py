@@ -1,15 +1,74 @@
 import discord
 from discord.ext import commands
+import re
+import time
+from datetime import timedelta
 from utils.checks import is_staff
-from utils.embeds import create_error_embed, create_success_embed, create_info_embed
+from utils.embeds import create_error_embed, create_success_embed, create_info_embed, add_tip
 from utils.logger import log_command
-from utils.data_handler import load_warnings, save_warnings
+from utils.data_handler_warnings import add_warning, warnings_for, guild_warnings
+from utils.data_handler_notes import add_note, clear_notes, notes_for, guild_notes
+from utils.case_store import case_store, ACTIONS
+from utils.bulk import run_bulk
+from utils.ban_index import ban_index
+from utils.guild_config import guild_settings, home_guild_id
+from utils.dm import dm_dispatcher
+from utils.members import member_cache
+from utils.jail_snapshots import jail_snapshots
+from utils.paginator import Paginator, ListSource, IteratorSource, QuerySource
+from config import DM_BEFORE_REMOVAL_TIMEOUT, LIST_PAGE_SIZE, MASS_ACTION_LIMIT
+from utils.purge import purge, parse_filters, PurgeFilter
+
+def parse_duration(time_str):
+    match = re.match(r"(\d+)([smhd])", time_str)
+    if not match:
+        return None
+    time_value, unit = int(match.group(1)), match.group(2)
+    return {
+        "s": time_value,
+        "m": time_value * 60,
+        "h": time_value * 3600,
+        "d": time_value * 86400
+    }.get(unit, None)
+
+TARGET_PATTERN = re.compile(r"<@!?(\d{15,20})>|(\d{15,20})|<@&(\d{15,20})>|role:(\d{15,20})|joined:(\d+[smhd])")
+
+def parse_targets(text):
+    # Leading member mentions/IDs, role mentions (or role:<id>) and joined:<duration> pick
+    # the members of a mass action; whatever follows them is the reason
+    user_ids, role_ids, joined = [], [], None
+    words = (text or "").split()
+    for index, word in enumerate(words):
+        match = TARGET_PATTERN.fullmatch(word)
+        if not match:
+            return user_ids, role_ids, joined, " ".join(words[index:])
+        mention, raw_id, role_mention, role_id, since = match.groups()
+        if mention or raw_id:
+            user_ids.append(int(mention or raw_id))
+        elif role_mention or role_id:
+            role_ids.append(int(role_mention or role_id))
+        else:
+            joined = max(joined or 0, parse_duration(since))
+    return user_ids, role_ids, joined, ""
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-        @commands.command(name="warn", aliases=["w"])
+        bot.scheduler.register("unban", self.expire_tempban)
+        bot.scheduler.register("unjail", self.expire_jail)
+        bot.scheduler.register("unlock", self.expire_lockdown)
+        bot.scheduler.register("unslow", self.expire_slowmode)
+
+    async def record_case(self, ctx, member, action, reason, **extra):
+        # Only recorded when the SQLite case store is enabled (CASE_DB_PATH)
+        if not case_store:
+            return None
+        return await case_store.add_case(
+            ctx.guild.id, member.id, ctx.author.id, str(ctx.author), action, reason, extra=extra or None
+        )
+
+    @commands.command(name="warn", aliases=["w"])
     @is_staff()
     async def warn_user(self, ctx, member: discord.Member = None, *, reason: str = "No reason provided."):
         if not member:
@@ -21,47 +80,30 @@ class Moderation(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        # DM the user
-        try:
-            await member.send(
-                f"⚠️ You have been warned in **{ctx.guild.name}** by {ctx.author}.\nReason: **{reason}**"
-            )
-        except:
-            pass  # DMs closed
-
-        # Store warning in JSON
-        user_id = str(member.id)
-        if user_id not in self.warnings_data:
-            self.warnings_data[user_id] = []
+        # DM the user in the background; the status lands on the case
+        dm = dm_dispatcher.send(
+            self.bot, member, f"⚠️ You have been warned in **{ctx.guild.name}** by {ctx.author}.\nReason: **{reason}**"
+        )
 
-        self.warnings_data[user_id].append({
+        # Store warning (one journal entry, not a full rewrite)
+        add_warning(ctx.guild.id, member.id, {
             "moderator": str(ctx.author),
-            "reason": reason
+            "reason": reason,
+            "timestamp": int(time.time())
         })
-        save_warnings(self.warnings_data)
+        dm.attach_case(await self.record_case(ctx, member, "warn", reason))
 
         # Confirmation to the moderator
         embed = create_success_embed(
             title="User Warned",
             message=f"{member.mention} has been warned for: **{reason}**"
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        # Friendly syntax reminder
-        if ctx.invoked_with == "warn":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="You can use `,w` instead of `,warn` to save time!"
-            )
-            await ctx.send(embed=tip)
-
         # Log command
         await log_command(ctx)
 
-
-async def setup(bot):
-    await bot.add_cog(Moderation(bot))
-
     @commands.command(name="ban", aliases=["b"])
     @is_staff()
     async def ban_user(self, ctx, member: discord.Member = None, *, reason: str = "No reason provided."):
@@ -74,10 +116,9 @@ async def setup(bot):
             )
             return await ctx.send(embed=embed)
 
-        try:
-            await member.send(f"🔨 You have been banned from **{ctx.guild.name}**.\nReason: **{reason}**")
-        except:
-            pass  # DMs off
+        # The DM has to go out while they still share a server with the bot, so wait briefly for it
+        dm = dm_dispatcher.send(self.bot, member, f"🔨 You have been banned from **{ctx.guild.name}**.\nReason: **{reason}**")
+        await dm.wait(DM_BEFORE_REMOVAL_TIMEOUT)
 
         try:
             await member.ban(reason=f"{reason} | Banned by {ctx.author}")
@@ -90,35 +131,17 @@ async def setup(bot):
             )
             return await ctx.send(embed=embed)
 
+        dm.attach_case(await self.record_case(ctx, member, "ban", reason))
+
         embed = create_success_embed(
             title="User Banned",
             message=f"{member.mention} has been banned for: **{reason}**"
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "ban":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="Next time you can use `,b` instead of `,ban` to save time!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
-import re
-
-def parse_duration(time_str):
-    match = re.match(r"(\d+)([smhd])", time_str)
-    if not match:
-        return None
-    time_value, unit = int(match.group(1)), match.group(2)
-    return {
-        "s": time_value,
-        "m": time_value * 60,
-        "h": time_value * 3600,
-        "d": time_value * 86400
-    }.get(unit, None)
-
     @commands.command(name="tempban", aliases=["tb"])
     @is_staff()
     async def tempban_user(self, ctx, member: discord.Member = None, time: str = None, *, reason: str = "No reason provided."):
@@ -141,10 +164,10 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
-        try:
-            await member.send(f"⛔ You have been temporarily banned from **{ctx.guild.name}** for {time}.\nReason: **{reason}**")
-        except:
-            pass
+        dm = dm_dispatcher.send(
+            self.bot, member, f"⛔ You have been temporarily banned from **{ctx.guild.name}** for {time}.\nReason: **{reason}**"
+        )
+        await dm.wait(DM_BEFORE_REMOVAL_TIMEOUT)
 
         try:
             await member.ban(reason=f"Tempbanned by {ctx.author} for {time} | {reason}")
@@ -157,31 +180,19 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
+        dm.attach_case(await self.record_case(ctx, member, "tempban", reason, duration=duration_seconds))
+
         embed = create_success_embed(
             title="User Tempbanned",
             message=f"{member.mention} has been banned for **{time}**.\nReason: **{reason}**"
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "tempban":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="Use `,tb` instead of `,tempban` next time!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
-        # Schedule unban
-        async def unban_later():
-            await asyncio.sleep(duration_seconds)
-            try:
-                await ctx.guild.unban(member, reason="Tempban expired")
-                await ctx.channel.send(f"🔓 {member} has been unbanned after tempban.")
-            except:
-                pass
-
-        self.bot.loop.create_task(unban_later())
+        # Schedule unban (persisted, survives restarts)
+        self.bot.scheduler.schedule("unban", duration_seconds, ctx.guild.id, member.id, ctx.channel.id, name=str(member))
 
     @commands.command(name="kick", aliases=["k"])
     @is_staff()
@@ -195,10 +206,8 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
-        try:
-            await member.send(f"👢 You have been kicked from **{ctx.guild.name}**.\nReason: **{reason}**")
-        except:
-            pass  # DMs closed
+        dm = dm_dispatcher.send(self.bot, member, f"👢 You have been kicked from **{ctx.guild.name}**.\nReason: **{reason}**")
+        await dm.wait(DM_BEFORE_REMOVAL_TIMEOUT)
 
         try:
             await member.kick(reason=f"Kicked by {ctx.author} | {reason}")
@@ -211,26 +220,21 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
+        dm.attach_case(await self.record_case(ctx, member, "kick", reason))
+
         embed = create_success_embed(
             title="User Kicked",
             message=f"{member.mention} has been kicked for: **{reason}**"
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "kick":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="You can use `,k` instead of `,kick` next time!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
     @commands.command(name="jail", aliases=["j"])
     @is_staff()
     async def jail_user(self, ctx, member: discord.Member = None, time: str = None, *, reason: str = "No reason provided."):
-        JAIL_ROLE_ID = 1401353254083760160
-        jail_role = ctx.guild.get_role(JAIL_ROLE_ID)
+        jail_role = ctx.guild.get_role(guild_settings.get(ctx.guild.id, "jail_role") or 0)
 
         if not member or not time:
             embed = create_error_embed(
@@ -254,15 +258,10 @@ def parse_duration(time_str):
         if not jail_role:
             return await ctx.send("⚠️ Jail role not found in the server.")
 
-        # Store original roles (except @everyone)
-        original_roles = [r for r in member.roles if r != ctx.guild.default_role]
-        try:
-            await member.send(f"🚨 You have been jailed in **{ctx.guild.name}** for {time}.\nReason: **{reason}**")
-        except:
-            pass
+        dm = dm_dispatcher.send(self.bot, member, f"🚨 You have been jailed in **{ctx.guild.name}** for {time}.\nReason: **{reason}**")
 
         try:
-            await member.edit(roles=[jail_role], reason=f"Jailed by {ctx.author} | {reason}")
+            await self.jail_member(member, jail_role, f"Jailed by {ctx.author} | {reason}")
         except discord.Forbidden:
             embed = create_error_embed(
                 title="Jail Failed",
@@ -272,124 +271,211 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
+        dm.attach_case(await self.record_case(ctx, member, "jail", reason, duration=duration_seconds))
+
         embed = create_success_embed(
             title="User Jailed",
             message=f"{member.mention} has been jailed for **{time}**.\nReason: **{reason}**"
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "jail":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="You can use `,j` instead of `,jail` to save time!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
-        # Schedule unjail
-        async def unjail_later():
-            await asyncio.sleep(duration_seconds)
-            try:
-                await member.edit(roles=original_roles, reason="Jail expired")
-                await ctx.channel.send(f"🔓 {member.mention} has been unjailed after {time}.")
-            except:
-                pass
-
-        self.bot.loop.create_task(unjail_later())
-        
-            @commands.command(name="warnings", aliases=["warns"])
+        # Schedule unjail (the roles to give back are in the jail snapshot); a re-jail replaces the old timer
+        self.bot.scheduler.cancel_for("unjail", ctx.guild.id, member.id)
+        self.bot.scheduler.schedule("unjail", duration_seconds, ctx.guild.id, member.id, ctx.channel.id, duration=time)
+
+    async def jail_member(self, member, jail_role, reason):
+        # Snapshots the member's roles (except @everyone), then swaps them for the jail role in one edit.
+        # Someone already jailed keeps their first snapshot, or unjailing would only hand back the jail role.
+        guild = member.guild
+        fresh = not (member.get_role(jail_role.id) and (guild.id, member.id) in jail_snapshots)
+        if fresh:
+            jail_snapshots.save(guild.id, member.id, [role.id for role in member.roles if role != guild.default_role])
+        try:
+            await member.edit(roles=[jail_role], reason=reason)
+        except Exception:
+            if fresh:
+                jail_snapshots.discard(guild.id, member.id)
+            raise
+
+    async def release_member(self, member, reason, fallback=None):
+        # Gives back the snapshotted roles in one edit, minus the jail role and plus anything they were
+        # given while jailed; fallback is the role ID list older unjail timers carried themselves
+        guild = member.guild
+        jail_role_id = guild_settings.get(guild.id, "jail_role")
+        role_ids = jail_snapshots.get(guild.id, member.id)
+        if role_ids is None:
+            role_ids = fallback or []
+        roles = {role for role in member.roles if role != guild.default_role and role.id != jail_role_id}
+        roles.update(role for role in map(guild.get_role, role_ids) if role and role.id != jail_role_id)
+        await member.edit(roles=list(roles), reason=reason)
+        jail_snapshots.discard(guild.id, member.id)
+
+    def jail_candidates(self, guild, jail_role):
+        # IDs of cached holders of the role plus everyone with a snapshot or a pending unjail; the lean
+        # member cache doesn't hold every member, so the rest still have to be looked up and checked
+        holders = {member.id for member in jail_role.members}
+        candidates = set(holders)
+        candidates.update(jail_snapshots.members(guild.id))
+        candidates.update(record["target_id"] for _, record in self.bot.scheduler.pending("unjail", guild.id))
+        return sorted(candidates, key=lambda user_id: (user_id not in holders, user_id))  # Known holders first
+
+    async def jailed_members(self, guild, jail_role, candidates=None):
+        # The candidates (all of them by default) still in the server and still holding the role
+        if candidates is None:
+            candidates = self.jail_candidates(guild, jail_role)
+        members = await member_cache.resolve(guild, candidates)
+        return [members[user_id] for user_id in candidates if user_id in members and members[user_id].get_role(jail_role.id)]
+
+    @commands.command(name="warnings", aliases=["warns"])
     @is_staff()
-    async def check_warnings(self, ctx, member: discord.Member = None):
+    async def check_warnings(self, ctx, member: discord.Member = None, since: str = None):
         if not member:
             embed = create_error_embed(
                 title="Missing Argument",
                 reason="You must mention a user to check warnings.",
-                usage=",warnings @user",
-                example=",warnings @Spammer"
+                usage=",warnings @user [since]",
+                example=",warnings @Spammer 7d"
             )
             return await ctx.send(embed=embed)
 
-        user_id = str(member.id)
-        warnings = self.warnings_data.get(user_id, [])
-
-        if not warnings:
+        cutoff = None
+        if since:
+            seconds = parse_duration(since)
+            if not seconds:
+                embed = create_error_embed(
+                    title="Invalid Time Format",
+                    reason="Use formats like `12h`, `7d` or `30d`.",
+                    usage=",warnings @user [since]",
+                    example=",warnings @Spammer 7d"
+                )
+                return await ctx.send(embed=embed)
+            cutoff = time.time() - seconds
+
+        async def render(warnings, offset, total):
+            description = ""
+            for i, warn in enumerate(warnings, offset + 1):
+                mod = warn["moderator"]
+                reason = warn["reason"]
+                description += f"**{i}.** Warned by `{mod}`\n➡️ Reason: {reason}\n\n"
+
+            embed = discord.Embed(
+                title=f"📋 Warnings for {member}",
+                description=description,
+                color=discord.Color.orange()
+            )
+            embed.set_footer(text=f"Total Warnings: {total if total is not None else '?'}" + (f" | Since: {since}" if since else ""))
+            return embed
+
+        source = self.case_source(ctx.guild.id, member.id, ["warn"], cutoff)
+        if not await Paginator(ctx.author, source, render).start(ctx):
             embed = create_info_embed(
                 title="No Warnings",
                 message=f"{member.mention} has no warnings on record."
             )
             return await ctx.send(embed=embed)
 
-        description = ""
-        for i, warn in enumerate(warnings, 1):
-            mod = warn["moderator"]
-            reason = warn["reason"]
-            description += f"**{i}.** Warned by `{mod}`\n➡️ Reason: {reason}\n\n"
-
-        embed = discord.Embed(
-            title=f"📋 Warnings for {member}",
-            description=description,
-            color=discord.Color.orange()
-        )
-        embed.set_footer(text=f"Total Warnings: {len(warnings)}")
-        await ctx.send(embed=embed)
-
         await log_command(ctx)
 
     @commands.command(name="history", aliases=["h"])
     @is_staff()
-    async def command_history(self, ctx, member: discord.Member = None, command_type: str = None):
+    async def command_history(self, ctx, member: discord.Member = None, command_type: str = None, since: str = None):
         if not member or not command_type:
             embed = create_error_embed(
                 title="Missing Arguments",
                 reason="You must mention a user and specify a command type.",
-                usage=",history @user warn",
-                example=",history @Spammer warn"
+                usage=",history @user <type> [since]",
+                example=",history @Spammer warn 30d"
             )
             return await ctx.send(embed=embed)
 
         command_type = command_type.lower()
+        if command_type in ["warns", "warning", "warnings"]:
+            command_type = "warn"
 
-        if command_type not in ["warn", "warns", "warning", "warnings"]:
+        # Without the case store only warnings are on record
+        supported = list(ACTIONS) + ["all"] if case_store else ["warn"]
+        if command_type not in supported:
             embed = create_error_embed(
                 title="Invalid Command Type",
-                reason="Only `warn` history is currently supported.",
-                usage=",history @user warn",
+                reason=f"Supported types: {', '.join(f'`{t}`' for t in supported)}.",
+                usage=",history @user <type> [since]",
                 example=",history @Spammer warn"
             )
             return await ctx.send(embed=embed)
 
-        user_id = str(member.id)
-        warnings = self.warnings_data.get(user_id, [])
-
-        if not warnings:
+        cutoff = None
+        if since:
+            seconds = parse_duration(since)
+            if not seconds:
+                embed = create_error_embed(
+                    title="Invalid Time Format",
+                    reason="Use formats like `12h`, `7d` or `30d`.",
+                    usage=",history @user <type> [since]",
+                    example=",history @Spammer ban 30d"
+                )
+                return await ctx.send(embed=embed)
+            cutoff = time.time() - seconds
+
+        actions = None if command_type == "all" else [command_type]
+
+        async def render(cases, offset, total):
+            description = ""
+            for i, case in enumerate(cases, offset + 1):
+                when = f" <t:{int(case['created_at'])}:d>" if case.get("created_at") else ""
+                dm = f" | 📨 DM {case['dm_status']}" if case.get("dm_status") else ""
+                description += f"**{i}.** `{case['action']}` by `{case['moderator']}`{when}{dm}\n➡️ Reason: {case['reason']}\n\n"
+
+            embed = discord.Embed(
+                title=f"📚 History for {member}",
+                description=description,
+                color=discord.Color.gold()
+            )
+            embed.set_footer(text=f"Command history: {command_type} | Total: {total if total is not None else '?'}")
+            return embed
+
+        source = self.case_source(ctx.guild.id, member.id, actions, cutoff)
+        if not await Paginator(ctx.author, source, render).start(ctx):
             embed = create_info_embed(
-                title="No Warnings Found",
-                message=f"{member.mention} has no warning history."
+                title="No History Found",
+                message=f"{member.mention} has no `{command_type}` history."
             )
             return await ctx.send(embed=embed)
 
-        description = ""
-        for i, warn in enumerate(warnings, 1):
-            mod = warn["moderator"]
-            reason = warn["reason"]
-            description += f"**{i}.** Warned by `{mod}`\n➡️ Reason: {reason}\n\n"
-
-        embed = discord.Embed(
-            title=f"📚 Warning History for {member}",
-            description=description,
-            color=discord.Color.gold()
-        )
-        embed.set_footer(text=f"Command history: warn | Total: {len(warnings)}")
-        await ctx.send(embed=embed)
-
         await log_command(ctx)
 
+    def is_home(self, guild_id):
+        # Warnings and notes from before servers were told apart belong to the home server only
+        return guild_id == home_guild_id(self.bot)
+
+    def case_source(self, guild_id, user_id, actions, since):
+        # Page source for the case lists: one LIMIT/OFFSET query per page from the case store
+        if case_store:
+            return QuerySource(
+                lambda offset, limit: case_store.cases_for_user(guild_id, user_id, actions, since, limit, offset),
+                lambda: case_store.count_cases(guild_id, user_id, actions, since),
+                LIST_PAGE_SIZE
+            )
+
+        # JSON fallback: warnings only, and only entries that carry a timestamp can be date-filtered
+        def cases():
+            for warn in warnings_for(guild_id, user_id, legacy=self.is_home(guild_id)):
+                if since and warn.get("timestamp", 0) < since:
+                    continue
+                yield {
+                    "action": "warn",
+                    "moderator": warn["moderator"],
+                    "reason": warn["reason"],
+                    "created_at": warn.get("timestamp")
+                }
+        return IteratorSource(cases(), LIST_PAGE_SIZE)
+
     @commands.command(name="stripstaff", aliases=["ss"])
     @is_staff()
     async def strip_staff_role(self, ctx, member: discord.Member = None):
-        STAFF_ROLE_ID = 1400967381869658182
-        staff_role = ctx.guild.get_role(STAFF_ROLE_ID)
+        staff_role = ctx.guild.get_role(guild_settings.get(ctx.guild.id, "staff_role") or 0)
 
         if not member:
             embed = create_error_embed(
@@ -422,15 +508,9 @@ def parse_duration(time_str):
             title="Staff Role Removed",
             message=f"{member.mention} has been stripped of the Staff role."
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "stripstaff":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="Next time, you can use `,ss` instead of `,stripstaff`!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
     @commands.command(name="lockdown", aliases=["ld"])
@@ -455,11 +535,8 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
-        overwrite = ctx.channel.overwrites_for(ctx.guild.default_role)
-        overwrite.send_messages = False
-
         try:
-            await ctx.channel.set_permissions(ctx.guild.default_role, overwrite=overwrite, reason=reason)
+            await self.lock_channel(ctx.channel, seconds, reason)
         except discord.Forbidden:
             embed = create_error_embed(
                 title="Permission Error",
@@ -473,28 +550,106 @@ def parse_duration(time_str):
             title="🔒 Channel Locked",
             message=f"{ctx.channel.mention} has been locked for **{duration}**.\nReason: **{reason}**"
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "lockdown":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="Use `,ld` instead of `,lockdown` next time!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
-        # Schedule unlock
-        async def unlock_channel_later():
-            await asyncio.sleep(seconds)
-            overwrite.send_messages = None  # Reset to default
-            try:
-                await ctx.channel.set_permissions(ctx.guild.default_role, overwrite=overwrite, reason="Lockdown expired")
-                await ctx.send(f"🔓 {ctx.channel.mention} has been automatically unlocked.")
-            except:
-                pass
+    async def lock_channel(self, channel, seconds, reason):
+        # Shared by ,lockdown and the anti-raid responder; the unlock survives restarts
+        overwrite = channel.overwrites_for(channel.guild.default_role)
+        overwrite.send_messages = False
+        await channel.set_permissions(channel.guild.default_role, overwrite=overwrite, reason=reason)
+
+        self.bot.scheduler.cancel_for("unlock", channel.guild.id, channel.id)
+        self.bot.scheduler.schedule("unlock", seconds, channel.guild.id, channel.id, channel.id)
+
+    async def apply_slowmode(self, channel, delay, seconds=None, reason=None):
+        # With seconds, the previous delay is restored once they pass
+        previous = channel.slowmode_delay
+        for _, timer in self.bot.scheduler.pending("unslow", channel.guild.id):
+            if timer["target_id"] == channel.id:
+                previous = timer["data"]["previous"]  # Keep the delay from before the first extension
+        await channel.edit(slowmode_delay=delay, reason=reason)
+
+        self.bot.scheduler.cancel_for("unslow", channel.guild.id, channel.id)
+        if seconds:
+            self.bot.scheduler.schedule("unslow", seconds, channel.guild.id, channel.id, channel.id, previous=previous)
+
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild, user):
+        ban_index.on_ban(guild.id, user)
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        ban_index.on_unban(guild.id, user.id)
+
+    async def expire_tempban(self, timer):
+        guild = self.bot.get_guild(timer["guild_id"])
+        if not guild:
+            return
+        try:
+            await guild.unban(discord.Object(id=timer["target_id"]), reason="Tempban expired")
+        except discord.NotFound:
+            return  # Already unbanned by hand
+        channel = guild.get_channel(timer["channel_id"])
+        if channel:
+            await channel.send(f"🔓 {timer['data'].get('name', timer['target_id'])} has been unbanned after tempban.")
+
+    async def expire_jail(self, timer):
+        guild = self.bot.get_guild(timer["guild_id"])
+        if not guild:
+            return
+        member = await member_cache.get(guild, timer["target_id"])
+        if not member:
+            jail_snapshots.discard(guild.id, timer["target_id"])  # Left the server; rejoining starts them over anyway
+            return
+        await self.release_member(member, "Jail expired", fallback=timer["data"].get("roles"))
+        channel = guild.get_channel(timer["channel_id"])
+        if channel:
+            await channel.send(f"🔓 {member.mention} has been unjailed after {timer['data']['duration']}.")
+
+    async def expire_lockdown(self, timer):
+        guild = self.bot.get_guild(timer["guild_id"])
+        channel = guild.get_channel(timer["channel_id"]) if guild else None
+        if not channel:
+            return
+        overwrite = channel.overwrites_for(guild.default_role)
+        overwrite.send_messages = None  # Reset to default
+        await channel.set_permissions(guild.default_role, overwrite=overwrite, reason="Lockdown expired")
+        await channel.send(f"🔓 {channel.mention} has been automatically unlocked.")
+
+    async def expire_slowmode(self, timer):
+        guild = self.bot.get_guild(timer["guild_id"])
+        channel = guild.get_channel(timer["channel_id"]) if guild else None
+        if not channel:
+            return
+        await channel.edit(slowmode_delay=timer["data"].get("previous", 0), reason="Slowmode expired")
+
+    @commands.command(name="timers")
+    @is_staff()
+    async def view_timers(self, ctx, kind: str = None):
+        timers = self.bot.scheduler.pending(kind.lower() if kind else None, ctx.guild.id)
+        if not timers:
+            embed = create_info_embed(
+                title="No Pending Timers",
+                message="There are no pending unbans, unjails or unlocks in this server."
+            )
+            return await ctx.send(embed=embed)
 
-        self.bot.loop.create_task(unlock_channel_later())
+        description = ""
+        for timer_id, timer in timers[:20]:
+            target = f"<#{timer['target_id']}>" if timer["kind"] in ("unlock", "unslow") else f"<@{timer['target_id']}>"
+            description += f"`#{timer_id}` **{timer['kind']}** {target} <t:{int(timer['due'])}:R>\n"
+
+        embed = discord.Embed(
+            title="⏰ Pending Timers",
+            description=description,
+            color=discord.Color.blurple()
+        )
+        embed.set_footer(text=f"Total: {len(timers)} pending")
+        await ctx.send(embed=embed)
+        await log_command(ctx)
 
     @commands.command(name="unlock", aliases=["ul"])
     @is_staff()
@@ -520,49 +675,93 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
+        self.bot.scheduler.cancel_for("unlock", ctx.guild.id, ctx.channel.id)
+
         embed = create_success_embed(
             title="🔓 Channel Unlocked",
             message=f"{ctx.channel.mention} has been manually unlocked by {ctx.author.mention}."
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "unlock":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="You can use `,ul` instead of `,unlock` next time!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
     @commands.command(name="modstats", aliases=["ms"])
     @is_staff()
-    async def mod_stats(self, ctx):
-        mod_name = str(ctx.author)
-        warnings_issued = 0
-
-        for warns in self.warnings_data.values():
-            for warn in warns:
-                if warn["moderator"] == mod_name:
-                    warnings_issued += 1
+    async def mod_stats(self, ctx, since: str = None):
+        cutoff = None
+        if since:
+            seconds = parse_duration(since)
+            if not seconds:
+                embed = create_error_embed(
+                    title="Invalid Time Format",
+                    reason="Use formats like `12h`, `7d` or `30d`.",
+                    usage=",modstats [since]",
+                    example=",modstats 30d"
+                )
+                return await ctx.send(embed=embed)
+            cutoff = time.time() - seconds
+
+        if case_store:
+            stats = await case_store.moderator_stats(ctx.guild.id, ctx.author.id, cutoff)
+        else:
+            mod_name = str(ctx.author)
+            warnings_issued = 0
+            for warns in guild_warnings(ctx.guild.id, legacy=self.is_home(ctx.guild.id)).values():
+                for warn in warns:
+                    if warn["moderator"] == mod_name and (not cutoff or warn.get("timestamp", 0) >= cutoff):
+                        warnings_issued += 1
+            stats = {"warn": warnings_issued}
 
         embed = discord.Embed(
             title=f"📈 Mod Stats: {ctx.author.display_name}",
             description="Here’s your current moderation activity:",
             color=discord.Color.purple()
         )
-        embed.add_field(name="⚠️ Warnings Issued", value=warnings_issued, inline=False)
-        embed.set_footer(text="Stats tracked since bot was last deployed.")
+        embed.add_field(name="⚠️ Warnings Issued", value=stats.get("warn", 0), inline=False)
+        for action, total in sorted(stats.items()):
+            if action != "warn":
+                embed.add_field(name=f"🔨 {action.capitalize()}", value=total, inline=True)
+        embed.set_footer(text=f"Since: {since}" if since else "Stats tracked since bot was last deployed.")
 
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "modstats":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="You can use `,ms` instead of `,modstats` to save time!"
-            )
-            await ctx.send(embed=tip)
+        await log_command(ctx)
+
+    @commands.command(name="importcases")
+    @is_staff()
+    async def import_cases(self, ctx):
+        if not case_store:
+            return await ctx.send(embed=create_info_embed(
+                title="Case Store Disabled",
+                message="Set `CASE_DB_PATH` to enable the SQLite case store before importing."
+            ))
+        if ctx.guild.id != home_guild_id(self.bot):
+            # The JSON files are keyed by user only and were written for the original server
+            return await ctx.send(embed=create_info_embed(
+                title="Nothing To Import",
+                message="The JSON warnings and notes belong to the bot's home server and can only be imported there."
+            ))
 
+        def resolve_moderator(name):
+            mod = ctx.guild.get_member_named(name)
+            return mod.id if mod else 0
+
+        imported = await case_store.import_json(
+            ctx.guild.id, guild_warnings(ctx.guild.id, legacy=True), guild_notes(ctx.guild.id, legacy=True), resolve_moderator
+        )
+        if imported is None:
+            return await ctx.send(embed=create_info_embed(
+                title="Already Imported",
+                message="The JSON warnings and notes were already imported."
+            ))
+
+        embed = create_success_embed(
+            title="📥 Cases Imported",
+            message=f"Imported **{imported}** warnings and notes into the case store."
+        )
+        await ctx.send(embed=embed)
         await log_command(ctx)
 
     @commands.command(name="remind", aliases=["rm"])
@@ -596,22 +795,15 @@ def parse_duration(time_str):
             title="Reminder Sent",
             message=f"{member.mention} has been sent a soft reminder.\nReason: **{reason}**"
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "remind":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="Next time you can use `,rm` instead of `,remind`!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
     @commands.command(name="unjail", aliases=["uj"])
     @is_staff()
     async def unjail_user(self, ctx, member: discord.Member = None):
-        JAIL_ROLE_ID = 1401353254083760160
-        jail_role = ctx.guild.get_role(JAIL_ROLE_ID)
+        jail_role = ctx.guild.get_role(guild_settings.get(ctx.guild.id, "jail_role") or 0)
 
         if not member:
             embed = create_error_embed(
@@ -630,7 +822,7 @@ def parse_duration(time_str):
             return await ctx.send(embed=embed)
 
         try:
-            await member.remove_roles(jail_role, reason=f"Unjailed by {ctx.author}")
+            await self.release_member(member, f"Unjailed by {ctx.author}")
         except discord.Forbidden:
             embed = create_error_embed(
                 title="Permission Error",
@@ -640,19 +832,15 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
+        self.bot.scheduler.cancel_for("unjail", ctx.guild.id, member.id)
+
         embed = create_success_embed(
             title="🔓 User Unjailed",
-            message=f"{member.mention} has been manually unjailed."
+            message=f"{member.mention} has been manually unjailed and their roles restored."
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "unjail":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="Next time you can use `,uj` instead of `,unjail`!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
     @commands.command(name="unmute", aliases=["um"])
@@ -675,7 +863,7 @@ def parse_duration(time_str):
             return await ctx.send(embed=embed)
 
         try:
-            await member.edit(timeout=None, reason=f"Unmuted by {ctx.author}")
+            await member.edit(timed_out_until=None, reason=f"Unmuted by {ctx.author}")
         except discord.Forbidden:
             embed = create_error_embed(
                 title="Permission Error",
@@ -689,15 +877,9 @@ def parse_duration(time_str):
             title="🔊 User Unmuted",
             message=f"{member.mention} has been unmuted."
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "unmute":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="Use `,um` instead of `,unmute` next time!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
 
@@ -713,22 +895,33 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
-        bans = await ctx.guild.bans()
-        target = None
-        for ban in bans:
-            if str(ban.user.id) == user or str(ban.user) == user:
-                target = ban.user
-                break
+        user = user.strip().strip("<@!>")
+        found = ban_index.find(ctx.guild.id, user)
+        if not found and not user.isdigit():
+            # Tags need the index; it is filled once per guild and then kept current from ban events
+            await ban_index.ensure_loaded(ctx.guild)
+            found = ban_index.find(ctx.guild.id, user)
+
+        if found:
+            user_id, tag = found
+        elif user.isdigit():
+            user_id, tag = int(user), user  # Unban by ID directly; Discord tells us if there is no such ban
+        else:
+            user_id = None
 
-        if not target:
-            embed = create_info_embed(
-                title="User Not Found",
-                message="That user isn’t currently banned."
-            )
-            return await ctx.send(embed=embed)
+        not_found = create_info_embed(
+            title="User Not Found",
+            message="That user isn’t currently banned."
+        )
+        if user_id is None:
+            return await ctx.send(embed=not_found)
 
+        target = discord.Object(id=user_id)
         try:
             await ctx.guild.unban(target, reason=f"Unbanned by {ctx.author}")
+        except discord.NotFound:
+            ban_index.on_unban(ctx.guild.id, user_id)
+            return await ctx.send(embed=not_found)
         except discord.Forbidden:
             embed = create_error_embed(
                 title="Permission Error",
@@ -738,9 +931,11 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
+        self.bot.scheduler.cancel_for("unban", ctx.guild.id, target.id)
+
         embed = create_success_embed(
             title="🔓 User Unbanned",
-            message=f"{target} has been unbanned."
+            message=f"{tag} has been unbanned."
         )
         await ctx.send(embed=embed)
 
@@ -769,8 +964,7 @@ def parse_duration(time_str):
             return await ctx.send(embed=embed)
 
         try:
-            until = discord.utils.utcnow() + discord.timedelta(seconds=seconds)
-            await member.edit(timeout=until, reason=f"Muted by {ctx.author} | {reason}")
+            await self.timeout_member(member, seconds, f"Muted by {ctx.author} | {reason}")
         except discord.Forbidden:
             embed = create_error_embed(
                 title="Permission Error",
@@ -780,21 +974,22 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
+        await self.record_case(ctx, member, "mute", reason, duration=seconds)
+
         embed = create_success_embed(
             title="🔇 User Muted",
             message=f"{member.mention} has been muted for **{time}**.\nReason: **{reason}**"
         )
+        add_tip(embed, ctx)
         await ctx.send(embed=embed)
 
-        if ctx.invoked_with == "mute":
-            tip = create_info_embed(
-                title="💡 Quick Tip",
-                message="Use `,m` instead of `,mute` next time!"
-            )
-            await ctx.send(embed=tip)
-
         await log_command(ctx)
 
+    async def timeout_member(self, member, seconds, reason):
+        # Shared by ,mute and the spam detector
+        until = discord.utils.utcnow() + timedelta(seconds=seconds)
+        await member.edit(timed_out_until=until, reason=reason)
+
     @commands.command(name="notes")
     @is_staff()
     async def view_notes(self, ctx, member: discord.Member = None):
@@ -807,28 +1002,28 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
-        user_id = str(member.id)
-        notes = self.notes_data.get(user_id, [])
+        notes = notes_for(ctx.guild.id, member.id, legacy=self.is_home(ctx.guild.id))
 
-        if not notes:
+        async def render(notes, offset, total):
+            embed = discord.Embed(
+                title=f"🗒️ Notes for {member}",
+                color=discord.Color.dark_teal()
+            )
+            for i, note in enumerate(notes, offset + 1):
+                embed.add_field(
+                    name=f"#{i} by {note['moderator']}",
+                    value=note['content'][:1024],
+                    inline=False
+                )
+            return embed
+
+        if not await Paginator(ctx.author, ListSource(notes, LIST_PAGE_SIZE), render).start(ctx):
             embed = create_info_embed(
                 title="No Notes Found",
                 message=f"{member.mention} has no staff notes."
             )
             return await ctx.send(embed=embed)
 
-        embed = discord.Embed(
-            title=f"🗒️ Notes for {member}",
-            color=discord.Color.dark_teal()
-        )
-        for i, note in enumerate(notes, 1):
-            embed.add_field(
-                name=f"#{i} by {note['moderator']}",
-                value=note['content'],
-                inline=False
-            )
-        await ctx.send(embed=embed)
-
         await log_command(ctx)
 
     @commands.command(name="notes_add")
@@ -843,15 +1038,12 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
-        user_id = str(member.id)
-        if user_id not in self.notes_data:
-            self.notes_data[user_id] = []
-
-        self.notes_data[user_id].append({
+        add_note(ctx.guild.id, member.id, {
             "moderator": str(ctx.author),
-            "content": note
+            "content": note,
+            "timestamp": int(time.time())
         })
-        save_notes(self.notes_data)
+        await self.record_case(ctx, member, "note", note)
 
         embed = create_success_embed(
             title="Note Added",
@@ -872,10 +1064,9 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
-        user_id = str(member.id)
-        if user_id in self.notes_data:
-            del self.notes_data[user_id]
-            save_notes(self.notes_data)
+        legacy = self.is_home(ctx.guild.id)
+        if notes_for(ctx.guild.id, member.id, legacy):
+            clear_notes(ctx.guild.id, member.id, legacy)
             embed = create_success_embed(
                 title="Notes Cleared",
                 message=f"All notes cleared for {member.mention}."
@@ -891,34 +1082,35 @@ def parse_duration(time_str):
     @commands.command(name="jaillist")
     @is_staff()
     async def view_jailed_users(self, ctx):
-        JAIL_ROLE_ID = 1401353254083760160
-        jail_role = ctx.guild.get_role(JAIL_ROLE_ID)
+        jail_role = ctx.guild.get_role(guild_settings.get(ctx.guild.id, "jail_role") or 0)
 
         if not jail_role:
             embed = create_error_embed(
                 title="Jail Role Missing",
-                reason="The jail role could not be found. Please check the ID.",
+                reason="The jail role could not be found. Set it with `,config set jail_role @Role`.",
                 usage=",jaillist",
                 example=",jaillist"
             )
             return await ctx.send(embed=embed)
 
-        jailed_members = [member.mention for member in jail_role.members]
+        # Paged by candidate ID; only the page on screen is resolved and checked for the role
+        async def render(candidates, offset, total):
+            jailed = await self.jailed_members(ctx.guild, jail_role, candidates)
+            embed = discord.Embed(
+                title="🚨 Currently Jailed Users",
+                description="\n".join(member.mention for member in jailed) or "No one on this page is still jailed.",
+                color=discord.Color.dark_red()
+            )
+            # Candidates include members who left or were released since, so this is an upper bound
+            embed.set_footer(text=f"Candidates: {total}")
+            return embed
 
-        if not jailed_members:
+        if not await Paginator(ctx.author, ListSource(self.jail_candidates(ctx.guild, jail_role), LIST_PAGE_SIZE), render).start(ctx):
             embed = create_info_embed(
                 title="No Jailed Members",
                 message="There are currently no jailed users in this server."
             )
             return await ctx.send(embed=embed)
-
-        embed = discord.Embed(
-            title="🚨 Currently Jailed Users",
-            description="\n".join(jailed_members),
-            color=discord.Color.dark_red()
-        )
-        embed.set_footer(text=f"Total: {len(jailed_members)} users")
-        await ctx.send(embed=embed)
         await log_command(ctx)
 
     @commands.command(name="imute", aliases=["im"])
@@ -977,7 +1169,7 @@ def parse_duration(time_str):
         await ctx.send(embed=embed)
         await log_command(ctx)
 
-    @commands.command(name="rmute", aliases=["rm"])
+    @commands.command(name="rmute", aliases=["rmt"])
     @is_staff()
     async def reaction_mute(self, ctx, member: discord.Member = None, *, reason: str = "No reason provided."):
         if not member:
@@ -1033,6 +1225,43 @@ def parse_duration(time_str):
         await ctx.send(embed=embed)
         await log_command(ctx)
 
+    async def run_purge(self, ctx, predicate, amount, title, noun, before=None, after=None, dry_run=False):
+        await ctx.message.delete()
+        status = await ctx.send(embed=create_info_embed(
+            title=title,
+            message=f"{'Counting' if dry_run else 'Deleting'} up to **{amount}** {noun}..."
+        ))
+
+        async def report(progress):
+            if not progress.done:
+                await status.edit(embed=create_info_embed(title=title, message=f"⏳ {progress.summary()}"))
+
+        try:
+            progress = await purge(
+                ctx.channel, predicate, amount,
+                before=before, after=after, skip_ids={status.id}, dry_run=dry_run, on_progress=report
+            )
+        except discord.Forbidden:
+            return await status.edit(embed=create_error_embed(
+                title="Permission Error",
+                reason="I need `Read Message History` and `Manage Messages` in this channel.",
+                usage=",purge 25",
+                example=",purge 10"
+            ))
+
+        if dry_run:
+            embed = create_info_embed(
+                title=title,
+                message=f"Dry run: **{progress.matched}** {noun} would be deleted (scanned {progress.scanned})."
+            )
+            return await status.edit(embed=embed)
+
+        embed = create_success_embed(
+            title=title,
+            message=f"Deleted **{progress.deleted}** {noun} from {ctx.channel.mention}.\n{progress.summary()}"
+        )
+        await status.edit(embed=embed, delete_after=5)
+
     @commands.command(name="purge", aliases=["p"])
     @is_staff()
     async def purge_messages(self, ctx, amount: int = None):
@@ -1045,91 +1274,76 @@ def parse_duration(time_str):
             )
             return await ctx.send(embed=embed)
 
-        await ctx.message.delete()
-        deleted = await ctx.channel.purge(limit=amount)
-
-        embed = create_success_embed(
-            title="🧹 Messages Purged",
-            message=f"Deleted **{len(deleted)}** messages from {ctx.channel.mention}."
-        )
-        await ctx.send(embed=embed, delete_after=5)
+        await self.run_purge(ctx, None, amount, "🧹 Messages Purged", "messages")
         await log_command(ctx)
 
     @commands.command(name="purge_links", aliases=["pl"])
     @is_staff()
     async def purge_links(self, ctx, amount: int = 100):
-        await ctx.message.delete()
-
-        def has_link(msg):
-            return "http://" in msg.content or "https://" in msg.content
-
-        deleted = await ctx.channel.purge(limit=amount, check=has_link)
-
-        embed = create_success_embed(
-            title="🔗 Links Purged",
-            message=f"Deleted **{len(deleted)}** messages with links."
-        )
-        await ctx.send(embed=embed, delete_after=5)
+        await self.run_purge(ctx, parse_filters(["has:link"]).compile(), amount, "🔗 Links Purged", "messages with links")
         await log_command(ctx)
 
     @commands.command(name="purge_images", aliases=["pi"])
     @is_staff()
     async def purge_images(self, ctx, amount: int = 100):
-        await ctx.message.delete()
-
-        def has_attachment(msg):
-            return len(msg.attachments) > 0
-
-        deleted = await ctx.channel.purge(limit=amount, check=has_attachment)
-
-        embed = create_success_embed(
-            title="🖼️ Images Purged",
-            message=f"Deleted **{len(deleted)}** messages with attachments."
-        )
-        await ctx.send(embed=embed, delete_after=5)
+        await self.run_purge(ctx, parse_filters(["has:file"]).compile(), amount, "🖼️ Images Purged", "messages with attachments")
         await log_command(ctx)
 
     @commands.command(name="purge_contains", aliases=["pc"])
     @is_staff()
-    async def purge_contains(self, ctx, word: str = None, amount: int = 100):
-        if not word:
+    async def purge_contains(self, ctx, *terms: str):
+        # ,pc word [word...] [amount]; every term is matched in one pass
+        amount = 100
+        if terms and terms[-1].isdigit():
+            amount, terms = int(terms[-1]), terms[:-1]
+        if not terms:
             embed = create_error_embed(
                 title="Missing Word",
-                reason="You must specify a word to match against.",
-                usage=",purge contains badword",
-                example=",pc scam"
+                reason="You must specify at least one word to match against.",
+                usage=",purge_contains <word> [word...] [amount]",
+                example=",pc scam nitro 200"
             )
             return await ctx.send(embed=embed)
 
-        await ctx.message.delete()
-
-        def contains_word(msg):
-            return word.lower() in msg.content.lower()
-
-        deleted = await ctx.channel.purge(limit=amount, check=contains_word)
-
-        embed = create_success_embed(
-            title="🗑️ Word Filter Purge",
-            message=f"Deleted **{len(deleted)}** messages containing `{word}`."
-        )
-        await ctx.send(embed=embed, delete_after=5)
+        purge_filter = PurgeFilter()
+        purge_filter.contains.extend(terms)
+        listed = ", ".join(f"`{term}`" for term in terms[:10])
+        await self.run_purge(ctx, purge_filter.compile(), amount, "🗑️ Word Filter Purge", f"messages containing {listed}")
         await log_command(ctx)
 
     @commands.command(name="purge_embeds", aliases=["pe"])
     @is_staff()
     async def purge_embeds(self, ctx, amount: int = 100):
-        await ctx.message.delete()
+        await self.run_purge(ctx, parse_filters(["has:embed"]).compile(), amount, "🧾 Embed Purge", "messages with embeds")
+        await log_command(ctx)
 
-        def has_embed(msg):
-            return len(msg.embeds) > 0
+    @commands.command(name="purge_filter", aliases=["pf"])
+    @is_staff()
+    async def purge_filter(self, ctx, amount: int = None, *filters: str):
+        if not amount or amount < 1:
+            embed = create_error_embed(
+                title="Missing or Invalid Argument",
+                reason="You must specify how many matching messages to delete.",
+                usage=",purge_filter <amount> [user:@user] [bots] [contains:text] [regex:pattern] [has:image|video|audio|file|link|embed] [before:id] [after:id] [--dry]",
+                example=",pf 200 user:@Spammer has:link --dry"
+            )
+            return await ctx.send(embed=embed)
 
-        deleted = await ctx.channel.purge(limit=amount, check=has_embed)
+        try:
+            purge_filter = parse_filters(filters)
+        except ValueError as e:
+            embed = create_error_embed(
+                title="Invalid Filter",
+                reason=str(e),
+                usage=",purge_filter <amount> [filters...] [--dry]",
+                example=",pf 50 bots contains:giveaway"
+            )
+            return await ctx.send(embed=embed)
 
-        embed = create_success_embed(
-            title="🧾 Embed Purge",
-            message=f"Deleted **{len(deleted)}** messages with embeds."
+        await self.run_purge(
+            ctx, purge_filter.compile(), amount, "🧹 Filtered Purge", "matching messages",
+            before=purge_filter.before, after=purge_filter.after, dry_run=purge_filter.dry_run
         )
-        await ctx.send(embed=embed, delete_after=5)
         await log_command(ctx)
 
     @commands.command(name="softban", aliases=["sb"])
@@ -1149,6 +1363,8 @@ def parse_duration(time_str):
         except discord.Forbidden:
             return await ctx.send("❌ I don’t have permission to softban that user.")
 
+        await self.record_case(ctx, member, "softban", reason)
+
         embed = create_success_embed(
             title="🔨 Softban Executed",
             message=f"{member.mention} was softbanned and unbanned immediately."
@@ -1172,6 +1388,8 @@ def parse_duration(time_str):
         except discord.Forbidden:
             return await ctx.send("❌ I don’t have permission to hardban that user.")
 
+        await self.record_case(ctx, member, "hardban", reason)
+
         embed = create_success_embed(
             title="🚫 Hardban Executed",
             message=f"{member.mention} has been hardbanned and messages removed."
@@ -1179,23 +1397,221 @@ def parse_duration(time_str):
         await ctx.send(embed=embed)
         await log_command(ctx)
 
+    async def mass_targets(self, ctx, text, include_absent=False, skip=None):
+        # (targets, skipped, reason) for a mass action. Users named by ID who aren't in the
+        # server are dropped, or kept as bare objects when include_absent (bans work on them).
+        # The invoker, the bot, the owner, anyone not below the invoker's top role and
+        # anyone matching skip(member) are left out and counted instead.
+        user_ids, role_ids, joined, reason = parse_targets(text)
+        role_ids = [role_id for role_id in role_ids if role_id != ctx.guild.id]  # Never @everyone
+        targets = {}
+        if role_ids or joined:
+            cutoff = discord.utils.utcnow() - timedelta(seconds=joined) if joined else None
+            for member in await member_cache.everyone(ctx.guild):
+                if any(member.get_role(role_id) for role_id in role_ids) or (
+                        cutoff and member.joined_at and member.joined_at >= cutoff):
+                    targets[member.id] = member
+        wanted = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in targets]
+        targets.update(await member_cache.resolve(ctx.guild, wanted))
+        if include_absent:
+            targets.update((user_id, discord.Object(id=user_id)) for user_id in wanted if user_id not in targets)
+
+        protected = {ctx.author.id, self.bot.user.id, ctx.guild.owner_id}
+        outranks = ctx.author.id != ctx.guild.owner_id
+        kept, skipped = [], 0
+        for target in targets.values():
+            member = isinstance(target, discord.Member)
+            if target.id in protected or (member and outranks and target.top_role >= ctx.author.top_role) or (
+                    member and skip and skip(target)):
+                skipped += 1
+            else:
+                kept.append(target)
+        return kept, skipped, reason or "No reason provided."
+
+    async def run_mass(self, ctx, action, title, targets, skipped, reason, act, usage, example, **extra):
+        # One progress message, one case and one log entry for the whole batch; the
+        # calls go out through run_bulk, a few at a time against the server's rate limit
+        if not targets:
+            embed = create_error_embed(
+                title="No Targets",
+                reason="None of the given mentions, IDs, roles or join window matched a member I can act on."
+                       + (f" ({skipped} skipped)" if skipped else ""),
+                usage=usage,
+                example=example
+            )
+            return await ctx.send(embed=embed)
+        if len(targets) > MASS_ACTION_LIMIT:
+            embed = create_error_embed(
+                title="Too Many Targets",
+                reason=f"That matches **{len(targets)}** members; one mass action is limited to {MASS_ACTION_LIMIT}.",
+                usage=usage,
+                example=example
+            )
+            return await ctx.send(embed=embed)
+
+        progress = await ctx.send(embed=create_info_embed(
+            title=title,
+            message=f"Processing **{len(targets)}** members..."
+        ))
+
+        async def report(result):
+            await progress.edit(embed=create_info_embed(
+                title=title,
+                message=f"Processed **{result.done}/{result.total}** members...\n{result.summary()}"
+            ))
+
+        result = await run_bulk(targets, act, route_key=lambda target: action, on_progress=report)
+
+        failed = {target.id for target, _ in result.failed}
+        if case_store:
+            await case_store.add_case(
+                ctx.guild.id, 0, ctx.author.id, str(ctx.author), f"mass{action}", reason,
+                extra={"targets": [target.id for target in targets if target.id not in failed],
+                       "failed": sorted(failed), "skipped": skipped, **extra}
+            )
+
+        message = f"**{result.succeeded}/{result.total}** members, for: **{reason}**\n{result.summary()}"
+        if skipped:
+            message += f"\n⏭️ **{skipped}** skipped (you, me, the owner, higher roles or already done)"
+        await progress.edit(embed=create_success_embed(title=title, message=message))
+
+        await log_command(ctx, details={
+            "Targets": result.total, "Succeeded": result.succeeded, "Failed": len(failed), "Skipped": skipped
+        })
+
+    @commands.command(name="massban", aliases=["mb"])
+    @is_staff()
+    async def mass_ban(self, ctx, *, targets: str = None):
+        # Also takes IDs of users who already left, so a raid can't dodge the ban by leaving
+        members, skipped, reason = await self.mass_targets(ctx, targets, include_absent=True)
+        await self.run_mass(
+            ctx, "ban", "🔨 Mass Ban", members, skipped, reason,
+            lambda target: ctx.guild.ban(target, reason=f"Mass ban by {ctx.author} | {reason}"),
+            usage=",massban <@users / IDs / @role / joined:10m> <reason>",
+            example=",massban joined:15m Raid wave"
+        )
+
+    @commands.command(name="masskick", aliases=["mk"])
+    @is_staff()
+    async def mass_kick(self, ctx, *, targets: str = None):
+        members, skipped, reason = await self.mass_targets(ctx, targets)
+        await self.run_mass(
+            ctx, "kick", "👢 Mass Kick", members, skipped, reason,
+            lambda member: member.kick(reason=f"Mass kick by {ctx.author} | {reason}"),
+            usage=",masskick <@users / IDs / @role / joined:10m> <reason>",
+            example=",masskick @Alt1 @Alt2 Alt accounts"
+        )
+
+    @commands.command(name="massmute", aliases=["mm"])
+    @is_staff()
+    async def mass_mute(self, ctx, time: str = None, *, targets: str = None):
+        seconds = parse_duration(time or "")
+        if not seconds:
+            embed = create_error_embed(
+                title="Invalid Time Format",
+                reason="Give a duration like `10m`, `1h` or `1d` before the targets.",
+                usage=",massmute 30m <@users / IDs / @role / joined:10m> <reason>",
+                example=",massmute 1h joined:10m Spam wave"
+            )
+            return await ctx.send(embed=embed)
+
+        members, skipped, reason = await self.mass_targets(
+            ctx, targets, skip=lambda member: member.is_timed_out()
+        )
+        await self.run_mass(
+            ctx, "mute", "🔇 Mass Mute", members, skipped, reason,
+            lambda member: self.timeout_member(member, seconds, f"Mass mute by {ctx.author} | {reason}"),
+            usage=",massmute 30m <@users / IDs / @role / joined:10m> <reason>",
+            example=",massmute 1h joined:10m Spam wave",
+            duration=seconds
+        )
+
+    @commands.command(name="massjail", aliases=["mj"])
+    @is_staff()
+    async def mass_jail(self, ctx, time: str = None, *, targets: str = None):
+        jail_role = ctx.guild.get_role(guild_settings.get(ctx.guild.id, "jail_role") or 0)
+        seconds = parse_duration(time or "")
+        if not seconds:
+            embed = create_error_embed(
+                title="Invalid Time Format",
+                reason="Give a duration like `10m`, `2h` or `1d` before the targets.",
+                usage=",massjail 1h <@users / IDs / @role / joined:10m> <reason>",
+                example=",massjail 1h @Raiders Raid"
+            )
+            return await ctx.send(embed=embed)
+        if not jail_role:
+            return await ctx.send("⚠️ Jail role not found in the server.")
+
+        # Already jailed members are skipped; their timer and snapshot stay as they are
+        members, skipped, reason = await self.mass_targets(
+            ctx, targets, skip=lambda member: member.get_role(jail_role.id) is not None
+        )
+
+        async def jail(member):
+            await self.jail_member(member, jail_role, f"Mass jail by {ctx.author} | {reason}")
+            self.bot.scheduler.cancel_for("unjail", ctx.guild.id, member.id)
+            self.bot.scheduler.schedule("unjail", seconds, ctx.guild.id, member.id, ctx.channel.id, duration=time)
+
+        await self.run_mass(
+            ctx, "jail", "🚨 Mass Jail", members, skipped, reason, jail,
+            usage=",massjail 1h <@users / IDs / @role / joined:10m> <reason>",
+            example=",massjail 1h @Raiders Raid",
+            duration=seconds
+        )
+
+    @commands.command(name="massunjail", aliases=["muj"])
+    @is_staff()
+    async def mass_unjail(self, ctx, *, targets: str = None):
+        jail_role = ctx.guild.get_role(guild_settings.get(ctx.guild.id, "jail_role") or 0)
+        if not jail_role:
+            return await ctx.send("⚠️ Jail role not found in the server.")
+
+        user_ids, role_ids, joined, reason = parse_targets(targets)
+        if user_ids or role_ids or joined:
+            members, skipped, reason = await self.mass_targets(
+                ctx, targets, skip=lambda member: member.get_role(jail_role.id) is None
+            )
+        else:
+            # No targets: everyone jailed in the server
+            members, skipped, reason = await self.jailed_members(ctx.guild, jail_role), 0, reason or "No reason provided."
+
+        async def unjail(member):
+            await self.release_member(member, f"Mass unjail by {ctx.author} | {reason}")
+            self.bot.scheduler.cancel_for("unjail", ctx.guild.id, member.id)
+
+        await self.run_mass(
+            ctx, "unjail", "🔓 Mass Unjail", members, skipped, reason, unjail,
+            usage=",massunjail [@users / IDs / @role / joined:10m] [reason]",
+            example=",massunjail Raid handled"
+        )
+
     @commands.command(name="clearinvites", aliases=["ci"])
     @is_staff()
     async def clear_all_invites(self, ctx):
         invites = await ctx.guild.invites()
-        count = 0
-        for invite in invites:
-            try:
-                await invite.delete(reason=f"Cleared by {ctx.author}")
-                count += 1
-            except:
-                continue
+        progress = await ctx.send(embed=create_info_embed(
+            title="🔗 Clearing Invites",
+            message=f"Deleting **{len(invites)}** invite links..."
+        ))
+
+        async def report(result):
+            await progress.edit(embed=create_info_embed(
+                title="🔗 Clearing Invites",
+                message=f"Processed **{result.done}/{result.total}** invite links...\n{result.summary()}"
+            ))
+
+        result = await run_bulk(
+            invites,
+            lambda invite: invite.delete(reason=f"Cleared by {ctx.author}"),
+            route_key=lambda invite: "invites",
+            on_progress=report
+        )
 
         embed = create_success_embed(
             title="🔗 Invites Cleared",
-            message=f"Deleted **{count}** invite links from the server."
+            message=f"Deleted **{result.succeeded}** invite links from the server.\n{result.summary()}"
         )
-        await ctx.send(embed=embed)
+        await progress.edit(embed=embed)
         await log_command(ctx)
 
     @commands.command(name="drag")
@@ -1305,16 +1721,16 @@ def parse_duration(time_str):
             return await ctx.send(embed=embed)
 
         if value.lower() in ["off", "0"]:
-            await ctx.channel.edit(slowmode_delay=0)
+            await self.apply_slowmode(ctx.channel, 0)
             msg = "Slowmode has been **disabled**."
         elif value.lower() == "on":
-            await ctx.channel.edit(slowmode_delay=5)
+            await self.apply_slowmode(ctx.channel, 5)
             msg = "Slowmode set to **5 seconds**."
         elif value.isdigit():
             delay = int(value)
             if delay > 21600:
                 return await ctx.send("⏱️ Slowmode cannot exceed 21600 seconds.")
-            await ctx.channel.edit(slowmode_delay=delay)
+            await self.apply_slowmode(ctx.channel, delay)
             msg = f"Slowmode set to **{delay} seconds**."
         else:
             return await ctx.send("⚠️ Invalid slowmode format.")
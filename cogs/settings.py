@@ -0,0 +1,193 @@
+import discord
+from discord.ext import commands
+from utils.checks import is_staff
+from utils.embeds import create_error_embed, create_success_embed
+from utils.logger import log_command
+from utils.guild_config import guild_settings, SETTINGS
+from utils.permissions import permission_cache, CAPABILITIES, names
+
+def staff_or_admin():
+    # Admins can always configure, so a new server can set its staff role first
+    return commands.check_any(is_staff(), commands.has_permissions(administrator=True))
+
+def parse_setting(kind, value):
+    if value.lower() in ("none", "off"):
+        return None
+    if kind == "number":
+        return float(value)
+    raw = value.strip("<#@&>")
+    if not raw.isdigit():
+        raise ValueError
+    return int(raw)
+
+def format_setting(kind, value):
+    if value is None:
+        return "Not set"
+    if kind == "channel":
+        return f"<#{value}>"
+    if kind == "role":
+        return f"<@&{value}>"
+    if kind == "mapping":
+        return f"{len(value)} roles (see ,perms)" if value else "None"
+    return f"{value:g}"
+
+class Settings(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Keep cached capability masks in step with role changes
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before._roles != after._roles:
+            permission_cache.invalidate_member(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        permission_cache.invalidate_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        permission_cache.invalidate_guild(role.guild.id)
+
+    @commands.group(name="config", aliases=["settings"], invoke_without_command=True)
+    @staff_or_admin()
+    async def config(self, ctx):
+        settings = guild_settings.for_guild(ctx.guild.id)
+        overrides = guild_settings.overrides(ctx.guild.id)
+
+        embed = discord.Embed(
+            title=f"⚙️ Settings for {ctx.guild.name}",
+            color=discord.Color.blurple()
+        )
+        for key, (kind, _) in SETTINGS.items():
+            marker = "" if key in overrides else " *(default)*"
+            embed.add_field(name=key, value=format_setting(kind, settings[key]) + marker, inline=True)
+        embed.set_footer(text="Change with ,config set <key> <value> | ,config reset <key>")
+        await ctx.send(embed=embed)
+
+    @config.command(name="set")
+    @staff_or_admin()
+    async def config_set(self, ctx, key: str = None, *, value: str = None):
+        if key not in SETTINGS or value is None:
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Setting",
+                reason=f"Known keys: {', '.join(f'`{k}`' for k in SETTINGS)}.",
+                usage=",config set <key> <value>",
+                example=",config set log_channel #mod-logs"
+            ))
+
+        kind = SETTINGS[key][0]
+        if kind == "mapping":
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Setting",
+                reason=f"`{key}` is edited with the `,perms` commands.",
+                usage=",perms grant <role> <capability...>",
+                example=",perms grant @Mods moderator"
+            ))
+        try:
+            parsed = parse_setting(kind, value)
+        except ValueError:
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Value",
+                reason=f"`{key}` expects a {kind}{' mention or ID' if kind != 'number' else ''}, or `none`.",
+                usage=",config set <key> <value>",
+                example=",config set staff_role @Staff"
+            ))
+        lookup = {"channel": ctx.guild.get_channel, "role": ctx.guild.get_role}.get(kind)
+        if lookup and parsed is not None and lookup(parsed) is None:
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Value",
+                reason=f"There's no {kind} with that ID in this server.",
+                usage=",config set <key> <value>",
+                example=",config set log_channel #mod-logs"
+            ))
+
+        guild_settings.set(ctx.guild.id, key, parsed)
+        embed = create_success_embed(
+            title="Setting Updated",
+            message=f"`{key}` is now {format_setting(kind, parsed)}."
+        )
+        await ctx.send(embed=embed)
+        await log_command(ctx, "config set", {"key": key, "value": value})
+
+    @config.command(name="reset")
+    @staff_or_admin()
+    async def config_reset(self, ctx, key: str = None):
+        if key not in SETTINGS:
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Setting",
+                reason=f"Known keys: {', '.join(f'`{k}`' for k in SETTINGS)}.",
+                usage=",config reset <key>",
+                example=",config reset log_channel"
+            ))
+
+        guild_settings.reset(ctx.guild.id, key)
+        kind = SETTINGS[key][0]
+        embed = create_success_embed(
+            title="Setting Reset",
+            message=f"`{key}` is back to its default: {format_setting(kind, guild_settings.get(ctx.guild.id, key))}."
+        )
+        await ctx.send(embed=embed)
+        await log_command(ctx, "config reset", {"key": key})
+
+    @commands.group(name="perms", aliases=["capabilities"], invoke_without_command=True)
+    @staff_or_admin()
+    async def perms(self, ctx, member: discord.Member = None):
+        if member:
+            granted = names(permission_cache.mask(member))
+            embed = create_success_embed(
+                title=f"🔑 Capabilities for {member}",
+                message=", ".join(f"`{name}`" for name in granted) or "None"
+            )
+            return await ctx.send(embed=embed)
+
+        embed = discord.Embed(
+            title=f"🔑 Capability Roles for {ctx.guild.name}",
+            color=discord.Color.blurple()
+        )
+        for role_id, bits in permission_cache.role_bits(ctx.guild.id).items():
+            embed.add_field(name=f"Role {role_id}", value=f"<@&{role_id}>: " + ", ".join(names(bits)), inline=False)
+        if not embed.fields:
+            embed.description = "No roles have capabilities yet."
+        embed.set_footer(text=f"Capabilities: {', '.join(CAPABILITIES)} | ,perms grant/revoke <role> <capability...>")
+        await ctx.send(embed=embed)
+
+    async def _edit_capabilities(self, ctx, role, capabilities, grant):
+        unknown = [name for name in capabilities if name.lower() not in CAPABILITIES]
+        if role is None or not capabilities or unknown:
+            return await ctx.send(embed=create_error_embed(
+                title="Invalid Capabilities",
+                reason=f"Known capabilities: {', '.join(f'`{c}`' for c in CAPABILITIES)}.",
+                usage=f",perms {ctx.invoked_with} <role> <capability...>",
+                example=f",perms {ctx.invoked_with} @Mods moderator"
+            ))
+
+        mapping = {k: list(v) for k, v in guild_settings.get(ctx.guild.id, "capability_roles").items()}
+        current = set(mapping.get(str(role.id), []))
+        changed = {name.lower() for name in capabilities}
+        current = current | changed if grant else current - changed
+        if current:
+            mapping[str(role.id)] = sorted(current)
+        else:
+            mapping.pop(str(role.id), None)
+        guild_settings.set(ctx.guild.id, "capability_roles", mapping)
+
+        embed = create_success_embed(
+            title="Capabilities Updated",
+            message=f"{role.mention} now has: {', '.join(f'`{c}`' for c in sorted(current)) or 'nothing'}."
+        )
+        await ctx.send(embed=embed)
+        await log_command(ctx, f"perms {ctx.invoked_with}", {"role": role.name, "capabilities": ", ".join(sorted(changed))})
+
+    @perms.command(name="grant")
+    @staff_or_admin()
+    async def perms_grant(self, ctx, role: discord.Role = None, *capabilities: str):
+        await self._edit_capabilities(ctx, role, capabilities, True)
+
+    @perms.command(name="revoke")
+    @staff_or_admin()
+    async def perms_revoke(self, ctx, role: discord.Role = None, *capabilities: str):
+        await self._edit_capabilities(ctx, role, capabilities, False)
+
+async def setup(bot):
+    await bot.add_cog(Settings(bot))
@@ -7,13 +7,97 @@ PREFIX = ","
 # ✅ Discord Bot Token (use Railway Secret environment)
 TOKEN = os.getenv("TOKEN")  # Set this in Railway under Project > Variables
 
-# ✅ Logging Channel (logs every command here)
+# ✅ Logging Channel (logs every command here; servers can override with ,config)
 LOG_CHANNEL_ID = 1400809302423375942
 
-# ✅ Role IDs
+# ✅ Home Server (the original server the legacy JSON warnings and notes belong to)
+HOME_GUILD_ID = int(os.getenv("HOME_GUILD_ID", "0"))  # 0: the server that owns LOG_CHANNEL_ID
+
+# ✅ Log Sink (batched, off the command path)
+LOG_QUEUE_SIZE = 1000        # Max embeds waiting to be sent
+LOG_BATCH_SIZE = 10          # Embeds packed per message (Discord max is 10)
+LOG_FLUSH_INTERVAL = 2.0     # Seconds before a partial batch is sent
+LOG_OVERFLOW = "spill"       # "spill" to disk or "drop" when the queue is full
+LOG_SPILL_FILE = "data/log_spill.jsonl"
+
+# ✅ Data Storage (append-only journal + snapshot per data file, written off the event loop)
+JOURNAL_COMPACT_EVERY = 500  # Journal entries before the snapshot is rewritten
+JOURNAL_FSYNC = False        # fsync every batch of journal writes (safer, slower)
+PERSIST_BATCH_DELAY = 0.05   # Seconds the writer thread lets a burst of writes pile up before flushing it
+PERSIST_FLUSH_TIMEOUT = 10.0 # Seconds shutdown waits for queued writes to reach the disk
+
+# ✅ Moderation Case Store (optional SQLite backend, disabled when unset)
+CASE_DB_PATH = os.getenv("CASE_DB_PATH")  # e.g. data/cases.db
+
+# ✅ Timers (tempban, jail and lockdown expiries)
+TIMERS_FILE = "data/timers.json"
+TIMER_BATCH_SIZE = 50        # Overdue timers run concurrently per batch
+TIMER_RETRY_DELAY = 60       # Seconds before a failed expiry is retried, doubled on each further failure
+TIMER_MAX_ATTEMPTS = 5       # Failed runs before a timer is given up on
+
+# ✅ Jail Snapshots (pre-jail role IDs, restored by the unjail timer, ,unjail and ,massunjail)
+JAIL_SNAPSHOTS_FILE = "data/jail_snapshots.json"
+
+# ✅ DM Notifications (sent off the command path)
+DM_WORKERS = 4                 # Concurrent DM sends
+DM_CHANNEL_CACHE = 5000        # User -> DM channel IDs remembered (skips the create-DM call)
+DM_CLOSED_TTL = 6 * 3600       # Seconds a user with closed DMs is skipped without trying
+DM_RETRIES = 3                 # Extra attempts on 429/5xx, with jittered exponential backoff
+DM_RETRY_BASE = 1.0            # Seconds before the first retry
+DM_BEFORE_REMOVAL_TIMEOUT = 3.0  # Max wait for the DM before a ban/kick removes the shared server
+
+# ✅ Bulk REST Operations
+BULK_CONCURRENCY = 10        # Max requests in flight per bulk operation
+BULK_PER_ROUTE = 5           # Max in flight against the same rate-limit bucket
+BULK_PROGRESS_INTERVAL = 2.0 # Seconds between progress updates
+MASS_ACTION_LIMIT = 1000     # Most members one ,massban / ,masskick / ,massmute / ,massjail may hit
+
+# ✅ Purge Engine
+PURGE_SCAN_LIMIT = 10000       # Max history messages scanned per purge
+PURGE_PROGRESS_INTERVAL = 2.0  # Seconds between progress edits
+
+# ✅ Birthdays
+DEFAULT_BIRTHDAY_CHANNEL_ID = 1400809302423375942  # Used until a server sets `,birthday channel`
+BIRTHDAYS_PER_PAGE = 20
+
+# ✅ Paginated Lists (warnings, history, notes, birthdays, jaillist)
+LIST_PAGE_SIZE = 10          # Entries per page for warnings, history, notes and jaillist
+PAGINATOR_TIMEOUT = 120      # Seconds without a button press before a list's buttons are removed
+PAGINATOR_CACHE_PAGES = 5    # Rendered pages kept per list
+PAGINATOR_CACHE_TTL = 30     # Seconds a rendered page is reused before it's rendered again
+
+# ✅ Anti-Raid (sliding-window counters; enable per server with ,automod raid on)
+RAID_THRESHOLDS = {             # kind -> (events, window seconds)
+    "joins": (10, 10),          # Member joins per server
+    "messages": (25, 5),        # Messages per channel
+    "mentions": (30, 10),       # User/role mentions per channel
+    "identical": (6, 15),       # Same message content per server
+}
+RAID_BUCKETS = 10               # Ring buffer slots per window
+RAID_CONTENT_SLOTS = 256        # Distinct message contents tracked per server
+RAID_LOCKDOWN_SECONDS = 600     # Automatic lockdown length
+RAID_SLOWMODE_DELAY = 10        # Automatic slowmode in seconds
+RAID_SLOWMODE_SECONDS = 600     # How long automatic slowmode stays on
+
+# ✅ Spam Detection (per-user history; enable per server with ,automod spam <timeout|purge>)
+SPAM_WINDOW = 15                # Seconds of history kept per user
+SPAM_HISTORY = 10               # Recent messages kept per user
+SPAM_MAX_USERS = 10000          # Users tracked at once across all servers (least recent evicted)
+SPAM_DUPLICATES = 4             # Same content this many times in the window
+SPAM_CHANNELS = 3               # Same content in this many channels in the window
+SPAM_MENTIONS = 8               # Mentions in one message, or twice this across the window
+SPAM_EMOJIS = 15                # Emojis in one message
+SPAM_TIMEOUT_SECONDS = 600      # Timeout length for the "timeout" response
+SPAM_PURGE_SCAN = 200           # Messages scanned per channel for the "purge" response
+
+# ✅ Role IDs (defaults; servers can override with ,config)
 STAFF_ROLE_ID = 1400967381869658182
 PIC_PERM_ROLE_ID = 1401141194397974582
 LINK_PERM_ROLE_ID = 1401141250450657340
+JAIL_ROLE_ID = 1401353254083760160
+
+# ✅ Per-Server Settings (overrides for the IDs above, set with ,config)
+GUILD_SETTINGS_FILE = "data/guild_settings.json"
 
 # ✅ Discord Intents (all enabled)
 INTENTS = discord.Intents.default()
@@ -24,9 +108,58 @@ INTENTS.messages = True
 INTENTS.reactions = True
 INTENTS.presences = True
 
+# ✅ Memory Profile ("lean": no member chunking at startup, members fetched on demand into a bounded cache)
+MEMORY_PROFILE = os.getenv("MEMORY_PROFILE", "full")  # "full" caches every member (and presence) of every server
+MEMBER_CACHE_FLAGS = {"joined": True, "voice": True}  # lean: discord.MemberCacheFlags; swept by the member cache
+MEMBER_CACHE_SIZE = 20000                # lean: members kept across all servers before the least recently used go
+MEMBER_CACHE_TTL = 1800                  # lean: seconds a member stays cached after it was last looked up
+MEMBER_CACHE_SWEEP = 60                  # lean: seconds between evictions
+OPTIONAL_INTENTS = ("presences",)        # lean: only enabled when a cog lists them in its REQUIRED_INTENTS
+
 # ✅ List of Cogs to Load
 COGS = [
     "moderation",   # warn, mute, ban, kick, jail etc.
     "general",      # ping, help, info etc.
-    "fun"           # optional funny/random commands
+    "fun",          # optional funny/random commands
+    "automod",      # word/link filter
+    "settings",     # per-server config
+    "admin"         # reload and bot maintenance
 ]
+
+# ✅ Startup
+LAZY_COGS = ["fun"]                      # Loaded on first use of one of their (prefix-only) commands
+TREE_HASH_FILE = "data/tree_hash.json"   # Last synced slash command tree; sync is skipped when unchanged
+
+# ✅ Bot Operators (bot-wide commands like ,reload; the application owner always counts)
+BOT_OPERATORS = {int(i) for i in os.getenv("BOT_OPERATORS", "").split(",") if i.strip()}  # User IDs
+
+# ✅ Hot Reload
+DATA_POLL_INTERVAL = 5.0                 # Seconds between data file mtime checks (0 disables)
+
+# ✅ Metrics (command and REST timings; staff can view them with ,perf)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Serves Prometheus text at /metrics when set (0 disables)
+METRICS_HOST = "127.0.0.1"
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # Histogram bounds in seconds
+
+# ✅ Sharding and Clusters (unset: one process, one gateway connection)
+SHARD_COUNT = os.getenv("SHARD_COUNT")        # "auto" (Discord's recommendation) or a number; runs AutoShardedBot
+SHARD_IDS = os.getenv("SHARD_IDS")            # Shards this process runs, e.g. "0-3,8"; set per process by cluster.py
+CLUSTER_ID = int(os.getenv("CLUSTER_ID", "0"))
+CLUSTER_PROCESSES = int(os.getenv("CLUSTER_PROCESSES", "2"))  # cluster.py: processes the shards are split across
+CLUSTER_RESTART_DELAY = 5.0                   # Seconds before a crashed process is started again (doubles per crash)
+SHARD_STATUS_INTERVAL = 30                    # Seconds between shard status reports for ,shards
+
+# ✅ Shared State (one SQLite file for warnings, notes, timers and server settings across processes)
+SHARED_DB_PATH = os.getenv("SHARED_DB_PATH")  # e.g. data/shared.db; cluster.py sets it when unset
+SHARED_CHANGES_TTL = 3600                     # Seconds change records are kept for other processes to catch up
+SHARED_NAMESPACES = {                         # Opened at startup, each first imported from its JSON store
+    "warnings": "data/warnings.json",
+    "notes": "data/notes.json",
+    "timers": TIMERS_FILE,
+    "jail_snapshots": JAIL_SNAPSHOTS_FILE,
+    "guild_settings": GUILD_SETTINGS_FILE,
+    "automod": "data/automod.json",
+    "birthdays": "data/birthdays.json",
+    "birthday_state": "data/birthday_state.json",
+    "shards": None,                           # Shard status reports for ,shards; nothing to import
+}
@@ -1,3 +1,6 @@
+import time
+STARTED = time.perf_counter()
+
 import discord
 from discord.ext import commands
 import os
@@ -5,33 +8,146 @@ import asyncio
 import traceback
 import logging
 
-from config import TOKEN, PREFIX, INTENTS, COGS
-from utils.logger import log_command
+from config import TOKEN, PREFIX, COGS, LAZY_COGS, METRICS_HOST, METRICS_PORT, SHARD_COUNT, SHARED_NAMESPACES
+from utils.logger import log_command, log_sink
+from utils.case_store import case_store
+from utils.scheduler import TimerScheduler
+from utils.reloader import file_watcher
+from utils.dm import dm_dispatcher
+from utils.metrics import metrics
+from utils.members import member_cache, profile_options
+from utils.persistence import persistence
+from utils.jail_snapshots import jail_snapshots
+from utils.cluster import sharding_options, owns_guild
+from utils.shared_store import shared_store
 from utils.error_handler import handle_command_error
+from utils.startup import (
+    StartupTimer, preload_imports, extension_commands, tree_hash, last_synced_hash, save_synced_hash
+)
 
 # Setup logger
 logging.basicConfig(level=logging.INFO)
 
-class BleedBot(commands.Bot):
+# SHARD_COUNT switches to one process running several gateway shards (and, under cluster.py, a range of them)
+BotBase = commands.AutoShardedBot if SHARD_COUNT else commands.Bot
+
+class BleedBot(BotBase):
+    scheduler = None
+    lazy_commands = {}  # command name or alias -> deferred extension
+
+    def __init__(self, *args, **kwargs):
+        # Every REST call is timed per route; the trace config sees each attempt on the wire
+        super().__init__(*args, http_trace=metrics.trace_config(), **kwargs)
+        metrics.instrument(self.http)
+        metrics.add_source("log_sink", log_sink.stats)
+        metrics.add_source("dm", lambda: dm_dispatcher.counters)
+        metrics.add_source("member_cache", member_cache.stats)
+        metrics.add_source("persistence", persistence.stats)
+        metrics.add_source("jail_snapshots", jail_snapshots.stats)
+
     async def setup_hook(self):
-        for cog in COGS:
+        timer = StartupTimer(STARTED)
+        timer.phases.append(("python imports", time.perf_counter() - STARTED))
+
+        if shared_store:
+            # Everything that reads shared data (the scheduler, cogs at import) needs its namespace loaded first
+            with timer.phase("open shared store"):
+                await shared_store.open(SHARED_NAMESPACES)
+
+        # Cogs register their expiry handlers on this while loading
+        self.scheduler = TimerScheduler(self, owns=lambda guild_id: owns_guild(self, guild_id))
+
+        eager = [f"cogs.{cog}" for cog in COGS if cog not in LAZY_COGS]
+        with timer.phase(f"parallel import of dependencies for {len(eager)} cogs"):
+            await preload_imports(eager)
+
+        for name in eager:
             try:
-                await self.load_extension(f"cogs.{cog}")
-                logging.info(f"✅ Loaded cog: {cog}")
+                with timer.phase(f"load {name}"):
+                    await self.load_extension(name)
+                logging.info(f"✅ Loaded cog: {name[5:]}")
             except Exception as e:
-                logging.error(f"❌ Failed to load cog {cog}\n{traceback.format_exc()}")
+                logging.error(f"❌ Failed to load cog {name[5:]}\n{traceback.format_exc()}")
+
+        # Lazy cogs load the first time someone uses one of their commands
+        self.lazy_commands = {}
+        self._lazy_lock = asyncio.Lock()
+        for cog in LAZY_COGS:
+            for command in extension_commands(f"cogs.{cog}"):
+                self.lazy_commands[command] = f"cogs.{cog}"
+        if LAZY_COGS:
+            logging.info(f"💤 Deferred cogs: {', '.join(LAZY_COGS)}")
+
+        with timer.phase("slash command sync"):
+            await self.sync_tree()
+
+        self.scheduler.start()
+        file_watcher.start()
+        member_cache.start(self)
+        if METRICS_PORT:
+            await metrics.serve(METRICS_HOST, METRICS_PORT)
+            logging.info(f"📈 Metrics at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        logging.info(f"⏰ Restored {len(self.scheduler.store)} pending timers.")
+        logging.info(timer.report())
 
+    async def sync_tree(self):
+        digest = tree_hash(self.tree, self.application_id)
+        if digest == last_synced_hash():
+            logging.info("🔁 Slash commands unchanged, skipping sync.")
+            return
         try:
             synced = await self.tree.sync()
+            save_synced_hash(digest)
             logging.info(f"🔁 Synced {len(synced)} slash commands.")
         except Exception as e:
             logging.error(f"❌ Slash command sync failed:\n{traceback.format_exc()}")
 
-bot = BleedBot(command_prefix=PREFIX, intents=INTENTS, help_command=None)
+    async def get_context(self, origin, *, cls=commands.Context):
+        ctx = await super().get_context(origin, cls=cls)
+        if ctx.command is None and ctx.invoked_with in self.lazy_commands:
+            name = self.lazy_commands[ctx.invoked_with]
+            async with self._lazy_lock:
+                if name not in self.extensions:
+                    start = time.perf_counter()
+                    await self.load_extension(name)
+                    logging.info(f"✅ Loaded deferred cog {name[5:]} in {(time.perf_counter() - start) * 1000:.1f}ms")
+            ctx = await super().get_context(origin, cls=cls)
+        return ctx
+
+    async def invoke(self, ctx):
+        if ctx.command is None:
+            return await super().invoke(ctx)
+        with metrics.command(ctx.command.qualified_name):
+            await super().invoke(ctx)
+
+    async def close(self):
+        if self.is_closed():
+            return  # connect() calls close() again once the gateway has shut
+        if self.scheduler:
+            await self.scheduler.stop()
+        await file_watcher.stop()
+        await member_cache.stop()
+        await dm_dispatcher.stop()
+        await log_sink.stop()
+        await metrics.stop()
+        await persistence.stop()  # After everything that writes data files
+        if case_store:
+            await case_store.close()
+        if shared_store:
+            await shared_store.close()
+        await super().close()
+
+# MEMORY_PROFILE=lean: no startup chunking, a bounded member cache, presences only if a cog asks for them
+bot = BleedBot(
+    command_prefix=PREFIX, help_command=None,
+    **profile_options([f"cogs.{cog}" for cog in COGS]), **sharding_options()
+)
 
 @bot.event
 async def on_ready():
     logging.info(f"✅ Logged in as {bot.user} (ID: {bot.user.id})")
+    if bot.shard_count:
+        logging.info(f"🧩 Running shards {bot.shard_ids or 'all'} of {bot.shard_count}")
     logging.info("✅ Bot is ready and running.")
 
 @bot.event
@@ -40,6 +156,8 @@ async def on_command(ctx):
 
 @bot.event
 async def on_command_error(ctx, error):
+    if ctx.command:
+        metrics.command_error(ctx.command.qualified_name)
     await handle_command_error(ctx, error)
 
 if __name__ == "__main__":
@@ -47,3 +165,4 @@ if __name__ == "__main__":
         bot.run(TOKEN)
     except Exception as e:
         logging.critical(f"🔥 Bot crashed unexpectedly:\n{e}")
+        raise SystemExit(1)  # Non-zero so cluster.py (or the host) restarts it
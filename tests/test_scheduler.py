@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.scheduler import TimerScheduler
+
+
+def make_scheduler(tmp_path, **options):
+    return TimerScheduler(None, path=str(tmp_path / "timers.json"), retry_delay=10, **options)
+
+
+def test_failed_timer_is_requeued_with_backoff(tmp_path):
+    scheduler = make_scheduler(tmp_path, max_attempts=3)
+    calls = []
+
+    async def handler(record):
+        calls.append(record)
+        if len(calls) < 3:
+            raise ConnectionError("Discord is down")
+
+    scheduler.register("unban", handler)
+    timer_id = scheduler.schedule("unban", 0, 1, 2)
+
+    asyncio.run(scheduler._fire(timer_id, scheduler.store.get(timer_id)))
+    record = scheduler.store.get(timer_id)
+    assert record["attempts"] == 1
+    assert record["due"] == pytest.approx(time.time() + 10, abs=1)
+    assert (record["due"], timer_id) in scheduler._heap
+
+    asyncio.run(scheduler._fire(timer_id, record))
+    record = scheduler.store.get(timer_id)
+    assert record["attempts"] == 2
+    assert record["due"] == pytest.approx(time.time() + 20, abs=1)
+
+    asyncio.run(scheduler._fire(timer_id, record))
+    assert len(calls) == 3
+    assert scheduler.store.get(timer_id) is None
+
+
+def test_timer_is_given_up_after_max_attempts(tmp_path):
+    scheduler = make_scheduler(tmp_path, max_attempts=2)
+
+    async def handler(record):
+        raise ConnectionError("Discord is down")
+
+    scheduler.register("unjail", handler)
+    timer_id = scheduler.schedule("unjail", 0, 1, 2)
+
+    asyncio.run(scheduler._fire(timer_id, scheduler.store.get(timer_id)))
+    assert scheduler.store.get(timer_id)["attempts"] == 1
+    asyncio.run(scheduler._fire(timer_id, scheduler.store.get(timer_id)))
+    assert scheduler.store.get(timer_id) is None
+
+
+def test_cancelled_timer_is_kept(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+
+    async def handler(record):
+        raise asyncio.CancelledError()
+
+    scheduler.register("unban", handler)
+    timer_id = scheduler.schedule("unban", 0, 1, 2)
+    record = scheduler.store.get(timer_id)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(scheduler._fire(timer_id, record))
+    assert scheduler.store.get(timer_id) == record
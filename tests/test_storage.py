@@ -0,0 +1,71 @@
+import json
+
+from utils.persistence import persistence
+from utils.storage import JournaledStore, SNAPSHOT_MARKER
+
+
+def write_lines(path, entries):
+    with open(path, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def test_replay_after_interrupted_compaction(tmp_path):
+    # Crashed after rotating the journal but before the new snapshot was in place
+    path = str(tmp_path / "data.json")
+    with open(path, "w") as f:
+        json.dump({SNAPSHOT_MARKER: 1, "seq": 2, "data": {"a": 1, "b": 2}}, f)
+    write_lines(path + ".journal.1", [
+        {"op": "set", "key": "a", "value": 1, "seq": 1},  # Already in the snapshot
+        {"op": "set", "key": "b", "value": 2, "seq": 2},
+        {"op": "set", "key": "c", "value": 3, "seq": 3},
+        {"op": "del", "key": "a", "seq": 4},
+    ])
+    write_lines(path + ".journal", [{"op": "append", "key": "d", "value": "x", "seq": 5}])
+
+    store = JournaledStore(path)
+    assert dict(store.items()) == {"b": 2, "c": 3, "d": ["x"]}
+
+    store.set("e", 5)
+    store.compact(wait=True)
+    assert JournaledStore(path).get("e") == 5
+    assert not (tmp_path / "data.json.journal.1").exists()
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / "data.json")
+    with open(path + ".journal", "w") as f:
+        f.write(json.dumps({"op": "set", "key": "a", "value": 1, "seq": 1}) + "\n")
+        f.write('{"op": "set", "key": "b", "val')
+
+    store = JournaledStore(path)
+    assert dict(store.items()) == {"a": 1}
+
+
+def test_legacy_plain_dict_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    with open(path, "w") as f:
+        json.dump({"123": [{"reason": "old"}]}, f)
+
+    store = JournaledStore(path)
+    assert store["123"] == [{"reason": "old"}]
+
+    store.append("123", {"reason": "new"})
+    persistence.flush(path)
+    assert JournaledStore(path)["123"] == [{"reason": "old"}, {"reason": "new"}]
+
+    store.compact(wait=True)
+    with open(path) as f:
+        assert json.load(f)[SNAPSHOT_MARKER] == 1
+    assert JournaledStore(path)["123"] == [{"reason": "old"}, {"reason": "new"}]
+
+
+def test_replace_then_append(tmp_path):
+    path = str(tmp_path / "data.json")
+    store = JournaledStore(path)
+    store.set("gone", 1)
+    store.replace({"x": [1]})
+    store.append("x", 2)
+    persistence.flush(path)
+
+    assert dict(JournaledStore(path).items()) == {"x": [1, 2]}
@@ -0,0 +1,88 @@
+import asyncio
+
+
+class GuildBans:
+    def __init__(self):
+        self.by_id = {}    # user_id -> (tag, username)
+        self.by_name = {}  # lowercase tag or username -> user_id
+        self.loaded = False
+        self.loading = None
+        self._changed_during_load = {}  # user_id -> banned? for events that race the paginated fetch
+
+    def add(self, user_id, tag, name):
+        self.by_id[user_id] = (tag, name)
+        self.by_name[tag.lower()] = user_id
+        self.by_name[name.lower()] = user_id
+
+    def remove(self, user_id):
+        names = self.by_id.pop(user_id, None)
+        if names is None:
+            return
+        for name in names:
+            if self.by_name.get(name.lower()) == user_id:
+                del self.by_name[name.lower()]
+
+
+class BanIndex:
+    # Per-guild ban lookup held in memory: filled once with a paginated fetch,
+    # then kept current from on_member_ban / on_member_unban.
+
+    def __init__(self):
+        self.guilds = {}
+
+    def _guild(self, guild_id):
+        bans = self.guilds.get(guild_id)
+        if bans is None:
+            bans = self.guilds[guild_id] = GuildBans()
+        return bans
+
+    async def ensure_loaded(self, guild):
+        bans = self._guild(guild.id)
+        if bans.loaded:
+            return
+        if bans.loading is None:
+            bans.loading = asyncio.get_running_loop().create_task(self._load(guild, bans))
+        await asyncio.shield(bans.loading)
+
+    async def _load(self, guild, bans):
+        try:
+            async for entry in guild.bans(limit=None):  # Paginated, 1000 per request
+                if entry.user.id not in bans._changed_during_load:
+                    bans.add(entry.user.id, str(entry.user), entry.user.name)
+            for user_id, banned in bans._changed_during_load.items():
+                if not banned:
+                    bans.remove(user_id)
+            bans.loaded = True
+        finally:
+            bans._changed_during_load = {}
+            bans.loading = None
+
+    def on_ban(self, guild_id, user):
+        bans = self._guild(guild_id)
+        if bans.loading:
+            bans._changed_during_load[user.id] = True
+        bans.add(user.id, str(user), user.name)
+
+    def on_unban(self, guild_id, user_id):
+        bans = self._guild(guild_id)
+        if bans.loading:
+            bans._changed_during_load[user_id] = False
+        bans.remove(user_id)
+
+    def find(self, guild_id, query):
+        # Returns (user_id, tag) or None
+        bans = self._guild(guild_id)
+        query = query.strip()
+        if query.isdigit():
+            user_id = int(query)
+        else:
+            user_id = bans.by_name.get(query.lower())
+        if user_id is None or user_id not in bans.by_id:
+            return None
+        return user_id, bans.by_id[user_id][0]
+
+    def is_loaded(self, guild_id):
+        return self._guild(guild_id).loaded
+
+
+ban_index = BanIndex()
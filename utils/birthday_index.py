@@ -0,0 +1,49 @@
+class BirthdayIndex:
+    # Birthdays bucketed by "MM-DD" so the daily reminder is one dict lookup,
+    # plus a calendar-sorted view for the list command that is only rebuilt after a change.
+
+    def __init__(self, birthdays=None):
+        self.reset(birthdays)
+
+    def reset(self, birthdays=None):
+        self.by_day = {}  # "MM-DD" -> set of user ID strings
+        self.dates = {}   # user ID string -> "YYYY-MM-DD"
+        self._sorted = None
+        for uid, date in (birthdays or {}).items():
+            self.set(uid, date)
+
+    def set(self, uid, date):
+        self.remove(uid)
+        self.dates[uid] = date
+        self.by_day.setdefault(date[5:], set()).add(uid)
+        self._sorted = None
+
+    def remove(self, uid):
+        date = self.dates.pop(uid, None)
+        if date is None:
+            return
+        bucket = self.by_day.get(date[5:])
+        if bucket:
+            bucket.discard(uid)
+            if not bucket:
+                del self.by_day[date[5:]]
+        self._sorted = None
+
+    def on_day(self, day):
+        # day is a date; Feb 29 birthdays are celebrated on Feb 28 in non-leap years
+        uids = set(self.by_day.get(day.strftime("%m-%d"), ()))
+        if day.month == 2 and day.day == 28 and not _is_leap(day.year):
+            uids |= self.by_day.get("02-29", set())
+        return uids
+
+    def sorted_entries(self):
+        if self._sorted is None:
+            self._sorted = sorted(self.dates.items(), key=lambda item: (item[1][5:], item[0]))
+        return self._sorted
+
+    def __len__(self):
+        return len(self.dates)
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
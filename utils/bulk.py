@@ -0,0 +1,70 @@
+import asyncio
+import time
+from collections import Counter
+
+from config import BULK_CONCURRENCY, BULK_PER_ROUTE, BULK_PROGRESS_INTERVAL
+
+
+class BulkResult:
+    def __init__(self, total):
+        self.total = total
+        self.succeeded = 0
+        self.failed = []  # (item, exception)
+
+    @property
+    def done(self):
+        return self.succeeded + len(self.failed)
+
+    def summary(self):
+        text = f"✅ **{self.succeeded}** succeeded"
+        if self.failed:
+            reasons = Counter(type(error).__name__ for _, error in self.failed)
+            text += f", ❌ **{len(self.failed)}** failed (" + ", ".join(f"{name} ×{n}" for name, n in reasons.most_common()) + ")"
+        return text
+
+
+async def run_bulk(items, action, concurrency=BULK_CONCURRENCY, route_key=None, per_route=BULK_PER_ROUTE,
+                   on_progress=None, progress_interval=BULK_PROGRESS_INTERVAL):
+    # Runs `await action(item)` for every item with bounded concurrency.
+    #
+    # discord.py already serialises requests per rate-limit bucket and sleeps on 429s;
+    # `route_key(item)` additionally caps how many calls wait on the same bucket at
+    # once, so one hot route cannot hold every worker slot.
+    items = list(items)
+    result = BulkResult(len(items))
+    overall = asyncio.Semaphore(concurrency)
+    routes = {}
+    last_report = time.monotonic()
+    report_lock = asyncio.Lock()
+
+    async def report(force=False):
+        nonlocal last_report
+        if not on_progress:
+            return
+        now = time.monotonic()
+        if not force and now - last_report < progress_interval:
+            return
+        last_report = now
+        async with report_lock:
+            try:
+                await on_progress(result)
+            except Exception:
+                pass  # Progress is cosmetic; never fail the batch over it
+
+    async def worker(item):
+        key = route_key(item) if route_key else None
+        route = routes.get(key)
+        if route is None:
+            route = routes[key] = asyncio.Semaphore(per_route)
+
+        async with route, overall:
+            try:
+                await action(item)
+                result.succeeded += 1
+            except Exception as error:
+                result.failed.append((item, error))
+        await report()
+
+    await asyncio.gather(*(worker(item) for item in items))
+    await report(force=True)
+    return result
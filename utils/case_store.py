@@ -0,0 +1,196 @@
+import asyncio
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import CASE_DB_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id     INTEGER NOT NULL,
+    user_id      INTEGER NOT NULL,
+    moderator_id INTEGER NOT NULL,
+    moderator    TEXT    NOT NULL,
+    action       TEXT    NOT NULL,
+    reason       TEXT,
+    created_at   REAL    NOT NULL,
+    extra        TEXT,
+    dm_status    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_user ON cases (guild_id, user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_moderator ON cases (guild_id, moderator_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_cases_created_at ON cases (created_at);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Columns added after the first release: (name, definition), applied with ALTER TABLE when missing
+MIGRATIONS = (
+    ("dm_status", "TEXT"),  # sent / closed / failed, filled in by the DM dispatcher
+)
+
+ACTIONS = ("warn", "ban", "tempban", "softban", "hardban", "kick", "jail", "mute", "note")
+
+
+class CaseStore:
+    # All SQLite work happens on one dedicated thread that owns the connection,
+    # so the event loop never blocks on disk and no connection is shared across threads.
+
+    def __init__(self, path):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="case-store")
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._migrate(self._conn)
+        return self._conn
+
+    def _migrate(self, db):
+        columns = {row["name"] for row in db.execute("PRAGMA table_info(cases)")}
+        with db:
+            for name, definition in MIGRATIONS:
+                if name not in columns:
+                    db.execute(f"ALTER TABLE cases ADD COLUMN {name} {definition}")
+            if not db.execute("SELECT 1 FROM meta WHERE key = 'enabled_at'").fetchone():
+                # From here on warnings and notes are recorded as cases as they happen, so the JSON
+                # import only takes older entries. Databases from before this key use their first case.
+                first = db.execute(
+                    "SELECT MIN(created_at) FROM cases WHERE extra IS NULL OR extra NOT LIKE '%\"imported\"%'"
+                ).fetchone()[0]
+                db.execute("INSERT INTO meta (key, value) VALUES ('enabled_at', ?)", (str(first or time.time()),))
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # ---------- Writes ----------
+
+    def _add_case(self, guild_id, user_id, moderator_id, moderator, action, reason, created_at, extra):
+        db = self._db()
+        with db:
+            cur = db.execute(
+                "INSERT INTO cases (guild_id, user_id, moderator_id, moderator, action, reason, created_at, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (guild_id, user_id, moderator_id, moderator, action, reason, created_at,
+                 json.dumps(extra) if extra else None)
+            )
+        return cur.lastrowid
+
+    async def add_case(self, guild_id, user_id, moderator_id, moderator, action, reason=None, created_at=None, extra=None):
+        return await self._run(
+            self._add_case, guild_id, user_id, moderator_id, moderator, action, reason,
+            created_at or time.time(), extra
+        )
+
+    def _set_dm_status(self, case_id, status):
+        db = self._db()
+        with db:
+            db.execute("UPDATE cases SET dm_status = ? WHERE id = ?", (status, case_id))
+
+    async def set_dm_status(self, case_id, status):
+        await self._run(self._set_dm_status, case_id, status)
+
+    # ---------- Reads ----------
+
+    @staticmethod
+    def _user_filter(guild_id, user_id, actions, since):
+        sql = "WHERE guild_id = ? AND user_id = ?"
+        params = [guild_id, user_id]
+        if actions:
+            sql += f" AND action IN ({', '.join('?' * len(actions))})"
+            params.extend(actions)
+        if since:
+            sql += " AND created_at >= ?"
+            params.append(since)
+        return sql, params
+
+    def _cases_for_user(self, guild_id, user_id, actions, since, limit, offset):
+        where, params = self._user_filter(guild_id, user_id, actions, since)
+        sql = f"SELECT * FROM cases {where} ORDER BY created_at, id"
+        if limit is not None:
+            # One page for the paginated lists; the (guild_id, user_id, created_at) index keeps it short
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [dict(row) for row in self._db().execute(sql, params)]
+
+    async def cases_for_user(self, guild_id, user_id, actions=None, since=None, limit=None, offset=0):
+        return await self._run(self._cases_for_user, guild_id, user_id, actions, since, limit, offset)
+
+    def _count_cases(self, guild_id, user_id, actions, since):
+        where, params = self._user_filter(guild_id, user_id, actions, since)
+        return self._db().execute(f"SELECT COUNT(*) FROM cases {where}", params).fetchone()[0]
+
+    async def count_cases(self, guild_id, user_id, actions=None, since=None):
+        return await self._run(self._count_cases, guild_id, user_id, actions, since)
+
+    def _moderator_stats(self, guild_id, moderator_id, since):
+        sql = "SELECT action, COUNT(*) AS total FROM cases WHERE guild_id = ? AND moderator_id = ?"
+        params = [guild_id, moderator_id]
+        if since:
+            sql += " AND created_at >= ?"
+            params.append(since)
+        sql += " GROUP BY action"
+        return {row["action"]: row["total"] for row in self._db().execute(sql, params)}
+
+    async def moderator_stats(self, guild_id, moderator_id, since=None):
+        return await self._run(self._moderator_stats, guild_id, moderator_id, since)
+
+    # ---------- JSON import ----------
+
+    def _import_json(self, guild_id, warnings, notes, moderator_ids):
+        db = self._db()
+        # One import ever: the JSON files aren't per server (older versions marked json_import:<guild>)
+        if db.execute("SELECT 1 FROM meta WHERE key = 'json_import' OR key LIKE 'json_import:%'").fetchone():
+            return None
+        enabled_at = float(db.execute("SELECT value FROM meta WHERE key = 'enabled_at'").fetchone()[0])
+
+        rows = []
+        for action, data, text_key in (("warn", warnings, "reason"), ("note", notes, "content")):
+            for user_id, entries in data.items():
+                for entry in entries:
+                    if entry.get("timestamp", 0) >= int(enabled_at):  # JSON timestamps are whole seconds
+                        continue  # Written since the store was enabled, so it's a case already
+                    moderator = entry.get("moderator", "Unknown")
+                    rows.append((
+                        guild_id, int(user_id), moderator_ids.get(moderator, 0), moderator, action,
+                        entry.get(text_key), entry.get("timestamp", 0), json.dumps({"imported": True})
+                    ))
+
+        with db:
+            db.executemany(
+                "INSERT INTO cases (guild_id, user_id, moderator_id, moderator, action, reason, created_at, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            db.execute("INSERT INTO meta (key, value) VALUES ('json_import', ?)", (str(guild_id),))
+        return len(rows)
+
+    async def import_json(self, guild_id, warnings, notes, resolve_moderator=lambda name: 0):
+        # One-shot for the whole store: returns the number of imported cases, or None if it ran before
+        warnings = {uid: list(entries) for uid, entries in warnings.items()}
+        notes = {uid: list(entries) for uid, entries in notes.items()}
+        names = {entry.get("moderator", "Unknown") for data in (warnings, notes) for entries in data.values() for entry in entries}
+        moderator_ids = {name: resolve_moderator(name) for name in names}
+        return await self._run(self._import_json, guild_id, warnings, notes, moderator_ids)
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def close(self):
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+
+case_store = CaseStore(CASE_DB_PATH) if CASE_DB_PATH else None
@@ -1,23 +1,46 @@
 from discord.ext import commands
-from config import STAFF_ROLE_ID, PIC_PERM_ROLE_ID, LINK_PERM_ROLE_ID
+from config import BOT_OPERATORS
+from utils.permissions import permission_cache, CAPABILITIES, STAFF, PIC, LINK
+
+def _has_capability(ctx, capability):
+    if ctx.guild is None:
+        return False
+    return permission_cache.has(ctx.author, capability)
+
+def has_capability(name):
+    capability = CAPABILITIES[name]
+    async def predicate(ctx):
+        if _has_capability(ctx, capability):
+            return True
+        raise commands.MissingPermissions([f"{name.title()} Capability"])
+    return commands.check(predicate)
 
 def is_staff():
     async def predicate(ctx):
-        if any(role.id == STAFF_ROLE_ID for role in ctx.author.roles):
+        if _has_capability(ctx, STAFF):
             return True
         raise commands.MissingPermissions(["Staff Role"])
     return commands.check(predicate)
 
+def is_operator():
+    # For commands that act on the whole bot rather than one server; per-server staff
+    # can be granted by any server's admins, so it never counts here
+    async def predicate(ctx):
+        if ctx.author.id in BOT_OPERATORS or await ctx.bot.is_owner(ctx.author):
+            return True
+        raise commands.MissingPermissions(["Bot Operator"])
+    return commands.check(predicate)
+
 def has_pic_perm():
     async def predicate(ctx):
-        if any(role.id == PIC_PERM_ROLE_ID for role in ctx.author.roles):
+        if _has_capability(ctx, PIC):
             return True
         raise commands.MissingPermissions(["Pic Perm Role"])
     return commands.check(predicate)
 
 def has_link_perm():
     async def predicate(ctx):
-        if any(role.id == LINK_PERM_ROLE_ID for role in ctx.author.roles):
+        if _has_capability(ctx, LINK):
             return True
         raise commands.MissingPermissions(["Link Perm Role"])
     return commands.check(predicate)
@@ -0,0 +1,61 @@
+from config import SHARD_COUNT, SHARD_IDS
+
+
+def parse_shard_ids(text):
+    # "0-3,8" -> [0, 1, 2, 3, 8]
+    ids = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        ids.update(range(int(start), int(end or start) + 1))
+    return sorted(ids)
+
+
+def format_shard_ids(ids):
+    # [0, 1, 2, 3, 8] -> "0-3,8"
+    ranges = []
+    for shard_id in sorted(ids):
+        if ranges and ranges[-1][1] == shard_id - 1:
+            ranges[-1][1] = shard_id
+        else:
+            ranges.append([shard_id, shard_id])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def split_shards(shard_count, processes):
+    # Contiguous shard ranges, as even as possible, one per process
+    processes = max(1, min(processes, shard_count))
+    size, extra = divmod(shard_count, processes)
+    ranges, start = [], 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def shard_of(guild_id, shard_count):
+    # Discord's routing formula: which shard receives a guild's events
+    return (guild_id >> 22) % shard_count
+
+
+def sharding_options():
+    # Extra keyword arguments for AutoShardedBot; empty when sharding is off
+    if not SHARD_COUNT:
+        return {}
+    options = {}
+    if SHARD_COUNT != "auto":
+        options["shard_count"] = int(SHARD_COUNT)
+        if SHARD_IDS:
+            options["shard_ids"] = parse_shard_ids(SHARD_IDS)
+    return options
+
+
+def owns_guild(bot, guild_id):
+    # Whether this process runs the shard a guild lives on; shared timers only fire in that process
+    shard_ids = getattr(bot, "shard_ids", None)
+    if not bot.shard_count or shard_ids is None:
+        return True
+    return shard_of(guild_id, bot.shard_count) in shard_ids
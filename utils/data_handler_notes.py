@@ -1,22 +1,56 @@
 import os
-import json
+
+from utils.shared_store import open_store
+from utils.reloader import file_watcher
 
 DATA_FOLDER = "data"
 NOTES_FILE = os.path.join(DATA_FOLDER, "notes.json")
 
-def ensure_note_file():
-    if not os.path.exists(DATA_FOLDER):
-        os.makedirs(DATA_FOLDER)
-    if not os.path.isfile(NOTES_FILE):
-        with open(NOTES_FILE, "w") as f:
-            json.dump({}, f)
+_store = None
+
+def _notes_store():
+    global _store
+    if _store is None:
+        _store = open_store(NOTES_FILE, "notes")
+        file_watcher.watch(_store.path, _store.reload_if_changed, key="notes")
+    return _store
 
 def load_notes():
-    ensure_note_file()
-    with open(NOTES_FILE, "r") as f:
-        return json.load(f)
+    # Returns the live store; it reads like a dict of "guild_id:user_id" -> list of notes.
+    # Entries from before servers were told apart are keyed by user ID alone and belong to the home server.
+    return _notes_store()
 
 def save_notes(data):
-    ensure_note_file()
-    with open(NOTES_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    store = _notes_store()
+    if data is not store:
+        store.replace(data)
+
+def _key(guild_id, user_id):
+    return f"{guild_id}:{user_id}"
+
+def add_note(guild_id, user_id, entry):
+    _notes_store().append(_key(guild_id, user_id), entry)
+
+def notes_for(guild_id, user_id, legacy=False):
+    # legacy: also the user-ID-only entries; pass it only in the home server
+    store = _notes_store()
+    return (store.get(str(user_id), []) if legacy else []) + store.get(_key(guild_id, user_id), [])
+
+def guild_notes(guild_id, legacy=False):
+    # user ID -> notes in the server
+    prefix, data = f"{guild_id}:", {}
+    for key, entries in _notes_store().items():
+        if key.startswith(prefix):
+            user_id = key[len(prefix):]
+        elif legacy and ":" not in key:
+            user_id = key
+        else:
+            continue
+        data[user_id] = data.get(user_id, []) + list(entries)
+    return data
+
+def clear_notes(guild_id, user_id, legacy=False):
+    store = _notes_store()
+    store.delete(_key(guild_id, user_id))
+    if legacy:
+        store.delete(str(user_id))
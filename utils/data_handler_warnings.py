@@ -1,14 +1,56 @@
-import json
 import os
 
-DATA_FILE = "data/warnings.json"
+from utils.shared_store import open_store
+from utils.reloader import file_watcher
+
+DATA_FOLDER = "data"
+WARNINGS_FILE = os.path.join(DATA_FOLDER, "warnings.json")
+
+_store = None
+
+def _warnings_store():
+    global _store
+    if _store is None:
+        _store = open_store(WARNINGS_FILE, "warnings")
+        file_watcher.watch(_store.path, _store.reload_if_changed, key="warnings")
+    return _store
 
 def load_warnings():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    # Returns the live store; it reads like a dict of "guild_id:user_id" -> list of warnings.
+    # Entries from before servers were told apart are keyed by user ID alone and belong to the home server.
+    return _warnings_store()
 
 def save_warnings(data):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    store = _warnings_store()
+    if data is not store:
+        store.replace(data)
+
+def _key(guild_id, user_id):
+    return f"{guild_id}:{user_id}"
+
+def add_warning(guild_id, user_id, entry):
+    _warnings_store().append(_key(guild_id, user_id), entry)
+
+def warnings_for(guild_id, user_id, legacy=False):
+    # legacy: also the user-ID-only entries; pass it only in the home server
+    store = _warnings_store()
+    return (store.get(str(user_id), []) if legacy else []) + store.get(_key(guild_id, user_id), [])
+
+def guild_warnings(guild_id, legacy=False):
+    # user ID -> warnings in the server
+    prefix, data = f"{guild_id}:", {}
+    for key, entries in _warnings_store().items():
+        if key.startswith(prefix):
+            user_id = key[len(prefix):]
+        elif legacy and ":" not in key:
+            user_id = key
+        else:
+            continue
+        data[user_id] = data.get(user_id, []) + list(entries)
+    return data
+
+def clear_warnings(guild_id, user_id, legacy=False):
+    store = _warnings_store()
+    store.delete(_key(guild_id, user_id))
+    if legacy:
+        store.delete(str(user_id))
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+
+import discord
+from utils.case_store import case_store
+from config import (
+    DM_WORKERS, DM_CHANNEL_CACHE, DM_CLOSED_TTL, DM_RETRIES, DM_RETRY_BASE
+)
+
+SENT, CLOSED, FAILED = "sent", "closed", "failed"
+
+
+class DMJob:
+    def __init__(self, user_id, content, embed):
+        self.user_id = user_id
+        self.content = content
+        self.embed = embed
+        self.status = None
+        self.case_id = None
+        self.done = asyncio.Event()
+
+    async def wait(self, timeout=None):
+        # Status once delivered, or None if it's still queued after timeout
+        try:
+            await asyncio.wait_for(self.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.status
+
+    def attach_case(self, case_id):
+        # The status is written to the case when known, now or after delivery
+        if case_id is None:
+            return
+        self.case_id = case_id
+        if self.done.is_set():
+            _record_status(case_id, self.status)
+
+
+def _record_status(case_id, status):
+    if case_store and case_id is not None:
+        asyncio.get_running_loop().create_task(case_store.set_dm_status(case_id, status))
+
+
+class DMDispatcher:
+    # Moderation DMs go through a queue drained by a few workers, so commands
+    # never wait on create-DM + send round trips. DM channel IDs are cached per
+    # user, and users whose DMs are closed are skipped for DM_CLOSED_TTL seconds.
+
+    def __init__(self, workers=DM_WORKERS, channel_cache=DM_CHANNEL_CACHE, closed_ttl=DM_CLOSED_TTL,
+                 retries=DM_RETRIES, retry_base=DM_RETRY_BASE):
+        self.workers = workers
+        self.channel_cache = channel_cache
+        self.closed_ttl = closed_ttl
+        self.retries = retries
+        self.retry_base = retry_base
+
+        self.bot = None
+        self._queue = None
+        self._tasks = []
+        self._channels = OrderedDict()  # user ID -> DM channel ID, least recently used first
+        self._closed = {}               # user ID -> time their closed-DM mark expires
+        self.counters = {SENT: 0, CLOSED: 0, FAILED: 0, "cached_closed": 0, "retries": 0}
+
+    def start(self, bot):
+        self.bot = bot
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._tasks = [task for task in self._tasks if not task.done()]
+        loop = asyncio.get_running_loop()
+        while len(self._tasks) < self.workers:
+            self._tasks.append(loop.create_task(self._run()))
+
+    def send(self, bot, user, content=None, embed=None):
+        # Never awaits; the returned job can be awaited for its status if needed
+        self.start(bot)
+        job = DMJob(user.id, content, embed)
+        if self._closed.get(user.id, 0) > time.monotonic():
+            self.counters["cached_closed"] += 1
+            self._finish(job, CLOSED)
+            return job
+        self._closed.pop(user.id, None)
+        if len(self._closed) > self.channel_cache:
+            now = time.monotonic()
+            self._closed = {uid: until for uid, until in self._closed.items() if until > now}
+        self._queue.put_nowait(job)
+        return job
+
+    def _finish(self, job, status):
+        job.status = status
+        job.done.set()
+        if job.case_id is not None:
+            _record_status(job.case_id, status)
+
+    async def _run(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                status = await self._deliver(job)
+            except Exception:
+                logging.exception(f"❌ DM to {job.user_id} failed")
+                status = FAILED
+            self.counters[status] += 1
+            self._finish(job, status)
+            self._queue.task_done()
+
+    async def _channel_id(self, user_id):
+        channel_id = self._channels.get(user_id)
+        if channel_id is not None:
+            self._channels.move_to_end(user_id)
+            return channel_id
+        user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+        channel = user.dm_channel or await user.create_dm()
+        self._channels[user_id] = channel.id
+        if len(self._channels) > self.channel_cache:
+            self._channels.popitem(last=False)
+        return channel.id
+
+    async def _deliver(self, job):
+        for attempt in range(self.retries + 1):
+            try:
+                channel_id = await self._channel_id(job.user_id)
+                channel = self.bot.get_partial_messageable(channel_id, type=discord.ChannelType.private)
+                await channel.send(content=job.content, embed=job.embed)
+                return SENT
+            except discord.Forbidden:
+                self._closed[job.user_id] = time.monotonic() + self.closed_ttl
+                return CLOSED
+            except discord.NotFound:
+                self._channels.pop(job.user_id, None)  # Stale channel or deleted user
+                if attempt:
+                    return FAILED
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    return FAILED
+            if attempt < self.retries:
+                self.counters["retries"] += 1
+                # Full jitter keeps a burst of failed sends from retrying in lockstep
+                await asyncio.sleep(random.uniform(0, self.retry_base * 2 ** attempt))
+        return FAILED
+
+    async def stop(self, timeout=5.0):
+        if self._queue is not None and self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+dm_dispatcher = DMDispatcher()
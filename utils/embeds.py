@@ -1,30 +1,97 @@
 import discord
+from string import Formatter
+from types import MappingProxyType
 
-def create_error_embed(title: str, reason: str, usage: str, example: str) -> discord.Embed:
-    embed = discord.Embed(
-        title=title,
-        description=f"❌ **Reason:** {reason}",
-        color=discord.Color.red()
-    )
-    embed.add_field(name="📘 Usage", value=usage, inline=False)
-    embed.add_field(name="💡 Example", value=example, inline=False)
-    embed.set_footer(text="Command failed")
+class EmbedTemplate:
+    # An embed payload compiled once and frozen. render() fills the "{name}"
+    # placeholders in the parts that have any (found once, here) and builds the
+    # Embed through its public constructor and setters.
+
+    def __init__(self, title=None, description=None, color=None, footer=None, fields=()):
+        data = {"type": "rich", "title": title, "description": description}
+        if color is not None:
+            data["color"] = color.value if isinstance(color, discord.Color) else color
+        if footer is not None:
+            data["footer"] = MappingProxyType({"text": footer})
+        data["fields"] = tuple(
+            MappingProxyType({"name": name, "value": value, "inline": inline}) for name, value, inline in fields
+        )
+        self.data = MappingProxyType(data)
+
+        self._colour = discord.Colour(data["color"]) if color is not None else None
+        self._title = (title, _has_placeholders(title))
+        self._description = (description, _has_placeholders(description))
+        self._footer = (footer, _has_placeholders(footer))
+        self._fields = tuple(
+            (name, _has_placeholders(name), value, _has_placeholders(value), inline) for name, value, inline in fields
+        )
+
+    def render(self, **values) -> discord.Embed:
+        text, dynamic = self._title
+        title = text.format_map(values) if dynamic else text
+        text, dynamic = self._description
+        description = text.format_map(values) if dynamic else text
+        embed = discord.Embed(title=title, description=description, colour=self._colour)
+        text, dynamic = self._footer
+        if text is not None:
+            embed.set_footer(text=text.format_map(values) if dynamic else text)
+        for name, dynamic_name, value, dynamic_value, inline in self._fields:
+            embed.add_field(
+                name=name.format_map(values) if dynamic_name else name,
+                value=value.format_map(values) if dynamic_value else value,
+                inline=inline
+            )
+        return embed
+
+def _has_placeholders(text):
+    return isinstance(text, str) and any(field is not None for _, field, _, _ in Formatter().parse(text))
+
+TEMPLATES = MappingProxyType({
+    "embed": EmbedTemplate(title="{title}", description="{description}", footer="Requested by {author}"),
+    "error": EmbedTemplate(
+        title="{title}",
+        description="❌ **Reason:** {reason}",
+        color=discord.Color.red(),
+        footer="Command failed",
+        fields=(("📘 Usage", "{usage}", False), ("💡 Example", "{example}", False))
+    ),
+    "success": EmbedTemplate(title="{title}", description="✅ {message}", color=discord.Color.green(), footer="Command successful"),
+    "info": EmbedTemplate(title="{title}", description="{message}", color=discord.Color.blurple(), footer="Info"),
+})
+
+# Shortcut reminders, shown as a field on the command's own response when the long name was used
+TIPS = MappingProxyType({
+    "warn": "You can use `,w` instead of `,warn` to save time!",
+    "ban": "Next time you can use `,b` instead of `,ban` to save time!",
+    "tempban": "Use `,tb` instead of `,tempban` next time!",
+    "kick": "You can use `,k` instead of `,kick` next time!",
+    "jail": "You can use `,j` instead of `,jail` to save time!",
+    "stripstaff": "Next time, you can use `,ss` instead of `,stripstaff`!",
+    "lockdown": "Use `,ld` instead of `,lockdown` next time!",
+    "unlock": "You can use `,ul` instead of `,unlock` next time!",
+    "modstats": "You can use `,ms` instead of `,modstats` to save time!",
+    "remind": "Next time you can use `,rm` instead of `,remind`!",
+    "unjail": "Next time you can use `,uj` instead of `,unjail`!",
+    "unmute": "Use `,um` instead of `,unmute` next time!",
+    "mute": "Use `,m` instead of `,mute` next time!",
+})
+
+def add_tip(embed: discord.Embed, ctx) -> discord.Embed:
+    tip = TIPS.get(ctx.invoked_with)
+    if tip:
+        embed.add_field(name="💡 Quick Tip", value=tip, inline=False)
     return embed
 
-def create_success_embed(title: str, message: str) -> discord.Embed:
-    embed = discord.Embed(
-        title=title,
-        description=f"✅ {message}",
-        color=discord.Color.green()
-    )
-    embed.set_footer(text="Command successful")
+def create_embed(ctx, title: str, description: str, color: discord.Color = discord.Color.blurple()) -> discord.Embed:
+    embed = TEMPLATES["embed"].render(title=title, description=description, author=ctx.author)
+    embed.colour = color
     return embed
 
+def create_error_embed(title: str, reason: str, usage: str, example: str) -> discord.Embed:
+    return TEMPLATES["error"].render(title=title, reason=reason, usage=usage, example=example)
+
+def create_success_embed(title: str, message: str) -> discord.Embed:
+    return TEMPLATES["success"].render(title=title, message=message)
+
 def create_info_embed(title: str, message: str) -> discord.Embed:
-    embed = discord.Embed(
-        title=title,
-        description=message,
-        color=discord.Color.blurple()
-    )
-    embed.set_footer(text="Info")
-    return embed
+    return TEMPLATES["info"].render(title=title, message=message)
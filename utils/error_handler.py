@@ -1,4 +1,6 @@
 import discord
+import logging
+import traceback
 from discord.ext import commands
 from utils.embeds import create_error_embed
 
@@ -17,7 +19,8 @@ async def handle_command_error(ctx: commands.Context, error: commands.CommandErr
             usage=f",{ctx.command.qualified_name} <{error.param.name}>",
             example=f",{ctx.command.qualified_name} example"
         )
-    elif isinstance(error, commands.MissingPermissions):
+    elif isinstance(error, (commands.MissingPermissions, commands.CheckAnyFailure, commands.CheckFailure)):
+        # CheckAnyFailure: none of check_any's options passed (e.g. staff or admin for ,config)
         embed = create_error_embed(
             title="❌ Missing Permissions",
             reason="You don’t have permission to use this command.",
@@ -39,9 +42,10 @@ async def handle_command_error(ctx: commands.Context, error: commands.CommandErr
             example=f",{ctx.command.qualified_name} ..."
         )
         # Log the traceback to console for devs
-        import traceback
-        print("Unhandled Command Error:")
-        traceback.print_exception(type(error), error, error.__traceback__)
+        logging.error(
+            f"❌ Unhandled error in ,{ctx.command}:\n"
+            + "".join(traceback.format_exception(type(error), error, error.__traceback__))
+        )
 
     try:
         await ctx.reply(embed=embed, mention_author=False)
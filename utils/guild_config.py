@@ -0,0 +1,89 @@
+from config import (
+    GUILD_SETTINGS_FILE, HOME_GUILD_ID, LOG_CHANNEL_ID, STAFF_ROLE_ID, PIC_PERM_ROLE_ID, LINK_PERM_ROLE_ID,
+    JAIL_ROLE_ID, DEFAULT_BIRTHDAY_CHANNEL_ID
+)
+from utils.shared_store import open_store
+from utils.reloader import file_watcher
+
+# key -> (kind, default). Defaults are the original single-server IDs from config.py.
+SETTINGS = {
+    "log_channel": ("channel", LOG_CHANNEL_ID),
+    "staff_role": ("role", STAFF_ROLE_ID),
+    "pic_perm_role": ("role", PIC_PERM_ROLE_ID),
+    "link_perm_role": ("role", LINK_PERM_ROLE_ID),
+    "jail_role": ("role", JAIL_ROLE_ID),
+    "birthday_channel": ("channel", DEFAULT_BIRTHDAY_CHANNEL_ID),
+    "birthday_tz_offset": ("number", 0),
+    "capability_roles": ("mapping", {}),  # role ID (str) -> [capability names], edited with ,perms
+}
+DEFAULTS = {key: default for key, (_, default) in SETTINGS.items()}
+
+
+class GuildSettings:
+    # Per-guild overrides persisted in a JournaledStore (or the shared store), read
+    # through an in-memory cache of fully merged settings so every check or log call
+    # is a dict lookup.
+
+    def __init__(self, path=GUILD_SETTINGS_FILE):
+        self.path = path
+        self._store = None
+        self._cache = {}      # guild ID -> merged settings dict
+        self._listeners = []  # callback(guild_id, key) after a change
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = open_store(self.path, "guild_settings")
+            file_watcher.watch(self._store.path, self.reload_if_changed, key="guild_settings")
+        return self._store
+
+    def reload_if_changed(self):
+        if not self.store.reload_if_changed():
+            return False
+        for guild_id in list(self._cache):
+            self.invalidate(guild_id)
+        return True
+
+    def for_guild(self, guild_id):
+        settings = self._cache.get(guild_id)
+        if settings is None:
+            settings = self._cache[guild_id] = {**DEFAULTS, **self.store.get(str(guild_id), {})}
+        return settings
+
+    def get(self, guild_id, key):
+        return self.for_guild(guild_id)[key]
+
+    def overrides(self, guild_id):
+        return self.store.get(str(guild_id), {})
+
+    def set(self, guild_id, key, value):
+        if key not in SETTINGS:
+            raise KeyError(key)
+        self.store.set(str(guild_id), {**self.overrides(guild_id), key: value})
+        self.invalidate(guild_id, key)
+
+    def reset(self, guild_id, key):
+        overrides = dict(self.overrides(guild_id))
+        if overrides.pop(key, None) is None:
+            return
+        self.store.set(str(guild_id), overrides)
+        self.invalidate(guild_id, key)
+
+    def invalidate(self, guild_id, key=None):
+        self._cache.pop(guild_id, None)
+        for callback in self._listeners:
+            callback(guild_id, key)
+
+    def on_change(self, callback):
+        self._listeners.append(callback)
+
+
+guild_settings = GuildSettings()
+
+
+def home_guild_id(bot):
+    # The original server; None until its log channel is cached (or if the bot left it)
+    if HOME_GUILD_ID:
+        return HOME_GUILD_ID
+    channel = bot.get_channel(LOG_CHANNEL_ID)
+    return channel.guild.id if channel else None
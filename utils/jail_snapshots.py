@@ -0,0 +1,70 @@
+import base64
+import sys
+from array import array
+
+from config import JAIL_SNAPSHOTS_FILE
+from utils.shared_store import open_store
+from utils.reloader import file_watcher
+
+
+def pack(role_ids):
+    # Role IDs as little-endian uint64s, base64'd so they fit a JSON store: 8 bytes per role
+    packed = array("Q", role_ids)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+def unpack(blob):
+    packed = array("Q")
+    packed.frombytes(base64.b64decode(blob))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed
+
+
+class JailSnapshots:
+    # The roles a member had before they were jailed, one packed entry per
+    # (guild, member), written when the jail happens and read back by the unjail
+    # timer, ,unjail and ,massunjail. Only IDs are kept; roles deleted in the
+    # meantime are skipped on restore.
+
+    def __init__(self, path=JAIL_SNAPSHOTS_FILE):
+        self.path = path
+        self._store = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = open_store(self.path, "jail_snapshots")  # "guild_id:member_id" -> packed role IDs
+            file_watcher.watch(self._store.path, self._store.reload_if_changed, key="jail_snapshots")
+        return self._store
+
+    @staticmethod
+    def _key(guild_id, member_id):
+        return f"{guild_id}:{member_id}"
+
+    def save(self, guild_id, member_id, role_ids):
+        self.store.set(self._key(guild_id, member_id), pack(role_ids))
+
+    def get(self, guild_id, member_id):
+        # array('Q') of role IDs, or None when there's no snapshot
+        blob = self.store.get(self._key(guild_id, member_id))
+        return None if blob is None else unpack(blob)
+
+    def __contains__(self, key):
+        return self._key(*key) in self.store
+
+    def discard(self, guild_id, member_id):
+        self.store.delete(self._key(guild_id, member_id))
+
+    def members(self, guild_id):
+        # IDs of everyone in the guild with a snapshot
+        prefix = f"{guild_id}:"
+        return [int(key[len(prefix):]) for key in self.store.keys() if key.startswith(prefix)]
+
+    def stats(self):
+        return {"snapshots": len(self.store)}
+
+
+jail_snapshots = JailSnapshots()
@@ -1,26 +1,237 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+
 import discord
-from config import LOG_CHANNEL_ID
+from utils.guild_config import guild_settings
+from utils.persistence import persistence
+from config import LOG_QUEUE_SIZE, LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL, LOG_OVERFLOW, LOG_SPILL_FILE
+
+EMBEDS_TOTAL_LIMIT = 6000  # Discord rejects a message whose embeds add up to more characters
+
+
+def _take_lines(path, count):
+    # Runs on the persistence thread: removes and returns the first `count` lines of the spill file
+    if not os.path.isfile(path):
+        return []
+    with open(path, "r") as f:
+        lines = f.readlines()
+    if lines[count:]:
+        with open(path, "w") as f:
+            f.writelines(lines[count:])
+    else:
+        os.remove(path)
+    return lines[:count]
+
+
+class LogSink:
+    def __init__(self, max_queue=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL, overflow=LOG_OVERFLOW, spill_path=LOG_SPILL_FILE):
+        self.max_queue = max_queue
+        self.batch_size = min(batch_size, 10)  # Discord allows at most 10 embeds per message
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spill_path = spill_path
+
+        self.bot = None
+        self._queue = None
+        self._worker = None
+        self._pending = {}  # channel_id -> [(embed, enqueued_at)] waiting for a full batch or the deadline
+
+        self.counters = {"enqueued": 0, "sent": 0, "messages": 0, "dropped": 0, "spilled": 0, "failed": 0, "requeued": 0}
+        self.flush_latency = deque(maxlen=256)  # seconds from enqueue to send, per flushed message
+
+    def start(self, bot):
+        self.bot = bot
+        if self._worker and not self._worker.done():
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, bot, channel_id, embed, guild_id):
+        # Never awaits: a full queue goes to disk (or is dropped) instead of blocking the command.
+        # The channel must belong to the server being logged, or one server's logs could land in another's.
+        channel = bot.get_channel(channel_id)
+        if channel is None or getattr(channel, "guild", None) is None or channel.guild.id != guild_id:
+            self.counters["dropped"] += 1
+            return
+        self.start(bot)
+        item = (channel_id, embed, time.monotonic())
+        try:
+            self._queue.put_nowait(item)
+            self.counters["enqueued"] += 1
+        except asyncio.QueueFull:
+            self._overflow(item)
+
+    def _overflow(self, item):
+        if self.overflow != "spill":
+            self.counters["dropped"] += 1
+            return
+        channel_id, embed, _ = item
+        # Appended by the persistence thread, so a burst of overflow is one write
+        persistence.append(self.spill_path, json.dumps({"channel_id": channel_id, "embed": embed.to_dict()}) + "\n")
+        self.counters["spilled"] += 1
+
+    async def _refill_from_spill(self):
+        if self.overflow != "spill" or not (persistence.busy(self.spill_path) or os.path.isfile(self.spill_path)):
+            return
+        # Queued behind any spilled lines still being appended
+        free = self.max_queue - self._queue.qsize()
+        lines = await asyncio.wrap_future(persistence.call(self.spill_path, _take_lines, self.spill_path, free))
+
+        now = time.monotonic()
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn line from a crash mid-write
+            item = (record["channel_id"], discord.Embed.from_dict(record["embed"]), now)
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self._overflow(item)  # Filled up again while the file was read
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        pending = self._pending
+        deadline = None
+        await self._refill_from_spill()  # Left over from the last run
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                channel_id, embed, enqueued_at = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                await self._flush_all(pending)
+                deadline = None
+                await self._refill_from_spill()
+                continue
+
+            # A batch stays in pending until its send is done, so a cancel mid-send doesn't lose it
+            batch = pending.setdefault(channel_id, [])
+            if batch and sum(len(e) for e, _ in batch) + len(embed) > EMBEDS_TOTAL_LIMIT:
+                await self._send(channel_id, batch)  # Full by size before it's full by count
+                batch = pending[channel_id] = []
+            batch.append((embed, enqueued_at))
+            if deadline is None:
+                deadline = loop.time() + self.flush_interval
 
-async def log_command(ctx: discord.ext.commands.Context):
+            if len(batch) >= self.batch_size:
+                await self._send(channel_id, batch)
+                del pending[channel_id]
+                if not pending:
+                    deadline = None
+
+    async def _flush_all(self, pending):
+        while pending:
+            channel_id, batch = next(iter(pending.items()))
+            for chunk in self._pack(batch):
+                await self._send(channel_id, chunk)
+            del pending[channel_id]
+
+    async def _send(self, channel_id, batch):
+        channel = self.bot.get_channel(channel_id) if self.bot else None
+        if not channel:
+            self.counters["dropped"] += len(batch)
+            return  # Channel not found
+
+        try:
+            await channel.send(embeds=[embed for embed, _ in batch])
+        except Exception as e:
+            status = getattr(e, "status", None)
+            if status == 400 and len(batch) > 1:
+                # Rejected as a whole: send the halves, so at most the one bad embed is lost
+                half = len(batch) // 2
+                await self._send(channel_id, batch[:half])
+                await self._send(channel_id, batch[half:])
+                return
+            if (status is None or status >= 500) and self.overflow == "spill":
+                # Discord or the network is having a moment; the spill file is retried once the queue is idle
+                for embed, enqueued_at in batch:
+                    self._overflow((channel_id, embed, enqueued_at))
+                self.counters["requeued"] += len(batch)
+                return
+            self.counters["failed"] += len(batch)
+            logging.warning(f"⚠️ Failed to log {len(batch)} command(s): {e}")
+            return
+
+        now = time.monotonic()
+        self.counters["sent"] += len(batch)
+        self.counters["messages"] += 1
+        self.flush_latency.append(now - min(t for _, t in batch))
+
+    async def stop(self):
+        if not self._worker:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        # Flush whatever is still queued so nothing is lost on shutdown, then make one pass over the
+        # spill file; whatever still can't be sent is spilled again and goes out after the next start
+        await self._drain()
+        await self._refill_from_spill()
+        await self._drain()
+
+    async def _drain(self):
+        pending = self._pending
+        while not self._queue.empty():
+            channel_id, embed, enqueued_at = self._queue.get_nowait()
+            pending.setdefault(channel_id, []).append((embed, enqueued_at))
+        await self._flush_all(pending)
+
+    def _pack(self, batch):
+        # Splits (embed, enqueued_at) pairs into messages within both the count and the size limit
+        chunk, size = [], 0
+        for embed, enqueued_at in batch:
+            if chunk and (len(chunk) >= self.batch_size or size + len(embed) > EMBEDS_TOTAL_LIMIT):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append((embed, enqueued_at))
+            size += len(embed)
+        if chunk:
+            yield chunk
+
+    def stats(self):
+        latencies = sorted(self.flush_latency)
+        return {
+            **self.counters,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "flush_latency_p50": latencies[len(latencies) // 2] if latencies else 0.0,
+            "flush_latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+
+log_sink = LogSink()
+
+
+async def log_command(ctx: discord.ext.commands.Context, action: str = None, details: dict = None):
     if ctx.guild is None:  # Ignore DMs
         return
 
-    log_channel = ctx.bot.get_channel(LOG_CHANNEL_ID)
-    if not log_channel:
-        return  # Channel not found
-
     embed = discord.Embed(
         title="📝 Command Executed",
-        description=f"**Command:** `{ctx.command}`",
+        description=f"**Command:** `{action or ctx.command}`",
         color=discord.Color.blue()
     )
     embed.add_field(name="👤 User", value=f"{ctx.author} (`{ctx.author.id}`)", inline=False)
     embed.add_field(name="💬 Channel", value=f"{ctx.channel.mention}", inline=True)
-    embed.add_field(name="📥 Message", value=f"`{ctx.message.content}`", inline=False)
+    embed.add_field(name="📥 Message", value=f"`{ctx.message.content[:1000]}`", inline=False)  # Field values cap at 1024
+    if details:
+        embed.add_field(name="⚙️ Details", value="\n".join(f"**{k}:** {v}" for k, v in details.items()), inline=False)
     embed.set_footer(text=f"Guild: {ctx.guild.name} | ID: {ctx.guild.id}")
     embed.timestamp = ctx.message.created_at
 
-    try:
-        await log_channel.send(embed=embed)
-    except Exception as e:
-        print(f"⚠️ Failed to log command: {e}")
+    log_channel_id = guild_settings.get(ctx.guild.id, "log_channel")
+    if not log_channel_id:
+        return  # Logging disabled for this server
+
+    # Queued for the background sink; the command never waits on the log channel
+    log_sink.submit(ctx.bot, log_channel_id, embed, ctx.guild.id)
@@ -0,0 +1,116 @@
+import re
+from collections import deque
+
+URL_RE = re.compile(r"(?:https?://|www\.)([a-z0-9.-]+\.[a-z]{2,})", re.IGNORECASE)
+INVITE_RE = re.compile(r"(?:discord(?:app)?\.com/invite|discord\.gg)/[a-z0-9-]+", re.IGNORECASE)
+
+
+class MultiMatcher:
+    # Aho-Corasick automaton over a set of case-insensitive substrings.
+    # A scan walks the text once, so cost is linear in the message length
+    # no matter how many patterns are loaded.
+
+    def __init__(self, patterns):
+        self.patterns = sorted({p.lower() for p in patterns if p})
+        goto = [{}]
+        own = [None]  # pattern ending exactly at this node
+
+        for pattern in self.patterns:
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    own.append(None)
+                node = nxt
+            own[node] = pattern
+
+        fail = [0] * len(goto)
+        hit = list(own)         # any pattern ending here, own or via the fail chain
+        link = [0] * len(goto)  # nearest fail-chain node with its own pattern (for find_all)
+
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[child] = target if target != child else 0
+                if hit[child] is None:
+                    hit[child] = hit[fail[child]]
+                link[child] = fail[child] if own[fail[child]] is not None else link[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._own = own
+        self._hit = hit
+        self._link = link
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def search(self, text):
+        # First pattern found in text, or None
+        goto, fail, hit = self._goto, self._fail, self._hit
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if hit[node] is not None:
+                return hit[node]
+        return None
+
+    def find_all(self, text):
+        goto, fail, own, link = self._goto, self._fail, self._own, self._link
+        found = set()
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            out = node
+            while out:
+                if own[out] is not None:
+                    found.add(own[out])
+                out = link[out]
+        return found
+
+
+def extract_domains(text):
+    domains = [match.group(1).lower().rstrip(".") for match in URL_RE.finditer(text)]
+    if INVITE_RE.search(text):
+        domains.append("discord.gg")
+    return domains
+
+
+def domain_in(domain, domains):
+    # Matches the domain itself or any parent: "cdn.evil.com" is in {"evil.com"}
+    labels = domain.split(".")
+    return any(".".join(labels[i:]) in domains for i in range(len(labels) - 1))
+
+
+class LinkPolicy:
+    # deny: these domains (and subdomains) are always blocked
+    # allow: with allowlist_only, every other domain is blocked too
+    def __init__(self, deny=(), allow=(), allowlist_only=False):
+        self.deny = frozenset(d.lower() for d in deny)
+        self.allow = frozenset(d.lower() for d in allow)
+        self.allowlist_only = allowlist_only
+
+    def __bool__(self):
+        return bool(self.deny) or self.allowlist_only
+
+    def check(self, text):
+        # First offending domain, or None
+        for domain in extract_domains(text):
+            if domain_in(domain, self.allow):
+                continue
+            if self.allowlist_only or domain_in(domain, self.deny):
+                return domain
+        return None
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+import traceback
+from collections import OrderedDict
+
+import discord
+from config import (
+    INTENTS, MEMORY_PROFILE, MEMBER_CACHE_FLAGS, MEMBER_CACHE_SIZE, MEMBER_CACHE_TTL, MEMBER_CACHE_SWEEP,
+    OPTIONAL_INTENTS
+)
+from utils.startup import extension_intents
+
+LEAN = MEMORY_PROFILE == "lean"
+QUERY_LIMIT = 100  # Most user IDs Discord answers in one gateway member request
+
+
+def profile_options(extensions):
+    # Keyword arguments for the Bot that set up the memory profile
+    if not LEAN:
+        return {"intents": INTENTS}
+    intents = discord.Intents(**dict(INTENTS))
+    required = set().union(*(extension_intents(name) for name in extensions))
+    for name in OPTIONAL_INTENTS:
+        setattr(intents, name, name in required)
+    return {
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags(**MEMBER_CACHE_FLAGS),
+        "chunk_guilds_at_startup": False,
+    }
+
+
+class MemberCache:
+    # In the lean profile no server is chunked, so discord.py only holds the members
+    # it has been handed: joins, updates and the ones looked up here. This keeps that
+    # bounded: each cached member is tracked by when it was last used, and a periodic
+    # sweep drops those unused for the TTL and, least recently used first, any past
+    # the size limit. A lookup that misses asks Discord and caches the answer again.
+    #
+    # In the full profile every member is already cached, so lookups never go out
+    # (except get(), which the timers use for members who might not be) and nothing is swept.
+    #
+    # Lookups use public discord.py APIs (get_member, fetch_member, query_members(cache=True)).
+    # discord.py has no public way to drop a cached member, so the sweep pops guild._members;
+    # that's checked against the version pinned in requirements.txt (2.3.2) and must be
+    # re-checked when it's upgraded.
+
+    def __init__(self, enabled=LEAN, max_size=MEMBER_CACHE_SIZE, ttl=MEMBER_CACHE_TTL, interval=MEMBER_CACHE_SWEEP):
+        self.enabled = enabled
+        self.max_size = max_size
+        self.ttl = ttl
+        self.interval = interval
+        self.bot = None
+        self._used = OrderedDict()  # (guild ID, member ID) -> last use (monotonic), least recent first
+        self._task = None
+        self.counters = {"hits": 0, "fetched": 0, "evicted": 0}
+
+    def _touch(self, guild_id, member_id):
+        key = (guild_id, member_id)
+        self._used[key] = time.monotonic()
+        self._used.move_to_end(key)
+
+    async def get(self, guild, user_id):
+        # The member, fetched over REST if it isn't cached (the answer isn't cached); None once they've left
+        member = guild.get_member(user_id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(user_id)
+            except discord.NotFound:
+                return None
+            self.counters["fetched"] += 1
+            return member
+        self.counters["hits"] += 1
+        if self.enabled:
+            self._touch(guild.id, user_id)
+        return member
+
+    def _ratelimited(self, guild):
+        # Per shard under AutoShardedBot, the one connection otherwise
+        shard = self.bot.get_shard(guild.shard_id) if hasattr(self.bot, "get_shard") else None
+        return shard.is_ws_ratelimited() if shard else self.bot.is_ws_ratelimited()
+
+    async def resolve(self, guild, user_ids):
+        # {user ID: Member} for those still in the server; misses go out as gateway member requests of up to 100 IDs
+        found, missing = {}, []
+        for user_id in user_ids:
+            member = guild.get_member(user_id)
+            if member is not None:
+                found[user_id] = member
+            else:
+                missing.append(user_id)
+        self.counters["hits"] += len(found)
+
+        if self.enabled and missing and self._ratelimited(guild):
+            # Gateway sends are capped at 120 a minute; like discord.py's MemberConverter, use REST meanwhile
+            members = await asyncio.gather(*(self.get(guild, user_id) for user_id in missing))
+            found.update((member.id, member) for member in members if member is not None)
+            missing = []
+        if self.enabled and missing:
+            for i in range(0, len(missing), QUERY_LIMIT):
+                try:
+                    members = await guild.query_members(user_ids=missing[i:i + QUERY_LIMIT], limit=QUERY_LIMIT, cache=True)
+                except asyncio.TimeoutError:
+                    logging.warning(f"⚠️ Member lookup timed out in {guild.name}")
+                    continue
+                self.counters["fetched"] += len(members)
+                found.update((member.id, member) for member in members)
+        if self.enabled:
+            for user_id in found:
+                self._touch(guild.id, user_id)
+        return found
+
+    async def everyone(self, guild):
+        # Every member of the server, for commands that select by role or join date; the lean
+        # profile chunks the server first, and the sweep trims what that cached once it goes unused
+        if self.enabled and not guild.chunked:
+            await guild.chunk(cache=True)
+        return guild.members
+
+    def sweep(self):
+        # Tracks members discord.py cached since the last sweep, then evicts; returns how many went
+        if self.bot is None or not self.enabled:
+            return 0
+        now = time.monotonic()
+        for guild in self.bot.guilds:
+            for member in guild.members:
+                if (guild.id, member.id) not in self._used:
+                    self._used[(guild.id, member.id)] = now
+
+        evicted = 0
+        while self._used:
+            (guild_id, member_id), used = next(iter(self._used.items()))
+            if used > now - self.ttl and len(self._used) <= self.max_size:
+                break
+            del self._used[(guild_id, member_id)]
+            guild = self.bot.get_guild(guild_id)
+            if guild is None or member_id == self.bot.user.id:
+                continue  # The bot's own member backs guild.me and is never evicted
+            if guild._members.pop(member_id, None) is not None:  # No public API; see the note above
+                evicted += 1
+        self.counters["evicted"] += evicted
+        return evicted
+
+    def stats(self):
+        return {**self.counters, "tracked": len(self._used)}
+
+    def start(self, bot):
+        self.bot = bot
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.sweep()
+            except Exception:
+                logging.error(f"❌ Member cache sweep failed:\n{traceback.format_exc()}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+member_cache = MemberCache()
@@ -0,0 +1,200 @@
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import aiohttp
+from aiohttp import web
+
+from config import METRICS_BUCKETS
+
+_command = ContextVar("metrics_command", default=None)  # [name, REST calls] for the command running in this task
+_request = ContextVar("metrics_request", default=None)  # [route, seconds on the wire] for the REST call in progress
+
+
+class Histogram:
+    # Fixed buckets in the Prometheus layout; quantiles are estimated by
+    # interpolating inside the bucket the rank falls in.
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=METRICS_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                if i == len(self.bounds):
+                    return lower  # Past the last bound there is nothing to interpolate towards
+                return lower + (self.bounds[i] - lower) * (rank - seen) / n
+            seen += n
+        return 0.0
+
+    def cumulative(self):
+        total = 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            total += n
+            yield ("+Inf" if bound == float("inf") else repr(bound)), total
+
+
+class Metrics:
+    # Command and REST timings. Commands are timed around Bot.invoke; REST calls are
+    # timed around HTTPClient.request (the whole call, rate-limit waits included) and
+    # through an aiohttp TraceConfig (each attempt on the wire), so the difference is
+    # the time spent queued behind a bucket or sleeping off a 429.
+
+    def __init__(self):
+        self.commands = {}        # command name -> Histogram
+        self.command_calls = {}   # command name -> REST calls made from the command's own task
+        self.command_errors = {}  # command name -> errors
+        self.routes = {}          # "METHOD /path/{param}" -> Histogram
+        self.waits = {}           # route -> Histogram of seconds queued on rate limits
+        self.statuses = {}        # (route, HTTP status) -> responses
+        self.rate_limited = {}    # route -> 429 responses
+        self.sources = {}         # prefix -> callable returning {name: number}, e.g. the log sink's stats()
+        self.started = time.time()
+        self._runner = None
+
+    def reset(self):
+        sources = self.sources
+        self.__init__()
+        self.sources = sources
+
+    @contextmanager
+    def command(self, name):
+        current = [name, 0]
+        token = _command.set(current)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _command.reset(token)
+            histogram = self.commands.get(name)
+            if histogram is None:
+                histogram = self.commands[name] = Histogram()
+            histogram.observe(time.perf_counter() - start)
+            self.command_calls[name] = self.command_calls.get(name, 0) + current[1]
+
+    def command_error(self, name):
+        self.command_errors[name] = self.command_errors.get(name, 0) + 1
+
+    def add_source(self, prefix, stats):
+        self.sources[prefix] = stats
+
+    def instrument(self, http):
+        # Replaces the client's request method with a timed one; every REST call goes through it
+        request = http.request
+
+        async def timed_request(route, **kwargs):
+            key = f"{route.method} {route.path}"
+            current = _command.get()
+            if current is not None:
+                current[1] += 1
+            call = [key, 0.0]
+            token = _request.set(call)
+            start = time.perf_counter()
+            try:
+                return await request(route, **kwargs)
+            finally:
+                _request.reset(token)
+                self._observe_route(key, time.perf_counter() - start, call[1])
+
+        http.request = timed_request
+
+    def _observe_route(self, key, elapsed, on_wire):
+        histogram = self.routes.get(key)
+        if histogram is None:
+            histogram = self.routes[key] = Histogram()
+            self.waits[key] = Histogram()
+        histogram.observe(elapsed)
+        self.waits[key].observe(max(0.0, elapsed - on_wire))
+
+    def trace_config(self):
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        return trace
+
+    async def _on_request_start(self, session, context, params):
+        context.start = time.perf_counter()
+
+    async def _on_request_end(self, session, context, params):
+        # Runs in the task that made the request, so the route comes from the context variable
+        call = _request.get()
+        if call is None:
+            return  # Gateway connect or CDN download, not a routed REST call
+        call[1] += time.perf_counter() - context.start
+        key = (call[0], params.response.status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if params.response.status == 429:
+            self.rate_limited[call[0]] = self.rate_limited.get(call[0], 0) + 1
+
+    def render(self):
+        # Prometheus text exposition format
+        lines = []
+
+        def histograms(name, label, series, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for value, histogram in sorted(series.items()):
+                tag = f'{label}="{_escape(value)}"'
+                for bound, total in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{{tag},le="{bound}"}} {total}')
+                lines.append(f"{name}_sum{{{tag}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{{{tag}}} {histogram.count}")
+
+        def counters(name, series, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                tags = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{tags}}} {value}")
+
+        histograms("bleedbot_command_seconds", "command", self.commands, "Command run time.")
+        counters("bleedbot_command_rest_calls_total", {(("command", k),): v for k, v in self.command_calls.items()},
+                 "REST calls made by commands.")
+        counters("bleedbot_command_errors_total", {(("command", k),): v for k, v in self.command_errors.items()},
+                 "Commands that raised.")
+        histograms("bleedbot_rest_seconds", "route", self.routes, "REST call time, rate-limit waits included.")
+        histograms("bleedbot_rest_queued_seconds", "route", self.waits, "REST call time spent waiting on rate limits.")
+        counters("bleedbot_rest_responses_total",
+                 {(("route", route), ("status", status)): v for (route, status), v in self.statuses.items()},
+                 "REST responses by status.")
+        counters("bleedbot_rest_429_total", {(("route", k),): v for k, v in self.rate_limited.items()},
+                 "429 responses.")
+
+        for prefix, stats in self.sources.items():
+            for name, value in stats().items():
+                if isinstance(value, (int, float)):
+                    lines.append(f"bleedbot_{prefix}_{name} {value}")
+        lines.append(f"bleedbot_uptime_seconds {time.time() - self.started:.0f}")
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, host, port):
+        app = web.Application()
+        app.router.add_get("/metrics", lambda request: web.Response(text=self.render(), content_type="text/plain"))
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
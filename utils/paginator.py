@@ -0,0 +1,184 @@
+import time
+from collections import OrderedDict
+
+import discord
+from config import PAGINATOR_TIMEOUT, PAGINATOR_CACHE_PAGES, PAGINATOR_CACHE_TTL
+
+EMBED_DESCRIPTION_LIMIT = 4096
+
+
+class ListSource:
+    # Pages sliced out of a list that's already in memory
+    def __init__(self, entries, per_page):
+        self.entries = entries
+        self.per_page = per_page
+
+    async def get_page(self, index):
+        start = index * self.per_page
+        return self.entries[start:start + self.per_page]
+
+    async def total(self, exhaust=False):
+        return len(self.entries)
+
+
+class IteratorSource:
+    # Pages pulled from an iterator as far as someone has paged; what was pulled is kept
+    # so going back is free. The total is only known once the iterator runs out.
+    def __init__(self, iterator, per_page):
+        self.iterator = iter(iterator)
+        self.per_page = per_page
+        self.seen = []
+        self.exhausted = False
+
+    def _fill(self, count):
+        while not self.exhausted and len(self.seen) < count:
+            try:
+                self.seen.append(next(self.iterator))
+            except StopIteration:
+                self.exhausted = True
+
+    async def get_page(self, index):
+        start = index * self.per_page
+        self._fill(start + self.per_page)
+        return self.seen[start:start + self.per_page]
+
+    async def total(self, exhaust=False):
+        if exhaust:
+            self._fill(float("inf"))
+        return len(self.seen) if self.exhausted else None
+
+
+class QuerySource:
+    # Pages read with a LIMIT/OFFSET query, e.g. from the case store; fetch(offset, limit) and count() are coroutines
+    def __init__(self, fetch, count, per_page):
+        self.fetch = fetch
+        self.count = count
+        self.per_page = per_page
+        self._total = None
+
+    async def get_page(self, index):
+        return await self.fetch(index * self.per_page, self.per_page)
+
+    async def total(self, exhaust=False):
+        if self._total is None:
+            self._total = await self.count()
+        return self._total
+
+
+class Paginator(discord.ui.View):
+    # Buttons over a page source. Only the page on screen is fetched and rendered;
+    # render(entries, offset, total) builds its embed (offset numbers the entries,
+    # total is None while unknown) and the page counter is added to the footer.
+    # Recently rendered pages are kept for a short while, and once nobody has pressed
+    # a button for `timeout` seconds the buttons go and the source is let go.
+
+    def __init__(self, author, source, render, timeout=PAGINATOR_TIMEOUT,
+                 cache_pages=PAGINATOR_CACHE_PAGES, cache_ttl=PAGINATOR_CACHE_TTL):
+        super().__init__(timeout=timeout)
+        self.author = author
+        self.source = source
+        self.render = render
+        self.cache_pages = cache_pages
+        self.cache_ttl = cache_ttl
+        self.index = 0
+        self.message = None
+        self._cache = OrderedDict()  # page index -> (rendered at, embed, has entries)
+
+    async def _page(self, index):
+        cached = self._cache.get(index)
+        if cached and cached[0] > time.monotonic() - self.cache_ttl:
+            self._cache.move_to_end(index)
+            return cached[1], cached[2]
+
+        entries = await self.source.get_page(index)
+        total = await self.source.total()
+        embed = await self.render(entries, index * self.source.per_page, total)
+        if embed.description and len(embed.description) > EMBED_DESCRIPTION_LIMIT:
+            embed.description = embed.description[:EMBED_DESCRIPTION_LIMIT - 1] + "…"
+        pages = self._pages(total)
+        counter = f"Page {index + 1}/{pages if pages else '?'}"
+        embed.set_footer(text=f"{embed.footer.text} | {counter}" if embed.footer.text else counter)
+
+        self._cache[index] = (time.monotonic(), embed, bool(entries))
+        self._cache.move_to_end(index)
+        while len(self._cache) > self.cache_pages:
+            self._cache.popitem(last=False)
+        return embed, bool(entries)
+
+    def _pages(self, total):
+        return None if total is None else max(1, -(-total // self.source.per_page))
+
+    async def _last_index(self):
+        return self._pages(await self.source.total(exhaust=True)) - 1
+
+    async def _update_buttons(self):
+        total = await self.source.total()
+        pages = self._pages(total)
+        self.first.disabled = self.previous.disabled = self.index == 0
+        if pages is None:
+            # Unknown length: there is a next page unless this one came up short
+            entries = await self.source.get_page(self.index + 1)
+            self.next.disabled = not entries
+            self.last.disabled = not entries
+        else:
+            self.next.disabled = self.last.disabled = self.index >= pages - 1
+
+    async def start(self, ctx, index=0):
+        # Sends the first page; False (and nothing sent) if the source is empty
+        embed, has_entries = await self._page(index)
+        if not has_entries and index:
+            index = await self._last_index()  # Asked for a page past the end
+            embed, has_entries = await self._page(index)
+        if not has_entries:
+            self.stop()
+            return False
+        self.index = index
+        await self._update_buttons()
+        if self.first.disabled and self.next.disabled:
+            self.stop()  # A single page needs no buttons or timeout
+            await ctx.send(embed=embed)
+        else:
+            self.message = await ctx.send(embed=embed, view=self)
+        return True
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author.id:
+            await interaction.response.send_message("❌ Only the person who ran the command can turn its pages.", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction, index=None):
+        # Acknowledged first: a cold page (member lookups in render) can outlast Discord's 3-second deadline.
+        # index None is the last page, which may take a full count to find.
+        await interaction.response.defer()
+        self.index = await self._last_index() if index is None else index
+        embed, _ = await self._page(self.index)
+        await self._update_buttons()
+        await interaction.edit_original_response(embed=embed, view=self)
+
+    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.secondary)
+    async def first(self, interaction, button):
+        await self._show(interaction, 0)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.primary)
+    async def previous(self, interaction, button):
+        await self._show(interaction, max(0, self.index - 1))
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary)
+    async def next(self, interaction, button):
+        await self._show(interaction, self.index + 1)
+
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary)
+    async def last(self, interaction, button):
+        await self._show(interaction)
+
+    async def on_timeout(self):
+        # Drop everything this list holds; the message keeps its last page without buttons
+        self._cache.clear()
+        self.source = None
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass  # Deleted, or the channel is gone
+            self.message = None
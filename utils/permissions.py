@@ -0,0 +1,100 @@
+from utils.guild_config import guild_settings
+
+# Capability bits; a member's mask is the OR of the bits of every role they hold
+STAFF = 1 << 0
+PIC = 1 << 1
+LINK = 1 << 2
+MODERATOR = 1 << 3
+ADMIN = 1 << 4
+
+CAPABILITIES = {
+    "staff": STAFF,
+    "pic": PIC,
+    "link": LINK,
+    "moderator": MODERATOR,
+    "admin": ADMIN,
+}
+
+# Higher tiers include everything below them
+TIERS = {
+    MODERATOR: STAFF,
+    ADMIN: MODERATOR | STAFF,
+}
+
+# The single-role settings map straight onto a capability
+ROLE_SETTINGS = {
+    "staff_role": STAFF,
+    "pic_perm_role": PIC,
+    "link_perm_role": LINK,
+}
+
+
+def expand(bits):
+    for tier, implied in TIERS.items():
+        if bits & tier:
+            bits |= implied
+    return bits
+
+
+def names(bits):
+    return [name for name, bit in CAPABILITIES.items() if bits & bit]
+
+
+class PermissionCache:
+    # Per guild: role ID -> capability bits, built once from the guild settings.
+    # Per member: the combined mask, kept until their roles or the settings change,
+    # so a permission check is one dict lookup and a bitmask test.
+
+    def __init__(self):
+        self._role_bits = {}  # guild ID -> {role ID: bits}
+        self._masks = {}      # guild ID -> {member ID: (role IDs, bits)}
+        guild_settings.on_change(lambda guild_id, key: self.invalidate_guild(guild_id))
+
+    def role_bits(self, guild_id):
+        bits = self._role_bits.get(guild_id)
+        if bits is None:
+            settings = guild_settings.for_guild(guild_id)
+            bits = {}
+            for key, capability in ROLE_SETTINGS.items():
+                if settings[key]:
+                    bits[settings[key]] = bits.get(settings[key], 0) | capability
+            for role_id, capability_names in settings["capability_roles"].items():
+                role_id = int(role_id)
+                for name in capability_names:
+                    bits[role_id] = bits.get(role_id, 0) | CAPABILITIES.get(name, 0)
+            bits = self._role_bits[guild_id] = {role_id: expand(b) for role_id, b in bits.items()}
+        return bits
+
+    def mask(self, member):
+        guild_id = member.guild.id
+        masks = self._masks.get(guild_id)
+        if masks is None:
+            masks = self._masks[guild_id] = {}
+        # The raw role ID list; Member.roles would build and sort Role objects
+        roles = getattr(member, "_roles", None) or [role.id for role in getattr(member, "roles", ())]
+        cached = masks.get(member.id)
+        # Checked against the roles it was built from: with the lean member cache a role change
+        # for a member discord.py isn't holding arrives without an on_member_update
+        if cached is not None and cached[0] == roles:
+            return cached[1]
+        bits = self.role_bits(guild_id)
+        mask = 0
+        for role_id in roles:
+            mask |= bits.get(role_id, 0)
+        masks[member.id] = (roles, mask)
+        return mask
+
+    def has(self, member, capability):
+        return self.mask(member) & capability == capability
+
+    def invalidate_member(self, guild_id, member_id):
+        masks = self._masks.get(guild_id)
+        if masks:
+            masks.pop(member_id, None)
+
+    def invalidate_guild(self, guild_id):
+        self._role_bits.pop(guild_id, None)
+        self._masks.pop(guild_id, None)
+
+
+permission_cache = PermissionCache()
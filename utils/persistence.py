@@ -0,0 +1,151 @@
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from config import PERSIST_BATCH_DELAY, PERSIST_FLUSH_TIMEOUT
+
+
+class PersistenceExecutor:
+    # Every JSON data file is written by this one thread, so a slow disk never stalls
+    # the event loop. Jobs run in the order they were queued. A whole-file write
+    # replaces one still queued for the same file, so a burst of saves is one write of
+    # the latest state; lines appended to a file whose last batch is still queued join
+    # that batch, so a burst of journal entries is one write (and one fsync).
+    #
+    # Jobs are tagged with an owner path; busy(owner) tells the file watcher and the
+    # stores that a file may be mid-write and shouldn't be read back yet.
+
+    def __init__(self, batch_delay=PERSIST_BATCH_DELAY):
+        self.batch_delay = batch_delay
+        self._jobs = OrderedDict()  # key -> [owner, fn, args], oldest first
+        self._busy = {}             # owner -> jobs queued or running
+        self._running = False
+        self._ids = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self.counters = {"writes": 0, "coalesced": 0, "appends": 0, "batches": 0, "calls": 0, "failed": 0}
+
+    def _submit(self, key, owner, fn, args, replace=False):
+        with self._cond:
+            job = self._jobs.get(key)
+            if job is not None and replace:
+                job[2] = args  # Keeps its place in the queue, writes the newer data
+                self.counters["coalesced"] += 1
+            else:
+                self._jobs[key] = [owner, fn, args]
+                self._busy[owner] = self._busy.get(owner, 0) + 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush, timeout=PERSIST_FLUSH_TIMEOUT)
+            self._cond.notify_all()
+
+    def write_json(self, path, data, after=None, **dump_kwargs):
+        # Replaces the file atomically with `data` (copied here, so it may be changed right after);
+        # after() runs on the writer thread once the file is in place
+        self.counters["writes"] += 1
+        self._submit(("write", path), path, _write_json, (path, dict(data), dump_kwargs, after), replace=True)
+
+    def append(self, path, text, fsync=False, owner=None):
+        with self._cond:
+            last = next(reversed(self._jobs), None) if self._jobs else None
+            self.counters["appends"] += 1
+            if last is not None and last[0] == "append" and last[1] == path:
+                # Still waiting to be written: add to that batch instead of queueing another
+                self._jobs[last][2][1].append(text)
+                return
+        self._submit(("append", path, next(self._ids)), owner or path, self._append, (path, [text], fsync))
+
+    def call(self, owner, fn, *args):
+        # Runs fn(*args) on the writer thread in queue order; the Future holds its result
+        future = Future()
+        self.counters["calls"] += 1
+        self._submit(("call", next(self._ids)), owner, _resolve, (future, fn, args))
+        return future
+
+    def busy(self, owner):
+        with self._cond:
+            return self._busy.get(owner, 0) > 0
+
+    def pending(self):
+        with self._cond:
+            return len(self._jobs) + self._running
+
+    def flush(self, owner=None, timeout=None):
+        # Blocks until the queue (or just `owner`'s jobs) reached the disk; False on timeout
+        with self._cond:
+            if owner is None:
+                return self._cond.wait_for(lambda: not self._jobs and not self._running, timeout)
+            return self._cond.wait_for(lambda: not self._busy.get(owner), timeout)
+
+    async def stop(self, timeout=PERSIST_FLUSH_TIMEOUT):
+        # Shutdown hook: waits on a worker thread, so the loop keeps running while the disk catches up
+        if not await asyncio.to_thread(self.flush, None, timeout):
+            logging.error(f"❌ {self.pending()} writes still queued after {timeout:.0f}s at shutdown")
+
+    def stats(self):
+        return {**self.counters, "queued": self.pending()}
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._jobs)
+            if self.batch_delay:
+                time.sleep(self.batch_delay)  # Let the rest of a burst arrive and coalesce
+            while True:
+                with self._cond:
+                    if not self._jobs:
+                        self._running = False
+                        self._cond.notify_all()
+                        break
+                    _, (owner, fn, args) = self._jobs.popitem(last=False)
+                    self._running = True
+                try:
+                    fn(*args)
+                except Exception:
+                    self.counters["failed"] += 1
+                    logging.error(f"❌ Background write for {owner} failed:\n{traceback.format_exc()}")
+                finally:
+                    with self._cond:
+                        self._busy[owner] -= 1
+                        if not self._busy[owner]:
+                            del self._busy[owner]
+                        self._cond.notify_all()
+
+    def _append(self, path, lines, fsync):
+        with open(path, "a") as f:
+            f.write("".join(lines))
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        self.counters["batches"] += 1
+
+
+def _write_json(path, data, dump_kwargs, after):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, **dump_kwargs)
+    os.replace(tmp_path, path)  # Readers see the old or the new file, never half of one
+    if after:
+        after()
+
+
+def _resolve(future, fn, args):
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+        raise  # Logged by the writer thread too; nobody may be waiting on the future
+
+
+persistence = PersistenceExecutor()
@@ -0,0 +1,233 @@
+import asyncio
+import re
+import time
+from datetime import timedelta
+
+import discord
+
+from config import PURGE_SCAN_LIMIT, PURGE_PROGRESS_INTERVAL
+from utils.matcher import MultiMatcher
+
+# Bulk delete only accepts messages younger than 14 days; keep a minute of slack for clock skew
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=1)
+LINK_RE = re.compile(r"https?://", re.IGNORECASE)
+ATTACHMENT_KINDS = ("image", "video", "audio", "file")
+
+
+class PurgeFilter:
+    # Composite filter; compile() turns it into one predicate with only the checks that were asked for
+
+    def __init__(self):
+        self.authors = set()
+        self.bots = False
+        self.contains = []
+        self.regex = None
+        self.has = set()
+        self.before = None
+        self.after = None
+        self.dry_run = False
+
+    def compile(self):
+        checks = []
+        if self.authors:
+            authors = frozenset(self.authors)
+            checks.append(lambda msg: msg.author.id in authors)
+        if self.bots:
+            checks.append(lambda msg: msg.author.bot)
+        if self.contains:
+            matcher = MultiMatcher(self.contains)
+            checks.append(lambda msg: matcher.search(msg.content) is not None)
+        if self.regex:
+            pattern = self.regex
+            checks.append(lambda msg: pattern.search(msg.content) is not None)
+        for kind in self.has:
+            checks.append(_has_check(kind))
+
+        if not checks:
+            return None  # Everything matches
+        if len(checks) == 1:
+            return checks[0]
+        return lambda msg: all(check(msg) for check in checks)
+
+
+def _has_check(kind):
+    if kind == "link":
+        return lambda msg: LINK_RE.search(msg.content) is not None
+    if kind == "embed":
+        return lambda msg: len(msg.embeds) > 0
+    if kind == "file":
+        return lambda msg: len(msg.attachments) > 0
+    prefix = kind + "/"
+    return lambda msg: any((a.content_type or "").startswith(prefix) for a in msg.attachments)
+
+
+def parse_filters(tokens):
+    # user:<id|mention> bots contains:<text> regex:<pattern> has:<image|video|audio|file|link|embed>
+    # before:<message id> after:<message id> --dry
+    purge_filter = PurgeFilter()
+    for token in tokens:
+        key, _, value = token.partition(":")
+        key = key.lower()
+        if token == "--dry":
+            purge_filter.dry_run = True
+        elif key == "bots" and not value:
+            purge_filter.bots = True
+        elif key == "user" and value.strip("<@!>").isdigit():
+            purge_filter.authors.add(int(value.strip("<@!>")))
+        elif key == "contains" and value:
+            purge_filter.contains.append(value)
+        elif key == "regex" and value:
+            try:
+                purge_filter.regex = re.compile(value, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid regex `{value}`: {e}")
+        elif key == "has" and value.lower() in ATTACHMENT_KINDS + ("link", "embed"):
+            purge_filter.has.add(value.lower())
+        elif key in ("before", "after") and value.isdigit():
+            setattr(purge_filter, key, discord.Object(id=int(value)))
+        else:
+            raise ValueError(f"Unknown filter `{token}`")
+    return purge_filter
+
+
+class PurgeProgress:
+    def __init__(self):
+        self.scanned = 0
+        self.matched = 0
+        self.deleted = 0
+        self.old = 0
+        self.failed = 0
+        self.done = False
+
+    def summary(self):
+        text = f"Scanned **{self.scanned}**, matched **{self.matched}**, deleted **{self.deleted}**"
+        if self.old:
+            text += f" ({self.old} older than 14 days)"
+        if self.failed:
+            text += f", ❌ **{self.failed}** failed"
+        return text
+
+
+async def purge(channel, predicate=None, limit=100, *, before=None, after=None, skip_ids=(),
+                dry_run=False, scan_limit=PURGE_SCAN_LIMIT, on_progress=None):
+    # Streams history newest-first. A producer task fetches pages while matches are
+    # filtered and handed off in 100-message batches to a bulk-delete worker, so fetching
+    # and deleting overlap. Messages too old for bulk delete go to a single worker that
+    # deletes them one at a time under discord.py's rate limiting.
+    progress = PurgeProgress()
+    cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+    skip_ids = set(skip_ids)
+    pages = asyncio.Queue(maxsize=2)
+    batches = asyncio.Queue()
+    old_messages = asyncio.Queue()
+    last_report = time.monotonic()
+    errors = []
+
+    async def produce():
+        page = []
+        try:
+            async for message in channel.history(limit=scan_limit, before=before, after=after):
+                page.append(message)
+                if len(page) == 100:
+                    await pages.put(page)
+                    page = []
+            if page:
+                await pages.put(page)
+        except Exception as error:
+            errors.append(error)
+        await pages.put(None)
+
+    async def delete_batches():
+        while True:
+            batch = await batches.get()
+            if batch is None:
+                return
+            await _bulk_delete(channel, batch, progress)
+
+    async def delete_old():
+        while True:
+            message = await old_messages.get()
+            if message is None:
+                return
+            try:
+                await message.delete()
+                progress.deleted += 1
+            except discord.NotFound:
+                pass
+            except discord.HTTPException:
+                progress.failed += 1
+
+    async def report(force=False):
+        nonlocal last_report
+        now = time.monotonic()
+        if on_progress and (force or now - last_report >= PURGE_PROGRESS_INTERVAL):
+            last_report = now
+            try:
+                await on_progress(progress)
+            except discord.HTTPException:
+                pass
+
+    loop = asyncio.get_running_loop()
+    producer = loop.create_task(produce())
+    workers = [] if dry_run else [loop.create_task(delete_batches()), loop.create_task(delete_old())]
+    young = []
+    try:
+        while progress.matched < limit:
+            page = await pages.get()
+            if page is None:
+                break
+
+            for message in page:
+                progress.scanned += 1
+                if message.id in skip_ids or (predicate and not predicate(message)):
+                    continue
+                progress.matched += 1
+                if message.created_at > cutoff:
+                    young.append(message)
+                else:
+                    progress.old += 1
+                    if not dry_run:
+                        old_messages.put_nowait(message)
+                if progress.matched >= limit:
+                    break
+
+            while len(young) >= 100:
+                if not dry_run:
+                    batches.put_nowait(young[:100])
+                young = young[100:]
+            await report()
+    finally:
+        producer.cancel()
+        if workers:
+            if young:
+                batches.put_nowait(young)
+            batches.put_nowait(None)
+            old_messages.put_nowait(None)
+            await asyncio.gather(*workers)
+
+    if errors:
+        raise errors[0]  # e.g. Forbidden reading history
+
+    progress.done = True
+    await report(force=True)
+    return progress
+
+
+async def _bulk_delete(channel, messages, progress):
+    if len(messages) == 1:
+        try:
+            await messages[0].delete()
+            progress.deleted += 1
+        except discord.NotFound:
+            pass
+        except discord.HTTPException:
+            progress.failed += 1
+        return
+
+    try:
+        await channel.delete_messages(messages)
+        progress.deleted += len(messages)
+    except discord.HTTPException:
+        # A message vanished or aged out mid-run; fall back to single deletes for this batch
+        for message in messages:
+            await _bulk_delete(channel, [message], progress)
@@ -0,0 +1,131 @@
+from collections import OrderedDict, namedtuple
+
+from config import RAID_THRESHOLDS, RAID_BUCKETS, RAID_CONTENT_SLOTS
+
+Alert = namedtuple("Alert", "kind guild_id channel_id count window")
+
+
+def content_key(text):
+    # Case and whitespace changes shouldn't dodge the identical-content counter
+    return hash(" ".join(text.casefold().split()))
+
+
+class RingCounter:
+    # Events in the last `window` seconds, kept in a fixed ring of time buckets.
+    # Adding an event is O(1); stale buckets are zeroed as the clock moves past them.
+    __slots__ = ("resolution", "size", "counts", "total", "head")
+
+    def __init__(self, window, buckets=RAID_BUCKETS):
+        self.size = buckets
+        self.resolution = window / buckets
+        self.counts = [0] * buckets
+        self.total = 0
+        self.head = None  # absolute index of the newest bucket
+
+    def _advance(self, now):
+        bucket = int(now / self.resolution)
+        if self.head is None:
+            self.head = bucket
+            return bucket
+        gap = bucket - self.head
+        if gap <= 0:
+            return self.head  # Same bucket, or a slightly out-of-order timestamp
+        if gap >= self.size:
+            self.counts = [0] * self.size
+            self.total = 0
+        else:
+            counts, size = self.counts, self.size
+            for i in range(self.head + 1, bucket + 1):
+                slot = i % size
+                self.total -= counts[slot]
+                counts[slot] = 0
+        self.head = bucket
+        return bucket
+
+    def add(self, now, n=1):
+        bucket = self._advance(now)
+        self.counts[bucket % self.size] += n
+        self.total += n
+        return self.total
+
+    def count(self, now):
+        self._advance(now)
+        return self.total
+
+
+class GuildRaidState:
+    __slots__ = ("joins", "channels", "contents")
+
+    def __init__(self, thresholds):
+        self.joins = RingCounter(thresholds["joins"][1])
+        self.channels = {}              # channel ID -> (messages, mentions) counters
+        self.contents = OrderedDict()   # content key -> counter, least recently seen first
+
+
+class RaidDetector:
+    # Pure bookkeeping: the gateway handlers feed events in and get back alerts,
+    # and the cog decides how to respond without blocking event processing.
+
+    def __init__(self, thresholds=RAID_THRESHOLDS, content_slots=RAID_CONTENT_SLOTS):
+        self.thresholds = thresholds
+        self.content_slots = content_slots
+        self.guilds = {}
+        self._quiet_until = {}  # (kind, guild ID, channel ID) -> time; one alert per window
+
+    def _state(self, guild_id):
+        state = self.guilds.get(guild_id)
+        if state is None:
+            state = self.guilds[guild_id] = GuildRaidState(self.thresholds)
+        return state
+
+    def _trip(self, kind, guild_id, channel_id, count, now):
+        limit, window = self.thresholds[kind]
+        if count < limit:
+            return None
+        key = (kind, guild_id, channel_id)
+        if self._quiet_until.get(key, 0) > now:
+            return None
+        self._quiet_until[key] = now + window
+        return Alert(kind, guild_id, channel_id, count, window)
+
+    def on_join(self, guild_id, now):
+        state = self._state(guild_id)
+        return self._trip("joins", guild_id, None, state.joins.add(now), now)
+
+    def on_message(self, guild_id, channel_id, content, mentions, now):
+        state = self._state(guild_id)
+        alerts = []
+
+        counters = state.channels.get(channel_id)
+        if counters is None:
+            counters = state.channels[channel_id] = (
+                RingCounter(self.thresholds["messages"][1]),
+                RingCounter(self.thresholds["mentions"][1]),
+            )
+        alert = self._trip("messages", guild_id, channel_id, counters[0].add(now), now)
+        if alert:
+            alerts.append(alert)
+        if mentions:
+            alert = self._trip("mentions", guild_id, channel_id, counters[1].add(now, mentions), now)
+            if alert:
+                alerts.append(alert)
+
+        if content:
+            key = content_key(content)
+            counter = state.contents.get(key)
+            if counter is None:
+                counter = state.contents[key] = RingCounter(self.thresholds["identical"][1])
+                if len(state.contents) > self.content_slots:
+                    state.contents.popitem(last=False)
+            else:
+                state.contents.move_to_end(key)
+            alert = self._trip("identical", guild_id, channel_id, counter.add(now), now)
+            if alert:
+                alerts.append(alert)
+
+        return alerts
+
+    def forget_channel(self, guild_id, channel_id):
+        state = self.guilds.get(guild_id)
+        if state:
+            state.channels.pop(channel_id, None)
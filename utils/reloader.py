@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import os
+
+from config import DATA_POLL_INTERVAL
+from utils.persistence import persistence
+
+
+class StateRegistry:
+    # Objects that must outlive a cog reload. reload_extension re-runs the cog's
+    # module and __init__, so anything created there would start over; cogs fetch
+    # their stores and caches from here instead and get the same instance back.
+
+    def __init__(self):
+        self._objects = {}
+
+    def get(self, key, factory):
+        obj = self._objects.get(key)
+        if obj is None:
+            obj = self._objects[key] = factory()
+        return obj
+
+    def pop(self, key):
+        return self._objects.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._objects
+
+
+class FileWatcher:
+    # Polls data file mtimes and calls the registered callback when one changes on disk.
+    # Callbacks decide for themselves whether the change was their own write.
+
+    def __init__(self, interval=DATA_POLL_INTERVAL):
+        self.interval = interval
+        self._watched = {}  # path -> [last mtime, {key: callback}]
+        self._again = set()  # Paths to call back on the next poll even if their mtime hasn't moved
+        self._task = None
+
+    def watch(self, path, callback, key=None):
+        # A reloaded cog registers again under the same key, replacing its old callback.
+        # Shared-store tables all live in one file, so they must pass distinct keys.
+        entry = self._watched.setdefault(path, [self._mtime(path), {}])
+        entry[1][key or path] = callback
+
+    def again(self, path):
+        # For changes that land after the file does (the shared store reads them in on its own thread); safe from any thread
+        self._again.add(path)
+
+    def seen(self, path):
+        # Call after writing a watched file ourselves
+        if path in self._watched:
+            self._watched[path][0] = self._mtime(path)
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def check(self):
+        changed = []
+        for path, entry in self._watched.items():
+            if persistence.busy(path):
+                continue  # Our own write is queued or half done; look again next poll
+            mtime = self._mtime(path)
+            if mtime == entry[0] and path not in self._again:
+                continue
+            self._again.discard(path)
+            entry[0] = mtime
+            for callback in list(entry[1].values()):
+                try:
+                    if callback() is not False:
+                        changed.append(path)
+                except Exception:
+                    logging.exception(f"❌ Reloading {path} failed")
+        if changed:
+            logging.info(f"♻️ Reloaded changed data files: {', '.join(sorted(set(changed)))}")
+        return sorted(set(changed))
+
+    def start(self):
+        if self.interval and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+registry = StateRegistry()
+file_watcher = FileWatcher()
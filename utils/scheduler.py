@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import logging
+import time
+import traceback
+
+from config import TIMERS_FILE, TIMER_BATCH_SIZE, TIMER_RETRY_DELAY, TIMER_MAX_ATTEMPTS, CLUSTER_ID
+from utils.bulk import run_bulk
+from utils.shared_store import open_store, shared_store
+
+
+class TimerScheduler:
+    # One min-heap of (due, timer_id) and one waker task for every pending expiry.
+    # Timer records are small dicts of IDs persisted in a JournaledStore, so they
+    # survive restarts and nothing holds on to a Context or Role objects.
+    #
+    # With the shared store every process sees every timer, but each one only fires
+    # the timers for guilds on its own shards (owns(guild_id)); IDs are prefixed with
+    # the cluster ID so two processes never hand out the same one.
+
+    def __init__(self, bot, path=TIMERS_FILE, batch_size=TIMER_BATCH_SIZE, owns=None,
+                 retry_delay=TIMER_RETRY_DELAY, max_attempts=TIMER_MAX_ATTEMPTS):
+        self.bot = bot
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.owns = owns or (lambda guild_id: True)
+        self.store = open_store(path, "timers")  # timer_id -> record
+        self.handlers = {}
+
+        self._heap = [(record["due"], timer_id) for timer_id, record in self.store.items()]
+        heapq.heapify(self._heap)
+        self._prefix = f"{CLUSTER_ID}." if shared_store else ""
+        self._next_id = max(
+            (int(timer_id[len(self._prefix):]) for timer_id in self.store
+             if timer_id.startswith(self._prefix) and timer_id[len(self._prefix):].isdigit()),
+            default=0
+        ) + 1
+        self._wake = None
+        self._task = None
+
+    def register(self, kind, handler):
+        # handler(record) is awaited when a timer of this kind is due
+        self.handlers[kind] = handler
+
+    def schedule(self, kind, delay, guild_id, target_id, channel_id=None, **data):
+        timer_id = f"{self._prefix}{self._next_id}"
+        self._next_id += 1
+        record = {
+            "kind": kind,
+            "due": time.time() + delay,
+            "guild_id": guild_id,
+            "target_id": target_id,
+            "channel_id": channel_id,
+            "data": data
+        }
+        self.store.set(timer_id, record)
+
+        earliest = not self._heap or record["due"] < self._heap[0][0]
+        heapq.heappush(self._heap, (record["due"], timer_id))
+        if earliest and self._wake:
+            self._wake.set()
+        return timer_id
+
+    def cancel(self, timer_id):
+        # The heap entry goes stale and is skipped when it surfaces
+        self.store.delete(timer_id)
+
+    def cancel_for(self, kind, guild_id, target_id):
+        for timer_id, record in self.pending(kind, guild_id):
+            if record["target_id"] == target_id:
+                self.cancel(timer_id)
+
+    def pending(self, kind=None, guild_id=None):
+        timers = [
+            (timer_id, record) for timer_id, record in self.store.items()
+            if (kind is None or record["kind"] == kind) and (guild_id is None or record["guild_id"] == guild_id)
+        ]
+        return sorted(timers, key=lambda t: t[1]["due"])
+
+    def start(self):
+        if self._task and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            when, timer_id = heapq.heappop(self._heap)
+            record = self.store.get(timer_id)
+            if record is None or record["due"] != when:
+                continue  # Cancelled or rescheduled
+            if not self.owns(record["guild_id"]):
+                continue  # Another process runs this guild's shard and fires it
+            due.append((timer_id, record))
+        return due
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            # Overdue timers (e.g. after a restart) are run in batches instead of all at once
+            due = self._pop_due(time.time())
+            if due:
+                await run_bulk(
+                    due, lambda timer: self._fire(*timer),
+                    route_key=lambda timer: (timer[1]["kind"], timer[1]["guild_id"])
+                )
+                continue
+
+            self._wake.clear()
+            timeout = max(0.0, self._heap[0][0] - time.time()) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _requeue(self, timer_id, record, delay):
+        record = {**record, "due": time.time() + delay}
+        self.store.set(timer_id, record)
+        heapq.heappush(self._heap, (record["due"], timer_id))
+
+    async def _fire(self, timer_id, record):
+        handler = self.handlers.get(record["kind"])
+        if handler is None:
+            # Owning cog not loaded (yet); try again in a minute instead of dropping the timer
+            logging.warning(f"⏰ No handler for timer kind {record['kind']}, retrying later")
+            self._requeue(timer_id, record, 60)
+            return
+
+        # A cancel during shutdown leaves the timer stored, so it runs again after the restart
+        try:
+            await handler(record)
+        except Exception:
+            attempts = record.get("attempts", 0) + 1
+            if self.store.get(timer_id) != record:
+                return  # Cancelled while it ran
+            if attempts < self.max_attempts:
+                # Likely Discord or the network; retried with backoff so a tempban doesn't become permanent
+                delay = self.retry_delay * 2 ** (attempts - 1)
+                logging.warning(
+                    f"⚠️ Timer {timer_id} ({record['kind']}) failed, retrying in {delay:.0f}s:\n{traceback.format_exc()}"
+                )
+                self._requeue(timer_id, {**record, "attempts": attempts}, delay)
+                return
+            logging.error(
+                f"❌ Timer {timer_id} ({record['kind']}) failed {attempts} times, giving up:\n{traceback.format_exc()}"
+            )
+        self.store.delete(timer_id)
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.store.close()
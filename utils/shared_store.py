@@ -0,0 +1,396 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from config import SHARED_DB_PATH, SHARED_CHANGES_TTL
+from utils.reloader import file_watcher
+from utils.storage import JournaledStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    value     TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS changes (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT    NOT NULL,
+    key       TEXT    NOT NULL,
+    at        REAL    NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+TRIM_EVERY = 500  # Writes between deletes of change rows older than the TTL
+SYNC_EVERY = 0.25  # Seconds between checks for other processes' commits while reads keep coming
+MISSING = object()  # Value of an update that deleted its key
+
+
+class SharedStore:
+    # One SQLite file in WAL mode that every bot process opens at once. Each namespace
+    # is cached in memory as a dict, and reads only ever see that dict. All SQLite work
+    # happens on one dedicated thread that owns the connection, so waiting out another
+    # process's write lock (up to the 10s busy timeout) stalls that thread, never the
+    # event loop: writes change the dict at once and commit on the thread, in order.
+    #
+    # Writes also add a row to `changes`. On the thread, PRAGMA data_version (which only
+    # moves when another connection commits) says whether anything changed elsewhere,
+    # and if so only the keys listed in `changes` since our last look are read again.
+    # What the thread reads is handed back as updates that the next read applies.
+
+    def __init__(self, path, changes_ttl=SHARED_CHANGES_TTL):
+        self.path = path
+        self.changes_ttl = changes_ttl
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-store")
+        self._tables = {}
+        self._conn = None
+        self._version = None
+        self._seq = 0
+        self._writes = 0
+        self._namespaces = set()  # Opened namespaces, as the thread knows them
+
+        self._lock = threading.Lock()  # Guards the two below, shared by the loop and the thread
+        self._updates = []  # (namespace, key, value or MISSING) read by the thread; key None: the whole namespace
+        self._inflight = {}  # (namespace, key) -> writes queued but not committed yet
+        self._sync_queued = False
+        self._synced_at = 0.0
+
+    # ---------- Event loop side ----------
+
+    async def open(self, namespaces):
+        # {namespace: JournaledStore path copied in once, the first time any process opens it, or None}.
+        # Run from setup_hook; the first load of each namespace happens on the store's thread.
+        loop = asyncio.get_running_loop()
+        for namespace, import_from in namespaces.items():
+            if namespace not in self._tables:
+                data = await loop.run_in_executor(self._executor, self._open, namespace, import_from)
+                self._tables[namespace] = SharedTable(self, namespace, data)
+
+    def table(self, namespace):
+        # Only what open() loaded: loading here would block the event loop on SQLite
+        table = self._tables.get(namespace)
+        if table is None:
+            raise RuntimeError(f"Shared store namespace {namespace!r} isn't open; add it to SHARED_NAMESPACES")
+        return table
+
+    def _submit(self, fn, *args):
+        return self._executor.submit(self._guarded, fn, *args)
+
+    def _write(self, namespace, keys, fn, *args):
+        # Queues a commit; until it lands, updates read for these keys would undo our own newer value
+        with self._lock:
+            for key in keys:
+                self._inflight[(namespace, key)] = self._inflight.get((namespace, key), 0) + 1
+        self._submit(self._commit, namespace, keys, fn, *args)
+
+    def request_sync(self, force=False):
+        # At most one sync waits on the thread at a time
+        now = time.monotonic()
+        if not self._sync_queued and (force or now - self._synced_at >= SYNC_EVERY):
+            self._sync_queued, self._synced_at = True, now
+            self._submit(self._sync)
+
+    def apply_updates(self):
+        # Brings the cached dicts up to date with what the thread has read
+        if not self._updates:
+            return
+        with self._lock:
+            updates, self._updates = self._updates, []
+            inflight = {key for key in self._inflight}
+        for namespace, key, value in updates:
+            table = self._tables.get(namespace)
+            if table is None:
+                continue
+            if key is None:
+                data = dict(value)
+                for ns, k in inflight:
+                    if ns == namespace:
+                        # Our pending write stays until its own commit reports back
+                        if k in table._data:
+                            data[k] = table._data[k]
+                        else:
+                            data.pop(k, None)
+                if data != table._data:
+                    table._data = data
+                    table._dirty = True
+            elif (namespace, key) not in inflight and table._data.get(key, MISSING) != value:
+                if value is MISSING:
+                    del table._data[key]
+                else:
+                    table._data[key] = value
+                table._dirty = True
+
+    async def close(self):
+        # Lets queued writes commit first
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=True)
+
+    # ---------- Store thread ----------
+
+    def _guarded(self, fn, *args):
+        try:
+            return fn(*args)
+        except Exception:
+            logging.error(f"❌ Shared store {fn.__name__} failed:\n{traceback.format_exc()}")
+
+    def _db(self):
+        if self._conn is None:
+            folder = os.path.dirname(self.path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            # Autocommit mode; writes open their own BEGIN IMMEDIATE so two processes never interleave
+            self._conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            # The last seq ever issued, even if its row was trimmed since
+            row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+            self._seq = row[0] if row else 0
+            self._version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return self._conn
+
+    def _open(self, namespace, import_from):
+        if import_from:
+            self._import(namespace, import_from)
+        self._namespaces.add(namespace)
+        return self._load(namespace)
+
+    def _import(self, namespace, path):
+        if not any(os.path.isfile(p) for p in (path, path + ".journal", path + ".journal.1")):
+            return
+        db = self._db()
+        marker = f"imported:{namespace}"
+        if db.execute("SELECT 1 FROM meta WHERE key = ?", (marker,)).fetchone():
+            return
+        source = JournaledStore(path)
+        try:
+            with self._transaction() as db:
+                if db.execute("SELECT 1 FROM meta WHERE key = ?", (marker,)).fetchone():
+                    return  # Another process got there first
+                for key, value in source.items():
+                    self._put(db, namespace, key, value)
+                db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (marker, str(time.time())))
+        finally:
+            source.close()
+
+    def _load(self, namespace):
+        rows = self._db().execute("SELECT key, value FROM entries WHERE namespace = ?", (namespace,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def _read(self, db, namespace, key):
+        row = db.execute("SELECT value FROM entries WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+        return MISSING if row is None else json.loads(row[0])
+
+    def _push(self, updates):
+        if updates:
+            with self._lock:
+                self._updates.extend(updates)
+            file_watcher.again(self.path + "-wal")  # So the tables' reload callbacks get to see them
+
+    def _sync(self):
+        # Reads back other processes' commits to the opened namespaces
+        self._sync_queued = False
+        db = self._db()
+        version = db.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._version:
+            return
+        self._version = version
+        rows = db.execute(
+            "SELECT seq, namespace, key FROM changes WHERE seq > ? ORDER BY seq", (self._seq,)
+        ).fetchall()
+        if not rows:
+            return
+        if rows[0][0] > self._seq + 1:
+            # Change rows we never saw were trimmed; only a full re-read is safe
+            self._push([(namespace, None, self._load(namespace)) for namespace in self._namespaces])
+        else:
+            self._push([
+                (namespace, key, self._read(db, namespace, key))
+                for namespace, key in {(namespace, key) for _, namespace, key in rows}
+                if namespace in self._namespaces
+            ])
+        self._seq = rows[-1][0]
+
+    def _reload(self, namespace):
+        self._push([(namespace, None, self._load(namespace))])
+
+    def _commit(self, namespace, keys, fn, *args):
+        try:
+            with self._transaction() as db:
+                fn(db, namespace, *args)
+                committed = [(namespace, key, self._read(db, namespace, key)) for key in keys]
+        finally:
+            with self._lock:
+                for key in keys:
+                    count = self._inflight.pop((namespace, key)) - 1
+                    if count:
+                        self._inflight[(namespace, key)] = count
+        # What was committed, for the keys no newer write is waiting on (e.g. an append merged with another process's)
+        self._push(committed)
+
+    def _set(self, db, namespace, key, value):
+        self._put(db, namespace, key, value)
+
+    def _append(self, db, namespace, key, value):
+        # Read inside the write transaction: another process may have appended since our cache was filled
+        values = self._read(db, namespace, key)
+        self._put(db, namespace, key, ([] if values is MISSING else values) + [value])
+
+    def _delete(self, db, namespace, key):
+        self._remove(db, namespace, key)
+
+    def _replace(self, db, namespace, data):
+        current = {key for (key,) in db.execute("SELECT key FROM entries WHERE namespace = ?", (namespace,))}
+        for key in current - set(data):
+            self._remove(db, namespace, key)
+        for key, value in data.items():
+            self._put(db, namespace, key, value)
+
+    def _transaction(self):
+        return _Transaction(self)
+
+    def _put(self, db, namespace, key, value):
+        db.execute(
+            "INSERT INTO entries (namespace, key, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value",
+            (namespace, key, json.dumps(value))
+        )
+        self._changed(db, namespace, key)
+
+    def _remove(self, db, namespace, key):
+        db.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+        self._changed(db, namespace, key)
+
+    def _changed(self, db, namespace, key):
+        db.execute("INSERT INTO changes (namespace, key, at) VALUES (?, ?, ?)", (namespace, key, time.time()))
+        self._writes += 1
+        if self._writes % TRIM_EVERY == 0:
+            db.execute("DELETE FROM changes WHERE at < ?", (time.time() - self.changes_ttl,))
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE takes the write lock up front, so a read-modify-write (append)
+    # can't lose another process's write; busy waits are covered by the connect timeout.
+
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        db = self.store._db()
+        db.execute("BEGIN IMMEDIATE")
+        return db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.store._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class SharedTable:
+    # One namespace of the shared store, with the same API as JournaledStore so the
+    # data handlers, the timer scheduler and the guild settings can use either.
+    # Reads and writes never touch SQLite here; the store's thread does.
+
+    def __init__(self, store, namespace, data):
+        self.store = store
+        self.namespace = namespace
+        # Every commit touches the WAL file, so the file watcher's mtime poll doubles as a change signal
+        self.path = store.path + "-wal"
+        self._data = data
+        self._dirty = False
+
+    # ---------- Read API (dict-like) ----------
+
+    def _fresh(self):
+        # What the thread read since the last call, and a new sync queued behind any writes
+        self.store.apply_updates()
+        self.store.request_sync()
+        return self._data
+
+    def get(self, key, default=None):
+        return self._fresh().get(key, default)
+
+    def __getitem__(self, key):
+        return self._fresh()[key]
+
+    def __contains__(self, key):
+        return key in self._fresh()
+
+    def __iter__(self):
+        return iter(list(self._fresh()))
+
+    def __len__(self):
+        return len(self._fresh())
+
+    def keys(self):
+        return list(self._fresh().keys())
+
+    def values(self):
+        return list(self._fresh().values())
+
+    def items(self):
+        return list(self._fresh().items())
+
+    # ---------- Mutations ----------
+
+    def set(self, key, value):
+        self._data[key] = value
+        self.store._write(self.namespace, [key], self.store._set, key, value)
+
+    def append(self, key, value):
+        self._data[key] = self._fresh().get(key, []) + [value]
+        self.store._write(self.namespace, [key], self.store._append, key, value)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+        self.store._write(self.namespace, [key], self.store._delete, key)
+
+    def replace(self, data):
+        keys = list(set(self._data) | set(data))
+        self._data = dict(data)
+        self.store._write(self.namespace, keys, self.store._replace, dict(data))
+
+    # ---------- Persistence ----------
+
+    def reload_if_changed(self):
+        # Called by the file watcher when the WAL moves; what the sync reads in is reported on a later poll
+        self.store.apply_updates()
+        self.store.request_sync(force=True)
+        changed, self._dirty = self._dirty, False
+        return changed
+
+    def reload(self):
+        # Read again in full on the thread; the next read picks it up
+        self.store._submit(self.store._reload, self.namespace)
+
+    def compact(self, wait=False):
+        pass  # SQLite checkpoints the WAL by itself
+
+    def close(self):
+        pass  # The connection belongs to the SharedStore and is closed with it
+
+
+shared_store = SharedStore(SHARED_DB_PATH) if SHARED_DB_PATH else None
+
+
+def open_store(path, namespace):
+    # The shared SQLite namespace when several processes share state, else the local journaled file
+    if shared_store:
+        return shared_store.table(namespace)  # Opened with its import path from SHARED_NAMESPACES
+    return JournaledStore(path)
@@ -0,0 +1,88 @@
+import re
+from collections import OrderedDict, deque
+
+from config import (
+    SPAM_WINDOW, SPAM_HISTORY, SPAM_MAX_USERS, SPAM_DUPLICATES, SPAM_CHANNELS,
+    SPAM_MENTIONS, SPAM_EMOJIS
+)
+from utils.raid import content_key
+
+# Custom emojis, plus pictographs, symbols and dingbats; close enough for flood detection
+EMOJI_RE = re.compile(r"<a?:\w+:\d+>|[\U0001F000-\U0010FFFF\u2600-\u27BF]")
+
+
+def count_emojis(text):
+    return len(EMOJI_RE.findall(text))
+
+
+class UserHistory:
+    __slots__ = ("entries", "mentions", "last_seen")
+
+    def __init__(self):
+        self.entries = deque(maxlen=SPAM_HISTORY)  # (time, content key, channel ID, mentions)
+        self.mentions = 0
+        self.last_seen = 0.0
+
+
+class SpamTracker:
+    # Recent messages per (guild, user) in an LRU-ordered dict. Memory is capped
+    # at max_users histories of at most SPAM_HISTORY entries each: the least
+    # recently active users are evicted first, and anyone quiet for longer than
+    # the window is dropped as soon as they reach the front.
+
+    def __init__(self, window=SPAM_WINDOW, max_users=SPAM_MAX_USERS):
+        self.window = window
+        self.max_users = max_users
+        self.users = OrderedDict()
+
+    def _evict(self, now):
+        users = self.users
+        cutoff = now - self.window
+        while users:
+            key, history = next(iter(users.items()))
+            if len(users) <= self.max_users and history.last_seen >= cutoff:
+                break
+            users.popitem(last=False)
+
+    def check(self, guild_id, user_id, channel_id, content, mentions, now):
+        # Records the message and returns (reason, channel IDs involved) when it's spam, else None
+        key = (guild_id, user_id)
+        history = self.users.get(key)
+        if history is None:
+            history = self.users[key] = UserHistory()
+        else:
+            self.users.move_to_end(key)
+        history.last_seen = now
+        self._evict(now)
+
+        entries = history.entries
+        cutoff = now - self.window
+        while entries and entries[0][0] < cutoff:
+            history.mentions -= entries.popleft()[3]
+        if len(entries) == entries.maxlen:
+            history.mentions -= entries[0][3]
+
+        digest = content_key(content) if content else None
+        entries.append((now, digest, channel_id, mentions))
+        history.mentions += mentions
+
+        reason = None
+        if mentions >= SPAM_MENTIONS or history.mentions >= SPAM_MENTIONS * 2:
+            reason = "mass mentions"
+        elif len(content) >= SPAM_EMOJIS and count_emojis(content) >= SPAM_EMOJIS:
+            reason = "emoji flood"
+        elif digest is not None:
+            same = [entry[2] for entry in entries if entry[1] == digest]
+            if len(same) >= SPAM_DUPLICATES:
+                reason = "repeated messages"
+            elif len(set(same)) >= SPAM_CHANNELS:
+                reason = "cross-channel spam"
+
+        if reason is None:
+            return None
+        channels = {entry[2] for entry in entries}
+        del self.users[key]  # One response per burst
+        return reason, channels
+
+    def forget(self, guild_id, user_id):
+        self.users.pop((guild_id, user_id), None)
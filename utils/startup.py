@@ -0,0 +1,113 @@
+import ast
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import json
+import time
+from contextlib import contextmanager
+
+from config import TREE_HASH_FILE
+from utils.persistence import persistence
+
+
+class StartupTimer:
+    def __init__(self, started=None):
+        self.started = started or time.perf_counter()
+        self.phases = []  # (label, seconds) in the order they finished
+
+    @contextmanager
+    def phase(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((label, time.perf_counter() - start))
+
+    def report(self):
+        total = time.perf_counter() - self.started
+        lines = [f"⏱️ Startup took {total:.2f}s:"]
+        lines += [f"   {seconds * 1000:8.1f}ms  {label}" for label, seconds in self.phases]
+        return "\n".join(lines)
+
+
+def _parse_extension(name):
+    spec = importlib.util.find_spec(name)
+    with open(spec.origin, "r", encoding="utf-8") as f:
+        return ast.parse(f.read(), spec.origin)
+
+
+def extension_imports(name):
+    # Top-level imports of an extension, read from its source without running it
+    modules = set()
+    for node in _parse_extension(name).body:
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+    return modules
+
+
+def extension_commands(name):
+    # Prefix command names and aliases declared with @commands.command / @commands.group
+    names = set()
+    for node in ast.walk(_parse_extension(name)):
+        if not isinstance(node, ast.AsyncFunctionDef):
+            continue
+        for decorator in node.decorator_list:
+            if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)
+                    and decorator.func.attr in ("command", "group")):
+                continue
+            kwargs = {kw.arg: kw.value for kw in decorator.keywords}
+            name_node = kwargs.get("name")
+            names.add(name_node.value if isinstance(name_node, ast.Constant) else node.name)
+            aliases = kwargs.get("aliases")
+            if isinstance(aliases, (ast.List, ast.Tuple)):
+                names.update(alias.value for alias in aliases.elts if isinstance(alias, ast.Constant))
+    return names
+
+
+def extension_intents(name):
+    # The cog's module-level REQUIRED_INTENTS, e.g. REQUIRED_INTENTS = ("presences",); read
+    # from source because intents are fixed at login, before lazy cogs ever load
+    for node in _parse_extension(name).body:
+        if (isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "REQUIRED_INTENTS" for t in node.targets)
+                and isinstance(node.value, (ast.List, ast.Tuple, ast.Set))):
+            return {elt.value for elt in node.value.elts if isinstance(elt, ast.Constant)}
+    return set()
+
+
+def _import(module):
+    start = time.perf_counter()
+    try:
+        importlib.import_module(module)
+    except Exception:
+        pass  # load_extension raises it again with the cog's name attached
+    return module, time.perf_counter() - start
+
+
+async def preload_imports(extensions):
+    # Imports every extension's dependencies on worker threads at once, so the
+    # extensions themselves only run their own module body when they load
+    modules = set()
+    for name in extensions:
+        modules |= extension_imports(name)
+    return await asyncio.gather(*(asyncio.to_thread(_import, module) for module in sorted(modules)))
+
+
+def tree_hash(tree, application_id):
+    payload = sorted((command.to_dict() for command in tree.get_commands()), key=lambda c: (c.get("type", 1), c["name"]))
+    blob = json.dumps({"application_id": application_id, "commands": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def last_synced_hash(path=TREE_HASH_FILE):
+    try:
+        with open(path, "r") as f:
+            return json.load(f).get("hash")
+    except (OSError, ValueError):
+        return None
+
+
+def save_synced_hash(digest, path=TREE_HASH_FILE):
+    persistence.write_json(path, {"hash": digest, "synced_at": time.time()})
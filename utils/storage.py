@@ -0,0 +1,203 @@
+import json
+import os
+
+from config import JOURNAL_COMPACT_EVERY, JOURNAL_FSYNC
+from utils.persistence import persistence
+
+SNAPSHOT_MARKER = "__store__"
+
+
+class JournaledStore:
+    # A dict of JSON values kept in memory, persisted as a snapshot file plus an
+    # append-only journal of mutations. Each write costs one journal line; the
+    # snapshot is rewritten every `compact_every` mutations. Both go through the
+    # persistence thread in order, so a mutation returns before anything hits the disk.
+    #
+    # Values are never mutated in place (append builds a new list), so compaction
+    # can snapshot a shallow copy without racing later writes.
+
+    def __init__(self, path, compact_every=JOURNAL_COMPACT_EVERY, fsync=JOURNAL_FSYNC):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.rotated_path = path + ".journal.1"
+        self.compact_every = compact_every
+        self.fsync = fsync
+
+        self._data = {}
+        self._seq = 0
+        self._ops_since_compact = 0
+        self._compacting = False  # A compaction is queued on the persistence thread
+        self._snapshot_mtime = None
+
+        self._load()
+
+    # ---------- Read API (dict-like) ----------
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self):
+        return self._data.values()
+
+    def items(self):
+        return self._data.items()
+
+    # ---------- Mutations ----------
+
+    def set(self, key, value):
+        self._data[key] = value
+        self._write({"op": "set", "key": key, "value": value})
+
+    def append(self, key, value):
+        self._data[key] = self._data.get(key, []) + [value]
+        self._write({"op": "append", "key": key, "value": value})
+
+    def delete(self, key):
+        if key not in self._data:
+            return
+        del self._data[key]
+        self._write({"op": "del", "key": key})
+
+    def replace(self, data):
+        # Whole-dataset rewrite, kept for callers that still hand over a full dict
+        self._data = dict(data)
+        self._queue_compaction()
+
+    # ---------- Persistence ----------
+
+    def _is_plain_file(self):
+        try:
+            with open(self.path, "r") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return not (isinstance(raw, dict) and raw.get(SNAPSHOT_MARKER) == 1)
+
+    def _load(self):
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._snapshot_mtime = self._current_mtime()
+        if os.path.isfile(self.path):
+            with open(self.path, "r") as f:
+                raw = json.load(f)
+            if isinstance(raw, dict) and raw.get(SNAPSHOT_MARKER) == 1:
+                self._data = raw["data"]
+                self._seq = raw["seq"]
+            else:
+                self._data = raw  # Legacy plain-dict file
+
+        # A leftover rotated journal means a compaction was interrupted; replay it first
+        for journal in (self.rotated_path, self.journal_path):
+            self._replay(journal)
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload_if_changed(self):
+        # Picks up a data file replaced from outside (a deploy or a hand edit).
+        # Our own snapshots record their mtime, so compaction doesn't count as a change.
+        if persistence.busy(self.path):
+            return False  # Our own writes are still queued; look again on the next poll
+        if self._current_mtime() == self._snapshot_mtime:
+            return False
+        self.reload()
+        return True
+
+    def reload(self):
+        persistence.flush(self.path)  # Queued journal lines must be on disk before it's read back
+        self._data, self._seq, self._ops_since_compact = {}, 0, 0
+        if self._is_plain_file():
+            # A hand-written plain dict is the new truth; drop our journal instead of replaying it
+            for journal in (self.rotated_path, self.journal_path):
+                if os.path.isfile(journal):
+                    os.remove(journal)
+        self._load()
+
+    def _replay(self, journal):
+        if not os.path.isfile(journal):
+            return
+        with open(journal, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Torn tail from a crash mid-write; everything after it is lost anyway
+                if entry["seq"] <= self._seq:
+                    continue  # Already part of the snapshot
+                self._apply(entry)
+                self._seq = entry["seq"]
+                self._ops_since_compact += 1
+
+    def _apply(self, entry):
+        op, key = entry["op"], entry["key"]
+        if op == "set":
+            self._data[key] = entry["value"]
+        elif op == "append":
+            self._data[key] = self._data.get(key, []) + [entry["value"]]
+        elif op == "del":
+            self._data.pop(key, None)
+
+    def _write(self, entry):
+        self._seq += 1
+        entry["seq"] = self._seq
+        persistence.append(self.journal_path, json.dumps(entry) + "\n", fsync=self.fsync, owner=self.path)
+        self._ops_since_compact += 1
+
+        if self._ops_since_compact >= self.compact_every:
+            self.compact()
+
+    def compact(self, wait=False):
+        if not self._compacting:
+            self._queue_compaction()
+        if wait:
+            persistence.flush(self.path)
+
+    def _queue_compaction(self):
+        # Everything journaled so far is in this snapshot; later lines land after it in the queue
+        self._compacting = True
+        self._ops_since_compact = 0
+        persistence.call(self.path, self._compact, dict(self._data), self._seq)
+
+    def _compact(self, snapshot, seq):
+        # Runs on the persistence thread. The journal is rotated first: if we crash before the
+        # snapshot is in place, the rotated lines are replayed on the next start.
+        try:
+            if os.path.isfile(self.journal_path):
+                with open(self.journal_path, "r") as src, open(self.rotated_path, "a") as dst:
+                    dst.write(src.read())
+                open(self.journal_path, "w").close()
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({SNAPSHOT_MARKER: 1, "seq": seq, "data": snapshot}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)  # Atomic: readers see the old or the new snapshot, never half of one
+            self._snapshot_mtime = self._current_mtime()
+            if os.path.isfile(self.rotated_path):
+                os.remove(self.rotated_path)
+        finally:
+            self._compacting = False
+
+    def close(self):
+        pass  # No open handles; queued writes reach the disk with persistence.stop() at shutdown